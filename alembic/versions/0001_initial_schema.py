@@ -0,0 +1,178 @@
+"""initial schema
+
+The original models' tables, as created by app.db.init_db before any of the
+later revisions; a database created that way can be stamped at this revision.
+
+Revision ID: 0001
+Revises: 
+Create Date: 2026-10-16 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('customers',
+    sa.Column('customer_id', sa.String(), nullable=False),
+    sa.Column('customer_unique_id', sa.String(), nullable=True),
+    sa.Column('customer_zip_code_prefix', sa.String(), nullable=True),
+    sa.Column('customer_city', sa.String(), nullable=True),
+    sa.Column('customer_state', sa.String(), nullable=True),
+    sa.PrimaryKeyConstraint('customer_id')
+    )
+    op.create_index(op.f('ix_customers_customer_id'), 'customers', ['customer_id'], unique=False)
+    op.create_index(op.f('ix_customers_customer_unique_id'), 'customers', ['customer_unique_id'], unique=True)
+
+    op.create_table('geolocation',
+    sa.Column('geolocation_zip_code_prefix', sa.String(), nullable=False),
+    sa.Column('geolocation_lat', sa.Float(), nullable=True),
+    sa.Column('geolocation_lng', sa.Float(), nullable=True),
+    sa.Column('geolocation_city', sa.String(), nullable=True),
+    sa.Column('geolocation_state', sa.String(), nullable=True),
+    sa.PrimaryKeyConstraint('geolocation_zip_code_prefix')
+    )
+    op.create_table('leads_closed',
+    sa.Column('mql_id', sa.String(), nullable=False),
+    sa.Column('seller_id', sa.String(), nullable=True),
+    sa.Column('sdr_id', sa.String(), nullable=True),
+    sa.Column('sr_id', sa.String(), nullable=True),
+    sa.Column('won_date', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('business_segment', sa.String(), nullable=True),
+    sa.Column('lead_type', sa.String(), nullable=True),
+    sa.Column('lead_behaviour_profile', sa.String(), nullable=True),
+    sa.Column('has_gtin', sa.Boolean(), nullable=True),
+    sa.Column('average_stock', sa.String(), nullable=True),
+    sa.Column('business_type', sa.String(), nullable=True),
+    sa.Column('declared_product_catalog_size', sa.Float(), nullable=True),
+    sa.Column('declared_monthly_revenue', sa.Float(), nullable=True),
+    sa.PrimaryKeyConstraint('mql_id')
+    )
+    op.create_index(op.f('ix_leads_closed_mql_id'), 'leads_closed', ['mql_id'], unique=False)
+
+    op.create_table('leads_qualified',
+    sa.Column('mql_id', sa.String(), nullable=False),
+    sa.Column('first_contact_date', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('landing_page_id', sa.String(), nullable=True),
+    sa.Column('origin', sa.String(), nullable=True),
+    sa.PrimaryKeyConstraint('mql_id')
+    )
+    op.create_index(op.f('ix_leads_qualified_mql_id'), 'leads_qualified', ['mql_id'], unique=False)
+
+    op.create_table('product_category_name_translation',
+    sa.Column('product_category_name', sa.String(), nullable=False),
+    sa.Column('product_category_name_english', sa.String(), nullable=True),
+    sa.PrimaryKeyConstraint('product_category_name')
+    )
+    op.create_table('products',
+    sa.Column('product_id', sa.String(), nullable=False),
+    sa.Column('product_category_name', sa.String(), nullable=True),
+    sa.Column('product_name_length', sa.Integer(), nullable=True),
+    sa.Column('product_description_length', sa.Integer(), nullable=True),
+    sa.Column('product_photos_qty', sa.Integer(), nullable=True),
+    sa.Column('product_weight_g', sa.Float(), nullable=True),
+    sa.Column('product_length_cm', sa.Float(), nullable=True),
+    sa.Column('product_height_cm', sa.Float(), nullable=True),
+    sa.Column('product_width_cm', sa.Float(), nullable=True),
+    sa.PrimaryKeyConstraint('product_id')
+    )
+    op.create_index(op.f('ix_products_product_category_name'), 'products', ['product_category_name'], unique=False)
+    op.create_index(op.f('ix_products_product_id'), 'products', ['product_id'], unique=False)
+
+    op.create_table('sellers',
+    sa.Column('seller_id', sa.String(), nullable=False),
+    sa.Column('seller_zip_code_prefix', sa.String(), nullable=True),
+    sa.Column('seller_city', sa.String(), nullable=True),
+    sa.Column('seller_state', sa.String(), nullable=True),
+    sa.PrimaryKeyConstraint('seller_id')
+    )
+    op.create_index(op.f('ix_sellers_seller_id'), 'sellers', ['seller_id'], unique=False)
+
+    op.create_table('orders',
+    sa.Column('order_id', sa.String(), nullable=False),
+    sa.Column('customer_id', sa.String(), nullable=True),
+    sa.Column('order_status', sa.String(), nullable=True),
+    sa.Column('order_purchase_timestamp', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('order_approved_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('order_delivered_carrier_date', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('order_delivered_customer_date', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('order_estimated_delivery_date', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['customer_id'], ['customers.customer_id'], ),
+    sa.PrimaryKeyConstraint('order_id')
+    )
+    op.create_index(op.f('ix_orders_order_id'), 'orders', ['order_id'], unique=False)
+
+    op.create_table('order_items',
+    sa.Column('order_id', sa.String(), nullable=False),
+    sa.Column('order_item_id', sa.Integer(), nullable=False),
+    sa.Column('product_id', sa.String(), nullable=True),
+    sa.Column('seller_id', sa.String(), nullable=True),
+    sa.Column('shipping_limit_date', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('price', sa.Float(), nullable=True),
+    sa.Column('freight_value', sa.Float(), nullable=True),
+    sa.ForeignKeyConstraint(['order_id'], ['orders.order_id'], ),
+    sa.ForeignKeyConstraint(['product_id'], ['products.product_id'], ),
+    sa.ForeignKeyConstraint(['seller_id'], ['sellers.seller_id'], ),
+    sa.PrimaryKeyConstraint('order_id', 'order_item_id')
+    )
+    op.create_table('order_payments',
+    sa.Column('order_id', sa.String(), nullable=False),
+    sa.Column('payment_sequential', sa.Integer(), nullable=False),
+    sa.Column('payment_type', sa.String(), nullable=True),
+    sa.Column('payment_installments', sa.Integer(), nullable=True),
+    sa.Column('payment_value', sa.Float(), nullable=True),
+    sa.ForeignKeyConstraint(['order_id'], ['orders.order_id'], ),
+    sa.PrimaryKeyConstraint('order_id', 'payment_sequential')
+    )
+    op.create_table('order_reviews',
+    sa.Column('review_id', sa.String(), nullable=False),
+    sa.Column('order_id', sa.String(), nullable=True),
+    sa.Column('review_score', sa.Integer(), nullable=True),
+    sa.Column('review_comment_title', sa.String(), nullable=True),
+    sa.Column('review_comment_message', sa.Text(), nullable=True),
+    sa.Column('review_creation_date', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('review_answer_timestamp', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['order_id'], ['orders.order_id'], ),
+    sa.PrimaryKeyConstraint('review_id')
+    )
+    op.create_index(op.f('ix_order_reviews_review_id'), 'order_reviews', ['review_id'], unique=False)
+
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_order_reviews_review_id'), table_name='order_reviews')
+
+    op.drop_table('order_reviews')
+    op.drop_table('order_payments')
+    op.drop_table('order_items')
+    op.drop_index(op.f('ix_orders_order_id'), table_name='orders')
+
+    op.drop_table('orders')
+    op.drop_index(op.f('ix_sellers_seller_id'), table_name='sellers')
+
+    op.drop_table('sellers')
+    op.drop_index(op.f('ix_products_product_id'), table_name='products')
+    op.drop_index(op.f('ix_products_product_category_name'), table_name='products')
+
+    op.drop_table('products')
+    op.drop_table('product_category_name_translation')
+    op.drop_index(op.f('ix_leads_qualified_mql_id'), table_name='leads_qualified')
+
+    op.drop_table('leads_qualified')
+    op.drop_index(op.f('ix_leads_closed_mql_id'), table_name='leads_closed')
+
+    op.drop_table('leads_closed')
+    op.drop_table('geolocation')
+    op.drop_index(op.f('ix_customers_customer_unique_id'), table_name='customers')
+    op.drop_index(op.f('ix_customers_customer_id'), table_name='customers')
+
+    op.drop_table('customers')
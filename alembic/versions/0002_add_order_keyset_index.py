@@ -0,0 +1,32 @@
+"""add the order keyset pagination index
+
+Order lists seek on (order_purchase_timestamp, order_id).
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-16 09:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_orders_purchase_timestamp_order_id',
+        'orders',
+        ['order_purchase_timestamp', 'order_id'],
+        unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_orders_purchase_timestamp_order_id', table_name='orders')
@@ -0,0 +1,45 @@
+"""add total_amount and item_count to orders
+
+Denormalized from order_items so order reads need no aggregation. Existing
+orders are backfilled from their items.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-16 09:20:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('orders') as batch_op:
+        batch_op.add_column(sa.Column('total_amount', sa.Float(), server_default='0', nullable=False))
+        batch_op.add_column(sa.Column('item_count', sa.Integer(), server_default='0', nullable=False))
+    op.execute(
+        """
+        UPDATE orders SET
+            total_amount = COALESCE((
+                SELECT SUM(order_items.price + COALESCE(order_items.freight_value, 0))
+                FROM order_items WHERE order_items.order_id = orders.order_id
+            ), 0),
+            item_count = (
+                SELECT COUNT(*) FROM order_items WHERE order_items.order_id = orders.order_id
+            )
+        """
+    )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('orders') as batch_op:
+        batch_op.drop_column('item_count')
+        batch_op.drop_column('total_amount')
@@ -0,0 +1,46 @@
+"""add indexes for the API's query patterns
+
+Composite indexes match the filter + keyset order of the list endpoints, and
+plain indexes cover the foreign keys used for joins and lookups. On PostgreSQL
+they are built with CREATE INDEX CONCURRENTLY so writes are not blocked.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-16 09:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004'
+down_revision: Union[str, None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+INDEXES = [
+    ('ix_orders_customer_id_purchase_timestamp', 'orders', ['customer_id', 'order_purchase_timestamp', 'order_id']),
+    ('ix_orders_status_purchase_timestamp', 'orders', ['order_status', 'order_purchase_timestamp', 'order_id']),
+    ('ix_order_items_product_id', 'order_items', ['product_id']),
+    ('ix_order_items_seller_id', 'order_items', ['seller_id']),
+    ('ix_order_reviews_order_id', 'order_reviews', ['order_id']),
+    ('ix_customers_city_customer_id', 'customers', ['customer_city', 'customer_id']),
+    ('ix_customers_state_customer_id', 'customers', ['customer_state', 'customer_id']),
+    ('ix_products_category_product_id', 'products', ['product_category_name', 'product_id']),
+]
+
+
+def upgrade() -> None:
+    # CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, unique=False, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
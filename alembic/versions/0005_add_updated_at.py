@@ -0,0 +1,39 @@
+"""add updated_at to products, customers and orders
+
+The column backs the ETag / Last-Modified validators of the read endpoints.
+Existing rows are stamped with the migration time.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-16 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0005'
+down_revision: Union[str, None] = '0004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+TABLES = ['products', 'customers', 'orders']
+
+
+def upgrade() -> None:
+    for table in TABLES:
+        # Batch mode lets SQLite add a column with a non-constant default
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.add_column(
+                sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True)
+            )
+
+
+def downgrade() -> None:
+    for table in reversed(TABLES):
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.drop_column('updated_at')
@@ -0,0 +1,52 @@
+"""add sales rollup tables
+
+Pre-aggregated hourly and daily sales served by the analytics endpoints,
+and the high-water mark their incremental refresh resumes from.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-16 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0006'
+down_revision: Union[str, None] = '0005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'sales_rollups',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('granularity', sa.String(), nullable=False),
+        sa.Column('bucket', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('product_category_name', sa.String(), nullable=True),
+        sa.Column('customer_state', sa.String(), nullable=True),
+        sa.Column('seller_id', sa.String(), nullable=True),
+        sa.Column('order_count', sa.Integer(), nullable=False),
+        sa.Column('item_count', sa.Integer(), nullable=False),
+        sa.Column('revenue', sa.Float(), nullable=False),
+        sa.Column('freight_value', sa.Float(), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_sales_rollups_granularity_bucket', 'sales_rollups', ['granularity', 'bucket'], unique=False)
+    op.create_table(
+        'rollup_state',
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('high_water_mark', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('refreshed_at', sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint('name')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('rollup_state')
+    op.drop_index('ix_sales_rollups_granularity_bucket', table_name='sales_rollups')
+    op.drop_table('sales_rollups')
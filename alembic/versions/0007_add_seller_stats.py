@@ -0,0 +1,43 @@
+"""add seller_stats
+
+Running per-seller totals behind the seller scorecard. Populated for
+existing orders by app.crud.seller.rebuild_seller_stats.
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-16 17:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0007'
+down_revision: Union[str, None] = '0006'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'seller_stats',
+        sa.Column('seller_id', sa.String(), nullable=False),
+        sa.Column('order_count', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('item_count', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('gmv', sa.Float(), server_default='0', nullable=False),
+        sa.Column('review_count', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('review_score_sum', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('delivered_count', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('on_time_count', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('dispatch_count', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('dispatch_seconds_sum', sa.Float(), server_default='0', nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.PrimaryKeyConstraint('seller_id')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('seller_stats')
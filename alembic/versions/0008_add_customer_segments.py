@@ -0,0 +1,47 @@
+"""add customer_segments
+
+RFM scores and segment per customer_unique_id, written by the
+app.db.segment_customers batch job.
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-16 19:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0008'
+down_revision: Union[str, None] = '0007'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'customer_segments',
+        sa.Column('customer_unique_id', sa.String(), nullable=False),
+        sa.Column('recency_days', sa.Float(), nullable=False),
+        sa.Column('frequency', sa.Integer(), nullable=False),
+        sa.Column('monetary', sa.Float(), nullable=False),
+        sa.Column('recency_score', sa.Integer(), nullable=False),
+        sa.Column('frequency_score', sa.Integer(), nullable=False),
+        sa.Column('monetary_score', sa.Integer(), nullable=False),
+        sa.Column('segment', sa.String(), nullable=False),
+        sa.PrimaryKeyConstraint('customer_unique_id')
+    )
+    op.create_index(
+        'ix_customer_segments_segment_customer_unique_id',
+        'customer_segments',
+        ['segment', 'customer_unique_id'],
+        unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_customer_segments_segment_customer_unique_id', table_name='customer_segments')
+    op.drop_table('customer_segments')
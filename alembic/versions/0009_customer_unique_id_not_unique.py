@@ -0,0 +1,31 @@
+"""make customers.customer_unique_id non-unique
+
+Olist issues a customer_id per order, so one person's customer_unique_id
+repeats across several customers rows and the Olist loader could not ingest
+customers.csv under the unique index.
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-16 20:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0009'
+down_revision: Union[str, None] = '0008'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.drop_index(op.f('ix_customers_customer_unique_id'), table_name='customers')
+    op.create_index(op.f('ix_customers_customer_unique_id'), 'customers', ['customer_unique_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_customers_customer_unique_id'), table_name='customers')
+    op.create_index(op.f('ix_customers_customer_unique_id'), 'customers', ['customer_unique_id'], unique=True)
@@ -0,0 +1,49 @@
+"""add grouping sets to sales rollups
+
+Each bucket is now aggregated once per combination of category, state and
+seller, so distinct order counts never have to be summed across groups.
+Existing rollup rows and the sales high-water mark are discarded; the next
+refresh rebuilds them in full.
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-16 21:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0010'
+down_revision: Union[str, None] = '0009'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _reset_rollups() -> None:
+    op.execute("DELETE FROM sales_rollups")
+    op.execute("DELETE FROM rollup_state WHERE name = 'sales'")
+
+
+def upgrade() -> None:
+    _reset_rollups()
+    op.drop_index('ix_sales_rollups_granularity_bucket', table_name='sales_rollups')
+    with op.batch_alter_table('sales_rollups') as batch_op:
+        batch_op.add_column(sa.Column('dimensions', sa.String(), nullable=False))
+    op.create_index(
+        'ix_sales_rollups_granularity_dimensions_bucket',
+        'sales_rollups',
+        ['granularity', 'dimensions', 'bucket'],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    _reset_rollups()
+    op.drop_index('ix_sales_rollups_granularity_dimensions_bucket', table_name='sales_rollups')
+    with op.batch_alter_table('sales_rollups') as batch_op:
+        batch_op.drop_column('dimensions')
+    op.create_index('ix_sales_rollups_granularity_bucket', 'sales_rollups', ['granularity', 'bucket'], unique=False)
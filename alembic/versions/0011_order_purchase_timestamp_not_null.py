@@ -0,0 +1,50 @@
+"""make orders.order_purchase_timestamp NOT NULL
+
+Order lists seek past a cursor with (order_purchase_timestamp, order_id) >
+(...), which is never true for a NULL timestamp, so such orders were skipped
+by cursor pagination. Existing NULLs are filled from the approval time, or
+failing that the last update or the migration time.
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2026-10-16 22:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0011'
+down_revision: Union[str, None] = '0010'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        UPDATE orders
+        SET order_purchase_timestamp = COALESCE(order_approved_at, updated_at, CURRENT_TIMESTAMP)
+        WHERE order_purchase_timestamp IS NULL
+        """
+    )
+    with op.batch_alter_table('orders') as batch_op:
+        batch_op.alter_column(
+            'order_purchase_timestamp',
+            existing_type=sa.DateTime(timezone=True),
+            existing_server_default=sa.func.now(),
+            nullable=False,
+        )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('orders') as batch_op:
+        batch_op.alter_column(
+            'order_purchase_timestamp',
+            existing_type=sa.DateTime(timezone=True),
+            existing_server_default=sa.func.now(),
+            nullable=True,
+        )
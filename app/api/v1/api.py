@@ -1,7 +1,25 @@
 from fastapi import APIRouter
-from app.api.v1.endpoints import products, customers, orders
+from app.core.config import settings
+from app.api.v1.endpoints import products, customers, orders, admin, exports, geo, analytics, sellers, segments
 
 api_router = APIRouter()
+
+# Export routes come first so the /{id} routes below do not capture them
+api_router.include_router(exports.router)
+api_router.include_router(geo.router, tags=["geo"])
+api_router.include_router(segments.router, tags=["segments"])
+
+if settings.ASYNC_DATABASE:
+    from app.api.v1.endpoints import async_products, async_customers, async_orders
+
+    # Registered first so their GET routes take precedence; writes stay on the sync routers
+    api_router.include_router(async_products.router, prefix="/products", tags=["products"])
+    api_router.include_router(async_customers.router, prefix="/customers", tags=["customers"])
+    api_router.include_router(async_orders.router, prefix="/orders", tags=["orders"])
+
 api_router.include_router(products.router, prefix="/products", tags=["products"])
 api_router.include_router(customers.router, prefix="/customers", tags=["customers"])
 api_router.include_router(orders.router, prefix="/orders", tags=["orders"])
+api_router.include_router(sellers.router, prefix="/sellers", tags=["sellers"])
+api_router.include_router(admin.router, prefix="/admin", tags=["admin"])
+api_router.include_router(analytics.router, prefix="/analytics", tags=["analytics"])
@@ -0,0 +1,41 @@
+from fastapi import APIRouter
+from app.core.cache import cache
+from app.core.config import settings
+from app.db import database
+from app.schemas import admin as schemas_admin
+
+router = APIRouter()
+
+
+@router.get("/pool", response_model=schemas_admin.PoolReport)
+def get_pool_report():
+    """
+    Get live connection pool metrics
+
+    Reports checked-out and overflow connections for this worker process
+    alongside the configured limits, to help size pools per worker.
+    """
+    async_pool = None
+    if database.async_engine is not None:
+        async_pool = database.get_pool_status(database.async_engine.sync_engine)
+
+    return schemas_admin.PoolReport(
+        settings=schemas_admin.PoolSettings(
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+            pool_recycle=settings.DB_POOL_RECYCLE,
+            pool_pre_ping=settings.DB_POOL_PRE_PING,
+            statement_timeout_ms=settings.DB_STATEMENT_TIMEOUT_MS,
+        ),
+        sync_pool=database.get_pool_status(database.engine),
+        async_pool=async_pool,
+    )
+
+
+@router.get("/cache", response_model=schemas_admin.CacheStats)
+def get_cache_stats():
+    """
+    Get cache hit and miss counters for this worker process
+    """
+    return cache.stats()
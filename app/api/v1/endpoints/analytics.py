@@ -0,0 +1,71 @@
+from datetime import datetime
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+from app.db.database import get_db
+from app.crud import analytics as crud_analytics
+from app.schemas import analytics as schemas_analytics
+
+router = APIRouter()
+
+
+@router.get("/sales", response_model=List[schemas_analytics.SalesPoint])
+def get_sales(
+    granularity: schemas_analytics.Granularity = schemas_analytics.Granularity.day,
+    date_from: Optional[datetime] = Query(None, description="First bucket to include"),
+    date_to: Optional[datetime] = Query(None, description="Buckets before this time are included"),
+    category: Optional[str] = None,
+    state: Optional[str] = Query(None, description="Customer state"),
+    seller_id: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """
+    Get sales over time
+
+    Hourly or daily order, item, revenue and freight totals, optionally for
+    one category, customer state or seller. Served from the precomputed
+    rollups, so figures are as of the last refresh.
+    """
+    return crud_analytics.get_sales_series(
+        db, granularity=granularity.value, date_from=date_from, date_to=date_to,
+        category=category, state=state, seller_id=seller_id
+    )
+
+
+@router.get("/sales/by/{dimension}", response_model=List[schemas_analytics.SalesBreakdown])
+def get_sales_breakdown(
+    dimension: schemas_analytics.Dimension,
+    date_from: Optional[datetime] = Query(None, description="First bucket to include"),
+    date_to: Optional[datetime] = Query(None, description="Buckets before this time are included"),
+    granularity: schemas_analytics.Granularity = Query(
+        schemas_analytics.Granularity.day, description="Use hour for periods that do not start or end at midnight"
+    ),
+    limit: int = Query(100, ge=1, le=1000),
+    db: Session = Depends(get_db)
+):
+    """
+    Get sales by category, customer state or seller
+
+    Groups are ranked by revenue over the period, highest first.
+    """
+    return crud_analytics.get_sales_breakdown(
+        db, dimension=dimension.value, granularity=granularity.value,
+        date_from=date_from, date_to=date_to, limit=limit
+    )
+
+
+@router.get("/status", response_model=schemas_analytics.RollupStatus)
+def get_rollup_status(db: Session = Depends(get_db)):
+    """
+    Get rollup freshness
+
+    The latest order purchase time included in the rollups and when they
+    were last refreshed.
+    """
+    state = crud_analytics.get_rollup_state(db)
+    if state is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Sales rollups have not been built yet"
+        )
+    return state
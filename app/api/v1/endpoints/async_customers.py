@@ -0,0 +1,132 @@
+"""
+Async customer read endpoints, mounted in place of the sync ones when ASYNC_DATABASE is enabled
+"""
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.conditional import conditional_get
+from app.core.pagination import set_next_cursor
+from app.db.database import get_async_db
+from app.api.v1.endpoints.async_orders import order_list_response
+from app.api.v1.endpoints.orders import OrderProjection, order_projection
+from app.crud import async_customer as crud_customer
+from app.crud.customer import CUSTOMER_KEYSET
+from app.schemas import customer as schemas_customer
+from app.schemas import order as schemas_order
+
+router = APIRouter()
+
+
+@router.get("/", response_model=List[schemas_customer.Customer])
+async def get_all_customers(
+    request: Request,
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Get all customers
+    """
+    customers = await crud_customer.get_customers(db, skip=skip, limit=limit, cursor=cursor)
+    set_next_cursor(response, customers, CUSTOMER_KEYSET, limit)
+    not_modified = conditional_get(request, response, customers, "customer_id")
+    if not_modified:
+        return not_modified
+    return customers
+
+
+@router.get("/{customer_id}", response_model=schemas_customer.Customer)
+async def get_customer(
+    customer_id: str,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Get a specific customer by ID
+    """
+    db_customer = await crud_customer.get_customer(db, customer_id=customer_id)
+    if db_customer is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Customer not found"
+        )
+    not_modified = conditional_get(request, response, [db_customer], "customer_id")
+    if not_modified:
+        return not_modified
+    return db_customer
+
+
+@router.get("/{customer_id}/orders", response_model=List[schemas_order.OrderResponse])
+async def get_customer_orders(
+    customer_id: str,
+    request: Request,
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    projection: Optional[OrderProjection] = Depends(order_projection),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    View Customer's Orders
+    """
+    db_customer = await crud_customer.get_customer(db, customer_id=customer_id)
+    if db_customer is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Customer not found"
+        )
+    
+    return await order_list_response(
+        request, response, db, skip=skip, limit=limit, cursor=cursor, projection=projection,
+        customer_id=customer_id
+    )
+
+
+@router.get("/city/{city}", response_model=List[schemas_customer.Customer])
+async def get_customers_by_city(
+    city: str,
+    request: Request,
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Get customers by city
+    """
+    customers = await crud_customer.get_customers_by_city(
+        db, city=city, skip=skip, limit=limit, cursor=cursor
+    )
+    set_next_cursor(response, customers, CUSTOMER_KEYSET, limit)
+    not_modified = conditional_get(request, response, customers, "customer_id")
+    if not_modified:
+        return not_modified
+    return customers
+
+
+@router.get("/state/{state}", response_model=List[schemas_customer.Customer])
+async def get_customers_by_state(
+    state: str,
+    request: Request,
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Get customers by state
+    """
+    customers = await crud_customer.get_customers_by_state(
+        db, state=state, skip=skip, limit=limit, cursor=cursor
+    )
+    set_next_cursor(response, customers, CUSTOMER_KEYSET, limit)
+    not_modified = conditional_get(request, response, customers, "customer_id")
+    if not_modified:
+        return not_modified
+    return customers
@@ -0,0 +1,107 @@
+"""
+Async order read endpoints, mounted in place of the sync ones when ASYNC_DATABASE is enabled
+"""
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.database import get_async_db
+from app.api.v1.endpoints.orders import (
+    DEFAULT_ORDER_PROJECTION,
+    OrderProjection,
+    order_projection,
+    render_order,
+    render_orders,
+    use_order_rows,
+)
+from app.crud import async_order as crud_order
+from app.schemas import order as schemas_order
+
+router = APIRouter()
+
+
+async def order_list_response(
+    request: Request,
+    response: Response,
+    db: AsyncSession,
+    skip: int,
+    limit: int,
+    cursor: Optional[str],
+    projection: Optional[OrderProjection] = None,
+    customer_id: Optional[str] = None,
+    order_status: Optional[str] = None,
+):
+    """Shared body of the async order list routes"""
+    if use_order_rows(projection):
+        fields, include = projection or DEFAULT_ORDER_PROJECTION
+        orders = await crud_order.get_order_rows(
+            db, skip=skip, limit=limit, customer_id=customer_id, status=order_status, cursor=cursor,
+            fields=fields, include=include
+        )
+    else:
+        orders = await crud_order.get_orders_with_items(
+            db, skip=skip, limit=limit, customer_id=customer_id, status=order_status, cursor=cursor
+        )
+    return render_orders(request, response, orders, limit, projection)
+
+
+@router.get("/", response_model=List[schemas_order.OrderResponse])
+async def get_all_orders(
+    request: Request,
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    projection: Optional[OrderProjection] = Depends(order_projection),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Get all orders
+    """
+    return await order_list_response(
+        request, response, db, skip=skip, limit=limit, cursor=cursor, projection=projection
+    )
+
+
+@router.get("/{order_id}", response_model=schemas_order.OrderResponse)
+async def get_order(
+    order_id: str,
+    request: Request,
+    response: Response,
+    projection: Optional[OrderProjection] = Depends(order_projection),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Get a specific order by ID
+    """
+    if use_order_rows(projection):
+        fields, include = projection or DEFAULT_ORDER_PROJECTION
+        db_order = await crud_order.get_order_row(db, order_id=order_id, fields=fields, include=include)
+    else:
+        db_order = await crud_order.get_order_with_items(db, order_id=order_id)
+    if db_order is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Order not found"
+        )
+    
+    return render_order(request, response, db_order, projection)
+
+
+@router.get("/status/{status}", response_model=List[schemas_order.OrderResponse])
+async def get_orders_by_status(
+    status: str,
+    request: Request,
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    projection: Optional[OrderProjection] = Depends(order_projection),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Get orders by status
+    """
+    return await order_list_response(
+        request, response, db, skip=skip, limit=limit, cursor=cursor, projection=projection,
+        order_status=status
+    )
@@ -0,0 +1,86 @@
+"""
+Async product read endpoints, mounted in place of the sync ones when ASYNC_DATABASE is enabled
+"""
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.conditional import conditional_get
+from app.core.config import settings
+from app.core.pagination import set_next_cursor
+from app.core.serialization import fast_json_response
+from app.db.database import get_async_db
+from app.crud import async_product as crud_product
+from app.crud.product import PRODUCT_KEYSET
+from app.schemas import product as schemas_product
+
+router = APIRouter()
+
+
+@router.get("/", response_model=List[schemas_product.Product])
+async def get_all_products(
+    request: Request,
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Get All Products
+    """
+    if settings.FAST_JSON_RESPONSES:
+        products = await crud_product.get_product_rows(db, skip=skip, limit=limit, cursor=cursor)
+    else:
+        products = await crud_product.get_products(db, skip=skip, limit=limit, cursor=cursor)
+    set_next_cursor(response, products, PRODUCT_KEYSET, limit)
+    not_modified = conditional_get(request, response, products, "product_id")
+    if not_modified:
+        return not_modified
+    if settings.FAST_JSON_RESPONSES:
+        return fast_json_response(products, response)
+    return products
+
+
+@router.get("/{product_id}", response_model=schemas_product.Product)
+async def get_product(
+    product_id: str,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Get a specific product by ID
+    """
+    db_product = await crud_product.get_product_cached(db, product_id=product_id)
+    if db_product is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Product not found"
+        )
+    not_modified = conditional_get(request, response, [db_product], "product_id")
+    if not_modified:
+        return not_modified
+    return db_product
+
+
+@router.get("/category/{category}", response_model=List[schemas_product.Product])
+async def get_products_by_category(
+    category: str,
+    request: Request,
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Get products by category
+    """
+    products = await crud_product.get_products_by_category_cached(
+        db, category=category, skip=skip, limit=limit, cursor=cursor
+    )
+    set_next_cursor(response, products, PRODUCT_KEYSET, limit)
+    not_modified = conditional_get(request, response, products, "product_id")
+    if not_modified:
+        return not_modified
+    return products
@@ -1,9 +1,11 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from sqlalchemy.orm import Session
+from app.core.conditional import conditional_get
+from app.core.pagination import set_next_cursor
 from app.db.database import get_db
+from app.api.v1.endpoints.orders import OrderProjection, order_list_response, order_projection
 from app.crud import customer as crud_customer
-from app.crud import order as crud_order
 from app.schemas import customer as schemas_customer
 from app.schemas import order as schemas_order
 
@@ -35,20 +37,29 @@ def register_customer(
 
 @router.get("/", response_model=List[schemas_customer.Customer])
 def get_all_customers(
+    request: Request,
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db)
 ):
     """
     Get all customers
     """
-    customers = crud_customer.get_customers(db, skip=skip, limit=limit)
+    customers = crud_customer.get_customers(db, skip=skip, limit=limit, cursor=cursor)
+    set_next_cursor(response, customers, crud_customer.CUSTOMER_KEYSET, limit)
+    not_modified = conditional_get(request, response, customers, "customer_id")
+    if not_modified:
+        return not_modified
     return customers
 
 
 @router.get("/{customer_id}", response_model=schemas_customer.Customer)
 def get_customer(
     customer_id: str,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db)
 ):
     """
@@ -60,14 +71,21 @@ def get_customer(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Customer not found"
         )
+    not_modified = conditional_get(request, response, [db_customer], "customer_id")
+    if not_modified:
+        return not_modified
     return db_customer
 
 
 @router.get("/{customer_id}/orders", response_model=List[schemas_order.OrderResponse])
 def get_customer_orders(
     customer_id: str,
+    request: Request,
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
+    projection: Optional[OrderProjection] = Depends(order_projection),
     db: Session = Depends(get_db)
 ):
     """
@@ -85,24 +103,11 @@ def get_customer_orders(
             detail="Customer not found"
         )
     
-    # Get customer orders
-    orders = crud_order.get_customer_orders(db, customer_id=customer_id, skip=skip, limit=limit)
-    
-    # Build response with order totals and items
-    order_responses = []
-    for order in orders:
-        total_amount = crud_order.get_order_total(db, order.order_id)
-        order_response = schemas_order.OrderResponse(
-            order_id=order.order_id,
-            customer_id=order.customer_id,
-            order_status=order.order_status,
-            order_purchase_timestamp=order.order_purchase_timestamp,
-            total_amount=total_amount,
-            items=order.order_items
-        )
-        order_responses.append(order_response)
-    
-    return order_responses
+    # Get customer orders with their totals and items in one round trip
+    return order_list_response(
+        request, response, db, skip=skip, limit=limit, cursor=cursor, projection=projection,
+        customer_id=customer_id
+    )
 
 
 @router.put("/{customer_id}", response_model=schemas_customer.Customer)
@@ -142,26 +147,44 @@ def delete_customer(
 @router.get("/city/{city}", response_model=List[schemas_customer.Customer])
 def get_customers_by_city(
     city: str,
+    request: Request,
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db)
 ):
     """
     Get customers by city
     """
-    customers = crud_customer.get_customers_by_city(db, city=city, skip=skip, limit=limit)
+    customers = crud_customer.get_customers_by_city(
+        db, city=city, skip=skip, limit=limit, cursor=cursor
+    )
+    set_next_cursor(response, customers, crud_customer.CUSTOMER_KEYSET, limit)
+    not_modified = conditional_get(request, response, customers, "customer_id")
+    if not_modified:
+        return not_modified
     return customers
 
 
 @router.get("/state/{state}", response_model=List[schemas_customer.Customer])
 def get_customers_by_state(
     state: str,
+    request: Request,
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db)
 ):
     """
     Get customers by state
     """
-    customers = crud_customer.get_customers_by_state(db, state=state, skip=skip, limit=limit)
+    customers = crud_customer.get_customers_by_state(
+        db, state=state, skip=skip, limit=limit, cursor=cursor
+    )
+    set_next_cursor(response, customers, crud_customer.CUSTOMER_KEYSET, limit)
+    not_modified = conditional_get(request, response, customers, "customer_id")
+    if not_modified:
+        return not_modified
     return customers
@@ -0,0 +1,66 @@
+"""
+Streaming bulk export endpoints
+
+Registered ahead of the resource routers so ``/orders/export`` is not
+captured by ``/orders/{order_id}``.
+"""
+from datetime import datetime
+from typing import Callable, Optional
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.export import ExportFormat, export_response
+from app.db.database import get_session_factory
+from app.crud import order as crud_order
+from app.crud import customer as crud_customer
+from app.crud import product as crud_product
+
+router = APIRouter()
+
+
+@router.get("/orders/export", tags=["orders"])
+def export_orders(
+    format: ExportFormat = ExportFormat.ndjson,
+    status: Optional[str] = None,
+    customer_id: Optional[str] = None,
+    purchased_from: Optional[datetime] = None,
+    purchased_to: Optional[datetime] = None,
+    session_factory: Callable[[], Session] = Depends(get_session_factory)
+):
+    """
+    Export orders as NDJSON or CSV
+
+    Streams every matching order, oldest purchase first, straight from a
+    server-side cursor. `purchased_to` is exclusive.
+    """
+    statement = crud_order.export_orders_statement(
+        status=status, customer_id=customer_id, purchased_from=purchased_from, purchased_to=purchased_to
+    )
+    return export_response(session_factory, statement, format, "orders", settings.EXPORT_BATCH_SIZE)
+
+
+@router.get("/customers/export", tags=["customers"])
+def export_customers(
+    format: ExportFormat = ExportFormat.ndjson,
+    state: Optional[str] = None,
+    city: Optional[str] = None,
+    session_factory: Callable[[], Session] = Depends(get_session_factory)
+):
+    """
+    Export customers as NDJSON or CSV
+    """
+    statement = crud_customer.export_customers_statement(state=state, city=city)
+    return export_response(session_factory, statement, format, "customers", settings.EXPORT_BATCH_SIZE)
+
+
+@router.get("/products/export", tags=["products"])
+def export_products(
+    format: ExportFormat = ExportFormat.ndjson,
+    category: Optional[str] = None,
+    session_factory: Callable[[], Session] = Depends(get_session_factory)
+):
+    """
+    Export products as NDJSON or CSV
+    """
+    statement = crud_product.export_products_statement(category=category)
+    return export_response(session_factory, statement, format, "products", settings.EXPORT_BATCH_SIZE)
@@ -0,0 +1,99 @@
+from typing import Callable, List
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+from app.core.geo import GeoIndex, geo_index
+from app.db.database import get_db, get_session_factory
+from app.crud import customer as crud_customer
+from app.crud import geo as crud_geo
+from app.schemas import geo as schemas_geo
+
+router = APIRouter()
+
+
+def get_geo_index(
+    db: Session = Depends(get_db),
+    session_factory: Callable[[], Session] = Depends(get_session_factory),
+) -> GeoIndex:
+    """The in-memory spatial index; only built on the request path when there is none yet"""
+    return geo_index.get(
+        lambda: crud_geo.load_geo_index(db),
+        background_loader=lambda: crud_geo.build_geo_index(session_factory),
+    )
+
+
+@router.get("/customers/{customer_id}/nearest-sellers", response_model=List[schemas_geo.NearestSeller])
+def get_nearest_sellers(
+    customer_id: str,
+    k: int = Query(5, ge=1, le=100, description="Number of sellers to return"),
+    db: Session = Depends(get_db),
+    index: GeoIndex = Depends(get_geo_index),
+):
+    """
+    Get the sellers nearest to a customer
+
+    Distances are great-circle kilometres between zip code prefix centroids.
+    Sellers whose zip code prefix has no coordinates are not ranked.
+    """
+    db_customer = crud_customer.get_customer(db, customer_id=customer_id)
+    if db_customer is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Customer not found"
+        )
+    location = index.coordinates(db_customer.customer_zip_code_prefix)
+    if location is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"No coordinates for zip code prefix {db_customer.customer_zip_code_prefix}"
+        )
+    
+    return [
+        schemas_geo.NearestSeller(
+            seller_id=seller.seller_id,
+            seller_zip_code_prefix=seller.zip_code_prefix,
+            seller_city=seller.city,
+            seller_state=seller.state,
+            distance_km=round(distance, 3),
+        )
+        for seller, distance in index.nearest_sellers(*location, k)
+    ]
+
+
+@router.get(
+    "/orders/{order_id}/items/{order_item_id}/distance",
+    response_model=schemas_geo.OrderItemDistance,
+)
+def get_order_item_distance(
+    order_id: str,
+    order_item_id: int,
+    db: Session = Depends(get_db),
+    index: GeoIndex = Depends(get_geo_index),
+):
+    """
+    Get the delivery distance of an order item
+
+    Great-circle kilometres from the item's seller to the order's customer,
+    for freight estimation.
+    """
+    item = crud_geo.get_order_item_endpoints(db, order_id=order_id, order_item_id=order_item_id)
+    if item is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Order item not found"
+        )
+    distance = index.distance_km(item.seller_zip_code_prefix, item.customer_zip_code_prefix)
+    if distance is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No coordinates for the seller or customer zip code prefix"
+        )
+    
+    return schemas_geo.OrderItemDistance(
+        order_id=item.order_id,
+        order_item_id=item.order_item_id,
+        seller_id=item.seller_id,
+        customer_id=item.customer_id,
+        seller_zip_code_prefix=item.seller_zip_code_prefix,
+        customer_zip_code_prefix=item.customer_zip_code_prefix,
+        distance_km=round(distance, 3),
+    )
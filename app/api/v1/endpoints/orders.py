@@ -1,15 +1,167 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Any, Dict, Iterable, List, Mapping, NamedTuple, Optional, Sequence, Set, Tuple
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from sqlalchemy.orm import Session
+from app.core.conditional import conditional_get
+from app.core.metrics import ORDERS_CREATED
+from app.core.config import settings
+from app.core.pagination import set_next_cursor
+from app.core.serialization import fast_json_response
 from app.db.database import get_db
 from app.crud import order as crud_order
 from app.crud import customer as crud_customer
 from app.crud import product as crud_product
+from app.crud import seller as crud_seller
 from app.schemas import order as schemas_order
 
 router = APIRouter()
 
 
+def build_order_response(db_order) -> schemas_order.OrderResponse:
+    """Build an order response from an order whose items are already loaded"""
+    return schemas_order.OrderResponse(
+        order_id=db_order.order_id,
+        customer_id=db_order.customer_id,
+        order_status=db_order.order_status,
+        order_purchase_timestamp=db_order.order_purchase_timestamp,
+        total_amount=db_order.total_amount,
+        item_count=db_order.item_count,
+        updated_at=db_order.updated_at,
+        items=db_order.order_items
+    )
+
+
+class OrderProjection(NamedTuple):
+    """Order columns and embedded relationships requested with ?fields= / ?include="""
+    fields: Tuple[str, ...]
+    include: Tuple[str, ...]
+
+    @property
+    def variant(self) -> str:
+        return f"fields={','.join(self.fields)}&include={','.join(self.include)}"
+
+    def apply(self, order: Mapping[str, Any]) -> Dict[str, Any]:
+        return {name: order[name] for name in (*self.fields, *self.include)}
+
+
+# What the fast row path reads when no projection is requested: the full OrderResponse
+DEFAULT_ORDER_PROJECTION = OrderProjection(crud_order.ORDER_RESPONSE_FIELDS, ("items",))
+
+
+def _parse_names(value: str, allowed: Iterable[str], label: str) -> Tuple[str, ...]:
+    names = tuple(dict.fromkeys(name.strip() for name in value.split(",") if name.strip()))
+    unknown = [name for name in names if name not in allowed]
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown {label}: {', '.join(unknown)}"
+        )
+    return names
+
+
+def order_projection(
+    fields: Optional[str] = Query(
+        None, description="Comma-separated order columns to return, e.g. order_id,order_status,total_amount"
+    ),
+    include: Optional[str] = Query(
+        None, description="Comma-separated relationships to embed: items, payments, reviews"
+    ),
+) -> Optional[OrderProjection]:
+    """
+    Parse sparse fieldset parameters; None means the full OrderResponse.
+
+    Once either parameter is given, only the listed relationships are
+    embedded, so ?fields= alone returns bare order rows.
+    """
+    if fields is None and include is None:
+        return None
+    return OrderProjection(
+        fields=_parse_names(fields, crud_order.ORDER_FIELDS, "order fields")
+        if fields is not None else crud_order.ORDER_RESPONSE_FIELDS,
+        include=_parse_names(include, crud_order.ORDER_RELATIONS, "order relations")
+        if include is not None else (),
+    )
+
+
+def render_order(
+    request: Request, response: Response, order: Any, projection: Optional[OrderProjection]
+):
+    """Conditional GET and serialization shared by the sync and async single-order routes"""
+    not_modified = conditional_get(
+        request, response, [order], "order_id", projection.variant if projection else ""
+    )
+    if not_modified:
+        return not_modified
+    if projection is not None:
+        return fast_json_response(projection.apply(order), response)
+    if isinstance(order, Mapping):
+        return fast_json_response(order, response)
+    return build_order_response(order)
+
+
+def render_orders(
+    request: Request,
+    response: Response,
+    orders: Sequence[Any],
+    limit: int,
+    projection: Optional[OrderProjection],
+):
+    """
+    Cursor header, conditional GET and serialization shared by the sync and
+    async order list routes. Row dicts come from the fast path or a
+    projection and skip response_model validation.
+    """
+    set_next_cursor(response, orders, crud_order.ORDER_KEYSET, limit)
+    not_modified = conditional_get(
+        request, response, orders, "order_id", projection.variant if projection else ""
+    )
+    if not_modified:
+        return not_modified
+    if projection is not None:
+        return fast_json_response([projection.apply(order) for order in orders], response)
+    if orders and isinstance(orders[0], Mapping):
+        return fast_json_response(orders, response)
+    return [build_order_response(order) for order in orders]
+
+
+def use_order_rows(projection: Optional[OrderProjection]) -> bool:
+    """Whether to read orders as row dicts instead of ORM objects"""
+    return projection is not None or settings.FAST_JSON_RESPONSES
+
+
+def order_list_response(
+    request: Request,
+    response: Response,
+    db: Session,
+    skip: int,
+    limit: int,
+    cursor: Optional[str],
+    projection: Optional[OrderProjection] = None,
+    customer_id: Optional[str] = None,
+    order_status: Optional[str] = None,
+):
+    """Shared body of the sync order list routes"""
+    if use_order_rows(projection):
+        fields, include = projection or DEFAULT_ORDER_PROJECTION
+        orders = crud_order.get_order_rows(
+            db, skip=skip, limit=limit, customer_id=customer_id, status=order_status, cursor=cursor,
+            fields=fields, include=include
+        )
+    else:
+        orders = crud_order.get_orders_with_items(
+            db, skip=skip, limit=limit, customer_id=customer_id, status=order_status, cursor=cursor
+        )
+    return render_orders(request, response, orders, limit, projection)
+
+
+def missing_references_detail(label: str, requested: Iterable[str], existing: Set[str]) -> Optional[str]:
+    """Name every requested id that does not exist, e.g. 'Products a, b not found'"""
+    missing = sorted(set(requested) - existing)
+    if not missing:
+        return None
+    noun = label if len(missing) == 1 else f"{label}s"
+    return f"{noun} {', '.join(missing)} not found"
+
+
 @router.post("/", response_model=schemas_order.OrderResponse, status_code=status.HTTP_201_CREATED)
 def create_order(
     order: schemas_order.OrderCreate,
@@ -31,84 +183,124 @@ def create_order(
             detail="Customer not found"
         )
     
-    # Validate all products exist
-    for item in order.items:
-        db_product = crud_product.get_product(db, product_id=item.product_id)
-        if db_product is None:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Product {item.product_id} not found"
-            )
+    # Validate all products and sellers exist, one query each
+    product_ids = {item.product_id for item in order.items}
+    seller_ids = {item.seller_id for item in order.items}
+    detail = (
+        missing_references_detail("Product", product_ids, crud_product.get_existing_product_ids(db, product_ids))
+        or missing_references_detail("Seller", seller_ids, crud_seller.get_existing_seller_ids(db, seller_ids))
+    )
+    if detail:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=detail
+        )
     
     # Create the order
     db_order = crud_order.create_order(db=db, order_data=order)
-    
-    # Calculate total amount
-    total_amount = crud_order.get_order_total(db, db_order.order_id)
+    ORDERS_CREATED.labels("single").inc()
     
     # Return order response
-    return schemas_order.OrderResponse(
-        order_id=db_order.order_id,
-        customer_id=db_order.customer_id,
-        order_status=db_order.order_status,
-        order_purchase_timestamp=db_order.order_purchase_timestamp,
-        total_amount=total_amount,
-        items=db_order.order_items
+    return build_order_response(db_order)
+
+
+@router.post("/batch", response_model=schemas_order.OrderBatchResponse)
+def create_orders_batch(
+    batch: schemas_order.OrderBatchCreate,
+    db: Session = Depends(get_db)
+):
+    """
+    Create many orders in one transaction
+
+    Customers, products and sellers for the whole batch are validated with set-based
+    lookups. Valid orders are bulk inserted and committed together; invalid
+    ones are reported per order and skipped.
+    """
+    customer_ids = crud_customer.get_existing_customer_ids(
+        db, (order.customer_id for order in batch.orders)
+    )
+    product_ids = crud_product.get_existing_product_ids(
+        db, (item.product_id for order in batch.orders for item in order.items)
+    )
+    seller_ids = crud_seller.get_existing_seller_ids(
+        db, (item.seller_id for order in batch.orders for item in order.items)
+    )
+    
+    results = []
+    valid_orders = []
+    for index, order in enumerate(batch.orders):
+        item_ids = [item.order_item_id for item in order.items]
+        if order.customer_id not in customer_ids:
+            error = "Customer not found"
+        elif len(item_ids) != len(set(item_ids)):
+            error = "Duplicate order_item_id in order"
+        else:
+            error = (
+                missing_references_detail("Product", (item.product_id for item in order.items), product_ids)
+                or missing_references_detail("Seller", (item.seller_id for item in order.items), seller_ids)
+            )
+        
+        if error is None:
+            valid_orders.append(order)
+        results.append(schemas_order.OrderBatchResult(index=index, error=error))
+    
+    created = iter(crud_order.create_orders_bulk(db, valid_orders))
+    ORDERS_CREATED.labels("batch").inc(len(valid_orders))
+    for result in results:
+        if result.error is None:
+            result.order_id, result.total_amount = next(created)
+    
+    return schemas_order.OrderBatchResponse(
+        created=len(valid_orders),
+        failed=len(results) - len(valid_orders),
+        results=results
     )
 
 
 @router.get("/", response_model=List[schemas_order.OrderResponse])
 def get_all_orders(
+    request: Request,
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
+    projection: Optional[OrderProjection] = Depends(order_projection),
     db: Session = Depends(get_db)
 ):
     """
     Get all orders
+
+    Use `fields` and `include` to return only some order columns and
+    relationships; unrequested columns and relationships are not queried.
     """
-    orders = crud_order.get_orders(db, skip=skip, limit=limit)
-    
-    order_responses = []
-    for order in orders:
-        total_amount = crud_order.get_order_total(db, order.order_id)
-        order_response = schemas_order.OrderResponse(
-            order_id=order.order_id,
-            customer_id=order.customer_id,
-            order_status=order.order_status,
-            order_purchase_timestamp=order.order_purchase_timestamp,
-            total_amount=total_amount,
-            items=order.order_items
-        )
-        order_responses.append(order_response)
-    
-    return order_responses
+    return order_list_response(
+        request, response, db, skip=skip, limit=limit, cursor=cursor, projection=projection
+    )
 
 
 @router.get("/{order_id}", response_model=schemas_order.OrderResponse)
 def get_order(
     order_id: str,
+    request: Request,
+    response: Response,
+    projection: Optional[OrderProjection] = Depends(order_projection),
     db: Session = Depends(get_db)
 ):
     """
     Get a specific order by ID
     """
-    db_order = crud_order.get_order_with_items(db, order_id=order_id)
+    if use_order_rows(projection):
+        fields, include = projection or DEFAULT_ORDER_PROJECTION
+        db_order = crud_order.get_order_row(db, order_id=order_id, fields=fields, include=include)
+    else:
+        db_order = crud_order.get_order_with_items(db, order_id=order_id)
     if db_order is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Order not found"
         )
     
-    total_amount = crud_order.get_order_total(db, order_id)
-    
-    return schemas_order.OrderResponse(
-        order_id=db_order.order_id,
-        customer_id=db_order.customer_id,
-        order_status=db_order.order_status,
-        order_purchase_timestamp=db_order.order_purchase_timestamp,
-        total_amount=total_amount,
-        items=db_order.order_items
-    )
+    return render_order(request, response, db_order, projection)
 
 
 @router.put("/{order_id}", response_model=schemas_order.OrderResponse)
@@ -127,16 +319,7 @@ def update_order(
             detail="Order not found"
         )
     
-    total_amount = crud_order.get_order_total(db, order_id)
-    
-    return schemas_order.OrderResponse(
-        order_id=db_order.order_id,
-        customer_id=db_order.customer_id,
-        order_status=db_order.order_status,
-        order_purchase_timestamp=db_order.order_purchase_timestamp,
-        total_amount=total_amount,
-        items=db_order.order_items
-    )
+    return build_order_response(db_order)
 
 
 @router.delete("/{order_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -155,29 +338,42 @@ def delete_order(
         )
 
 
+@router.post(
+    "/{order_id}/reviews", response_model=schemas_order.OrderReviewInDB, status_code=status.HTTP_201_CREATED
+)
+def create_order_review(
+    order_id: str,
+    review: schemas_order.OrderReviewCreate,
+    db: Session = Depends(get_db)
+):
+    """
+    Review an order
+
+    The score counts towards the scorecard of every seller in the order.
+    """
+    if crud_order.get_order(db, order_id=order_id) is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Order not found"
+        )
+    return crud_order.create_review(db, order_id=order_id, review_data=review)
+
+
 @router.get("/status/{status}", response_model=List[schemas_order.OrderResponse])
 def get_orders_by_status(
     status: str,
+    request: Request,
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
+    projection: Optional[OrderProjection] = Depends(order_projection),
     db: Session = Depends(get_db)
 ):
     """
     Get orders by status
     """
-    orders = crud_order.get_orders_by_status(db, status=status, skip=skip, limit=limit)
-    
-    order_responses = []
-    for order in orders:
-        total_amount = crud_order.get_order_total(db, order.order_id)
-        order_response = schemas_order.OrderResponse(
-            order_id=order.order_id,
-            customer_id=order.customer_id,
-            order_status=order.order_status,
-            order_purchase_timestamp=order.order_purchase_timestamp,
-            total_amount=total_amount,
-            items=order.order_items
-        )
-        order_responses.append(order_response)
-    
-    return order_responses
+    return order_list_response(
+        request, response, db, skip=skip, limit=limit, cursor=cursor, projection=projection,
+        order_status=status
+    )
@@ -1,17 +1,27 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Callable, List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from sqlalchemy.orm import Session
-from app.db.database import get_db
+from app.core.conditional import conditional_get
+from app.core.config import settings
+from app.core.pagination import set_next_cursor
+from app.core.recommendations import RelatedProductsIndex, recommendations
+from app.core.serialization import fast_json_response
+from app.db.database import get_db, get_session_factory
 from app.crud import product as crud_product
+from app.crud import recommendation as crud_recommendation
 from app.schemas import product as schemas_product
+from app.schemas import recommendation as schemas_recommendation
 
 router = APIRouter()
 
 
 @router.get("/", response_model=List[schemas_product.Product])
 def get_all_products(
+    request: Request,
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db)
 ):
     """
@@ -19,28 +29,78 @@ def get_all_products(
     
     As a customer, I want to view all available products so I can decide what to purchase.
     Returns a list of all products, including their ID, name, price, and stock availability.
+    Pass the X-Next-Cursor response header back as `cursor` to fetch the next page.
     """
-    products = crud_product.get_products(db, skip=skip, limit=limit)
+    if settings.FAST_JSON_RESPONSES:
+        products = crud_product.get_product_rows(db, skip=skip, limit=limit, cursor=cursor)
+    else:
+        products = crud_product.get_products(db, skip=skip, limit=limit, cursor=cursor)
+    set_next_cursor(response, products, crud_product.PRODUCT_KEYSET, limit)
+    not_modified = conditional_get(request, response, products, "product_id")
+    if not_modified:
+        return not_modified
+    if settings.FAST_JSON_RESPONSES:
+        return fast_json_response(products, response)
     return products
 
 
 @router.get("/{product_id}", response_model=schemas_product.Product)
 def get_product(
     product_id: str,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db)
 ):
     """
     Get a specific product by ID
     """
-    db_product = crud_product.get_product(db, product_id=product_id)
+    db_product = crud_product.get_product_cached(db, product_id=product_id)
     if db_product is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Product not found"
         )
+    not_modified = conditional_get(request, response, [db_product], "product_id")
+    if not_modified:
+        return not_modified
     return db_product
 
 
+def get_recommendations(
+    db: Session = Depends(get_db),
+    session_factory: Callable[[], Session] = Depends(get_session_factory),
+) -> RelatedProductsIndex:
+    """The in-memory co-purchase index; only built on the request path when there is none yet"""
+    return recommendations.get(
+        lambda since: crud_recommendation.load_baskets(db, since),
+        background_loader=lambda since: crud_recommendation.read_baskets(session_factory, since),
+    )
+
+
+@router.get("/{product_id}/related", response_model=List[schemas_recommendation.RelatedProduct])
+def get_related_products(
+    product_id: str,
+    limit: int = Query(10, ge=1, le=settings.RECOMMENDATIONS_TOP_K),
+    db: Session = Depends(get_db),
+    index: RelatedProductsIndex = Depends(get_recommendations),
+):
+    """
+    Get products frequently bought together with a product
+
+    Ranked by the number of orders containing both; served from a
+    precomputed index that picks up new orders every few minutes.
+    """
+    if crud_product.get_product_cached(db, product_id=product_id) is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Product not found"
+        )
+    return [
+        schemas_recommendation.RelatedProduct(product_id=related_id, co_purchase_count=count)
+        for related_id, count in index.related(product_id, limit)
+    ]
+
+
 @router.post("/", response_model=schemas_product.Product, status_code=status.HTTP_201_CREATED)
 def create_product(
     product: schemas_product.ProductCreate,
@@ -97,12 +157,21 @@ def delete_product(
 @router.get("/category/{category}", response_model=List[schemas_product.Product])
 def get_products_by_category(
     category: str,
+    request: Request,
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db)
 ):
     """
     Get products by category
     """
-    products = crud_product.get_products_by_category(db, category=category, skip=skip, limit=limit)
+    products = crud_product.get_products_by_category_cached(
+        db, category=category, skip=skip, limit=limit, cursor=cursor
+    )
+    set_next_cursor(response, products, crud_product.PRODUCT_KEYSET, limit)
+    not_modified = conditional_get(request, response, products, "product_id")
+    if not_modified:
+        return not_modified
     return products
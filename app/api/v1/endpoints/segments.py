@@ -0,0 +1,63 @@
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy.orm import Session
+from app.core.pagination import set_next_cursor
+from app.db.database import get_db
+from app.crud import customer as crud_customer
+from app.crud import segmentation as crud_segmentation
+from app.schemas import segmentation as schemas_segmentation
+
+router = APIRouter()
+
+
+@router.get("/customers/{customer_id}/segment", response_model=schemas_segmentation.CustomerSegment)
+def get_customer_segment(
+    customer_id: str,
+    db: Session = Depends(get_db)
+):
+    """
+    Get a customer's RFM scores and segment
+
+    Scored per person: every customer_id sharing the customer's
+    customer_unique_id gets the same segment.
+    """
+    db_customer = crud_customer.get_customer(db, customer_id=customer_id)
+    if db_customer is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Customer not found"
+        )
+    db_segment = crud_segmentation.get_customer_segment(db, db_customer.customer_unique_id)
+    if db_segment is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Customer has not been segmented"
+        )
+    return db_segment
+
+
+@router.get("/segments", response_model=List[schemas_segmentation.SegmentSummary])
+def get_segments(db: Session = Depends(get_db)):
+    """
+    Get every segment's size and average recency, frequency and monetary value
+    """
+    return crud_segmentation.get_segment_summary(db)
+
+
+@router.get("/segments/{segment}", response_model=List[schemas_segmentation.CustomerSegment])
+def get_segment_customers(
+    segment: schemas_segmentation.Segment,
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """
+    Get the customers in a segment
+    """
+    customers = crud_segmentation.get_segment_customers(
+        db, segment.value, skip=skip, limit=limit, cursor=cursor
+    )
+    set_next_cursor(response, customers, crud_segmentation.SEGMENT_KEYSET, limit)
+    return customers
@@ -0,0 +1,143 @@
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy.orm import Session
+from app.core.pagination import set_next_cursor
+from app.db import models
+from app.db.database import get_db
+from app.crud import seller as crud_seller
+from app.schemas import seller as schemas_seller
+
+router = APIRouter()
+
+
+def build_scorecard(seller_id: str, stats: Optional[models.SellerStats]) -> schemas_seller.SellerScorecard:
+    """Derive the scorecard ratios from the running seller_stats counters"""
+    if stats is None:
+        return schemas_seller.SellerScorecard(seller_id=seller_id)
+    return schemas_seller.SellerScorecard(
+        seller_id=seller_id,
+        order_count=stats.order_count,
+        item_count=stats.item_count,
+        gmv=round(stats.gmv, 2),
+        review_count=stats.review_count,
+        average_review_score=stats.review_score_sum / stats.review_count if stats.review_count else None,
+        delivered_count=stats.delivered_count,
+        on_time_delivery_rate=stats.on_time_count / stats.delivered_count if stats.delivered_count else None,
+        average_dispatch_hours=(
+            stats.dispatch_seconds_sum / stats.dispatch_count / 3600 if stats.dispatch_count else None
+        ),
+        updated_at=stats.updated_at,
+    )
+
+
+@router.post("/", response_model=schemas_seller.Seller, status_code=status.HTTP_201_CREATED)
+def create_seller(
+    seller: schemas_seller.SellerCreate,
+    db: Session = Depends(get_db)
+):
+    """
+    Create a new seller
+    """
+    db_seller = crud_seller.get_seller(db, seller_id=seller.seller_id)
+    if db_seller:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Seller with this ID already exists"
+        )
+    
+    return crud_seller.create_seller(db=db, seller_data=seller)
+
+
+@router.get("/", response_model=List[schemas_seller.Seller])
+def get_all_sellers(
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """
+    Get all sellers
+    """
+    sellers = crud_seller.get_sellers(db, skip=skip, limit=limit, cursor=cursor)
+    set_next_cursor(response, sellers, crud_seller.SELLER_KEYSET, limit)
+    return sellers
+
+
+@router.get("/{seller_id}", response_model=schemas_seller.Seller)
+def get_seller(
+    seller_id: str,
+    db: Session = Depends(get_db)
+):
+    """
+    Get a specific seller by ID
+    """
+    db_seller = crud_seller.get_seller(db, seller_id=seller_id)
+    if db_seller is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Seller not found"
+        )
+    return db_seller
+
+
+@router.get("/{seller_id}/scorecard", response_model=schemas_seller.SellerScorecard)
+def get_seller_scorecard(
+    seller_id: str,
+    db: Session = Depends(get_db)
+):
+    """
+    Get a seller's performance scorecard
+
+    GMV, average review score, on-time delivery rate and average dispatch
+    latency, read from counters that are kept up to date as orders, reviews
+    and status changes are written, so no orders are scanned here.
+    """
+    db_seller = crud_seller.get_seller(db, seller_id=seller_id)
+    if db_seller is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Seller not found"
+        )
+    return build_scorecard(seller_id, crud_seller.get_seller_stats(db, seller_id))
+
+
+@router.put("/{seller_id}", response_model=schemas_seller.Seller)
+def update_seller(
+    seller_id: str,
+    seller: schemas_seller.SellerUpdate,
+    db: Session = Depends(get_db)
+):
+    """
+    Update a seller
+    """
+    db_seller = crud_seller.update_seller(db, seller_id=seller_id, seller_data=seller)
+    if db_seller is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Seller not found"
+        )
+    return db_seller
+
+
+@router.delete("/{seller_id}", status_code=status.HTTP_204_NO_CONTENT)
+def delete_seller(
+    seller_id: str,
+    db: Session = Depends(get_db)
+):
+    """
+    Delete a seller
+
+    Sellers referenced by order items cannot be deleted.
+    """
+    if crud_seller.seller_has_order_items(db, seller_id):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Seller has order items"
+        )
+    success = crud_seller.delete_seller(db, seller_id=seller_id)
+    if not success:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Seller not found"
+        )
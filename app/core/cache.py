@@ -0,0 +1,245 @@
+"""
+Read-through response cache
+
+``Cache`` stores JSON-serializable values under namespaced keys and counts
+hits and misses. Storage is delegated to a backend: an in-process LRU with
+TTL expiry, or any Redis-compatible client (``get``/``set(ex=)``/``delete``/
+``incr``/``scan_iter``).
+
+Groups of keys that cannot be enumerated cheaply (e.g. every page of a
+category listing) are invalidated by bumping a generation counter that is
+part of their keys, so stale entries are simply never read again.
+"""
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from app.core.config import settings
+
+
+class CacheBackend:
+    """Minimal Redis-compatible key/value interface used by ``Cache``"""
+
+    def get(self, key: str) -> Optional[str]:
+        raise NotImplementedError
+
+    def set(self, key: str, value: str, ttl: int) -> None:
+        raise NotImplementedError
+
+    def delete(self, key: str) -> None:
+        raise NotImplementedError
+
+    def incr(self, key: str) -> int:
+        raise NotImplementedError
+
+    def clear(self, prefix: str) -> None:
+        """Delete every key, values and counters alike, that starts with ``prefix``"""
+        raise NotImplementedError
+
+    def size(self) -> Optional[int]:
+        return None
+
+
+class NullCacheBackend(CacheBackend):
+    """Stores nothing; every read is a miss"""
+
+    def __init__(self):
+        self._counters: Dict[str, int] = {}
+
+    def get(self, key: str) -> Optional[str]:
+        return None
+
+    def set(self, key: str, value: str, ttl: int) -> None:
+        pass
+
+    def delete(self, key: str) -> None:
+        pass
+
+    def incr(self, key: str) -> int:
+        self._counters[key] = self._counters.get(key, 0) + 1
+        return self._counters[key]
+
+    def clear(self, prefix: str) -> None:
+        self._counters = {key: value for key, value in self._counters.items() if not key.startswith(prefix)}
+
+
+class MemoryCacheBackend(CacheBackend):
+    """Thread-safe in-process LRU with per-entry TTL and a bounded number of entries"""
+
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        # Counters live outside the LRU so eviction can never reset a generation
+        self._counters: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            if key in self._counters:
+                return str(self._counters[key])
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: str, ttl: int) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+            self._counters.pop(key, None)
+
+    def incr(self, key: str) -> int:
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + 1
+            return self._counters[key]
+
+    def clear(self, prefix: str) -> None:
+        with self._lock:
+            for key in [key for key in self._entries if key.startswith(prefix)]:
+                del self._entries[key]
+            self._counters = {key: value for key, value in self._counters.items() if not key.startswith(prefix)}
+
+    def size(self) -> Optional[int]:
+        return len(self._entries)
+
+
+class RedisCacheBackend(CacheBackend):
+    """Adapter for a redis-py compatible client"""
+
+    def __init__(self, client):
+        self.client = client
+
+    def get(self, key: str) -> Optional[str]:
+        value = self.client.get(key)
+        if isinstance(value, bytes):
+            value = value.decode()
+        return value
+
+    def set(self, key: str, value: str, ttl: int) -> None:
+        self.client.set(key, value, ex=ttl)
+
+    def delete(self, key: str) -> None:
+        self.client.delete(key)
+
+    def incr(self, key: str) -> int:
+        return int(self.client.incr(key))
+
+    def clear(self, prefix: str) -> None:
+        # SCAN rather than KEYS so a large keyspace does not block the server
+        batch = []
+        for key in self.client.scan_iter(match=f"{prefix}*", count=1000):
+            batch.append(key)
+            if len(batch) >= 1000:
+                self.client.delete(*batch)
+                batch = []
+        if batch:
+            self.client.delete(*batch)
+
+
+class Cache:
+    def __init__(
+        self,
+        backend: CacheBackend,
+        ttl: int = 300,
+        namespace: str = "cache",
+        on_lookup: Optional[Callable[[bool], None]] = None,
+    ):
+        self.backend = backend
+        self.ttl = ttl
+        self.namespace = namespace
+        self.hits = 0
+        self.misses = 0
+        # Lookups run on threadpool threads
+        self._stats_lock = threading.Lock()
+        # Called with whether each lookup was a hit, e.g. to export it as a metric
+        self.on_lookup = on_lookup
+
+    def generation(self, name: str) -> int:
+        value = self.backend.get(f"{self.namespace}:gen:{name}")
+        return int(value) if value is not None else 0
+
+    def bump(self, name: str) -> None:
+        """Invalidate every key built with ``generation(name)``"""
+        self.backend.incr(f"{self.namespace}:gen:{name}")
+
+    def key(self, *parts: Any) -> str:
+        return ":".join([self.namespace, *map(str, parts)])
+
+    def get_or_load(self, key: str, loader: Callable[[], Any]) -> Any:
+        """Return the cached value for ``key``, calling ``loader`` on a miss; None is never cached"""
+        cached = self.backend.get(key)
+        self._record(hit=cached is not None)
+        if cached is not None:
+            return json.loads(cached)
+        value = loader()
+        if value is not None:
+            self.backend.set(key, json.dumps(value, default=str), self.ttl)
+        return value
+
+    async def get_or_load_async(self, key: str, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """get_or_load for a coroutine ``loader``, e.g. a query on the async engine"""
+        cached = self.backend.get(key)
+        self._record(hit=cached is not None)
+        if cached is not None:
+            return json.loads(cached)
+        value = await loader()
+        if value is not None:
+            self.backend.set(key, json.dumps(value, default=str), self.ttl)
+        return value
+
+    def _record(self, hit: bool) -> None:
+        with self._stats_lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+        if self.on_lookup is not None:
+            self.on_lookup(hit)
+
+    def delete(self, key: str) -> None:
+        self.backend.delete(key)
+
+    def clear(self) -> None:
+        """Drop every value and generation in this cache's namespace"""
+        self.backend.clear(f"{self.namespace}:")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            hits, misses = self.hits, self.misses
+        lookups = hits + misses
+        return {
+            "backend": type(self.backend).__name__,
+            "hits": hits,
+            "misses": misses,
+            "hit_ratio": hits / lookups if lookups else 0.0,
+            "size": self.backend.size(),
+        }
+
+
+def build_cache_backend() -> CacheBackend:
+    if settings.CACHE_BACKEND == "memory":
+        return MemoryCacheBackend(max_entries=settings.CACHE_MAX_ENTRIES)
+    if settings.CACHE_BACKEND == "redis":
+        # Optional dependency, only needed when the Redis backend is selected
+        import redis
+
+        return RedisCacheBackend(redis.Redis.from_url(settings.REDIS_URL))
+    if settings.CACHE_BACKEND == "none":
+        return NullCacheBackend()
+    raise ValueError(f"Unknown CACHE_BACKEND '{settings.CACHE_BACKEND}'")
+
+
+cache = Cache(build_cache_backend(), ttl=settings.CACHE_TTL_SECONDS, namespace=settings.CACHE_NAMESPACE)
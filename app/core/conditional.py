@@ -0,0 +1,104 @@
+"""
+Conditional GET support (ETag / Last-Modified)
+
+Validators are derived from each row's primary key and ``updated_at``, so
+they can be checked before a response body is built or serialized.
+"""
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+from fastapi import Request, Response, status
+
+
+def _as_utc(value: Any) -> Optional[datetime]:
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    # SQLite hands back naive datetimes; they are stored in UTC
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def compute_validators(
+    versions: Iterable[Tuple[Any, Any]], variant: str = ""
+) -> Tuple[str, Optional[datetime]]:
+    """
+    Build a weak ETag and Last-Modified value from ``(id, updated_at)`` pairs.
+
+    Works for a single resource or a list page: adding, removing, reordering
+    or modifying any row changes the ETag. ``variant`` distinguishes
+    different representations of the same rows (e.g. sparse fieldsets).
+    """
+    digest = hashlib.sha1(f"{variant};".encode())
+    last_modified = None
+    for resource_id, updated_at in versions:
+        updated_at = _as_utc(updated_at)
+        digest.update(f"{resource_id}@{updated_at.isoformat() if updated_at else ''};".encode())
+        if updated_at is not None and (last_modified is None or updated_at > last_modified):
+            last_modified = updated_at
+    return f'W/"{digest.hexdigest()}"', last_modified
+
+
+def _opaque_tag(etag: str) -> str:
+    etag = etag.strip()
+    return etag[2:] if etag.startswith("W/") else etag
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    # Weak comparison: W/"x" and "x" refer to the same representation
+    opaque = _opaque_tag(etag)
+    return any(_opaque_tag(candidate) == opaque for candidate in if_none_match.split(","))
+
+
+def _not_modified_since(if_modified_since: str, last_modified: Optional[datetime]) -> bool:
+    if last_modified is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    # HTTP dates have one-second resolution
+    return last_modified.replace(microsecond=0) <= since
+
+
+def row_versions(rows: Sequence[Any], id_field: str) -> List[Tuple[Any, Any]]:
+    """``(id, updated_at)`` pairs for ORM objects or serialized dicts"""
+    return [
+        (row[id_field], row.get("updated_at")) if isinstance(row, Mapping)
+        else (getattr(row, id_field), row.updated_at)
+        for row in rows
+    ]
+
+
+def conditional_get(
+    request: Request, response: Response, rows: Sequence[Any], id_field: str, variant: str = ""
+) -> Optional[Response]:
+    """
+    Set ETag and Last-Modified for ``rows`` on ``response`` and return a
+    bodiless 304 when the client's copy is still current; return None when
+    the body is needed.
+    """
+    etag, last_modified = compute_validators(row_versions(rows, id_field), variant)
+    headers = {"ETag": etag}
+    if last_modified is not None:
+        headers["Last-Modified"] = format_datetime(last_modified, usegmt=True)
+    response.headers.update(headers)
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        not_modified = _etag_matches(if_none_match, etag)
+    else:
+        if_modified_since = request.headers.get("if-modified-since")
+        not_modified = if_modified_since is not None and _not_modified_since(if_modified_since, last_modified)
+
+    if not_modified:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=dict(response.headers))
+    return None
@@ -0,0 +1,74 @@
+"""
+Streaming bulk exports
+
+Rows are read through a server-side cursor (``yield_per``) and encoded one
+batch at a time, so an export of the whole table holds at most one batch in
+memory and the client starts receiving data immediately. The body is
+produced after the endpoint has returned, so it reads through a session of
+its own rather than the request's.
+"""
+import csv
+import io
+from datetime import datetime
+from enum import Enum
+from typing import Any, Callable, Iterator, List, Sequence
+
+import orjson
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Select
+from sqlalchemy.orm import Session
+
+from app.core.serialization import ORJSON_OPTIONS
+
+
+class ExportFormat(str, Enum):
+    ndjson = "ndjson"
+    csv = "csv"
+
+
+MEDIA_TYPES = {
+    ExportFormat.ndjson: "application/x-ndjson",
+    ExportFormat.csv: "text/csv",
+}
+
+
+def _csv_value(value: Any) -> Any:
+    if value is None:
+        return ""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def encode_ndjson(keys: Sequence[str], rows: Sequence[Sequence[Any]]) -> bytes:
+    return b"".join(orjson.dumps(dict(zip(keys, row)), option=ORJSON_OPTIONS) + b"\n" for row in rows)
+
+
+def encode_csv(rows: Sequence[Sequence[Any]]) -> bytes:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows([_csv_value(value) for value in row] for row in rows)
+    return buffer.getvalue().encode()
+
+
+def stream_rows(
+    session_factory: Callable[[], Session], statement: Select, format: ExportFormat, batch_size: int
+) -> Iterator[bytes]:
+    """Yield the encoded result of ``statement`` one ``yield_per`` batch per chunk, in a session opened for the stream"""
+    # Closing the session also releases the server-side cursor if the client disconnects mid-stream
+    with session_factory() as db:
+        result = db.execute(statement.execution_options(yield_per=batch_size))
+        keys: List[str] = list(result.keys())
+        if format == ExportFormat.csv:
+            yield encode_csv([keys])
+        for rows in result.partitions():
+            yield encode_ndjson(keys, rows) if format == ExportFormat.ndjson else encode_csv(rows)
+
+
+def export_response(
+    session_factory: Callable[[], Session], statement: Select, format: ExportFormat, name: str, batch_size: int
+) -> StreamingResponse:
+    return StreamingResponse(
+        stream_rows(session_factory, statement, format, batch_size),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{name}.{format.value}"'},
+    )
@@ -0,0 +1,237 @@
+"""
+In-memory spatial index over the geolocation table
+
+Zip code prefixes are resolved to coordinates from NumPy arrays, and sellers
+are bucketed into a regular latitude/longitude grid. Nearest-seller queries
+scan rings of grid cells outwards from the query point, computing haversine
+distances for a whole ring at once, so lookups touch neither the database
+nor every seller.
+
+The index is an immutable snapshot; ``GeoIndexCache`` rebuilds it from the
+database once it is older than ``GEO_INDEX_MAX_AGE_SECONDS`` or a seller has
+changed, in the background while the old snapshot keeps serving lookups.
+"""
+import logging
+import threading
+import time
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+EARTH_RADIUS_KM = 6371.0088
+# Past this many rings (sparse regions) one vectorized pass over every seller is cheaper
+MAX_RING_SCAN = 8
+
+
+def haversine_km(lat1, lng1, lat2, lng2):
+    """Great-circle distance in km; accepts scalars or broadcastable arrays in degrees"""
+    lat1, lng1, lat2, lng2 = (np.radians(value) for value in (lat1, lng1, lat2, lng2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lng2 - lng1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+class SellerLocation(NamedTuple):
+    seller_id: str
+    zip_code_prefix: str
+    city: Optional[str]
+    state: Optional[str]
+
+
+class GeoIndex:
+    """Coordinates per zip prefix and a grid of seller locations"""
+
+    def __init__(
+        self,
+        prefixes: Sequence[Tuple[str, float, float]],
+        sellers: Sequence[SellerLocation],
+        cell_degrees: float = 0.5,
+    ):
+        self.cell_degrees = cell_degrees
+        self.prefix_rows = {prefix: row for row, (prefix, _, _) in enumerate(prefixes)}
+        self.prefix_lat = np.array([lat for _, lat, _ in prefixes], dtype=float)
+        self.prefix_lng = np.array([lng for _, _, lng in prefixes], dtype=float)
+
+        # Sellers without known coordinates cannot be ranked by distance
+        located = [seller for seller in sellers if seller.zip_code_prefix in self.prefix_rows]
+        rows = np.array([self.prefix_rows[seller.zip_code_prefix] for seller in located], dtype=np.int64)
+        self.seller_lat = self.prefix_lat[rows] if located else np.empty(0)
+        self.seller_lng = self.prefix_lng[rows] if located else np.empty(0)
+
+        cell_y, cell_x = self._cells(self.seller_lat, self.seller_lng)
+        order = np.lexsort((cell_x, cell_y))
+        self.sellers = [located[i] for i in order]
+        self.seller_lat = self.seller_lat[order]
+        self.seller_lng = self.seller_lng[order]
+        keys = list(zip(cell_y[order].tolist(), cell_x[order].tolist()))
+        # Cell -> slice of the cell-sorted seller arrays
+        self.cells: Dict[Tuple[int, int], slice] = {}
+        for position, key in enumerate(keys):
+            start = self.cells[key].start if key in self.cells else position
+            self.cells[key] = slice(start, position + 1)
+
+    def _cells(self, lat, lng):
+        return (
+            np.floor((np.asarray(lat) + 90) / self.cell_degrees).astype(np.int64),
+            np.floor((np.asarray(lng) + 180) / self.cell_degrees).astype(np.int64),
+        )
+
+    def __len__(self) -> int:
+        return len(self.sellers)
+
+    def coordinates(self, zip_code_prefix: Optional[str]) -> Optional[Tuple[float, float]]:
+        row = self.prefix_rows.get(zip_code_prefix)
+        if row is None:
+            return None
+        return float(self.prefix_lat[row]), float(self.prefix_lng[row])
+
+    def distance_km(self, from_prefix: Optional[str], to_prefix: Optional[str]) -> Optional[float]:
+        """Distance between two zip prefixes; None if either has no coordinates"""
+        origin, destination = self.coordinates(from_prefix), self.coordinates(to_prefix)
+        if origin is None or destination is None:
+            return None
+        return float(haversine_km(*origin, *destination))
+
+    def _ring(self, cell_y: int, cell_x: int, radius: int) -> List[slice]:
+        if radius == 0:
+            offsets = [(0, 0)]
+        else:
+            span = range(-radius, radius + 1)
+            offsets = [(dy, dx) for dy in span for dx in span if max(abs(dy), abs(dx)) == radius]
+        return [self.cells[key] for key in ((cell_y + dy, cell_x + dx) for dy, dx in offsets) if key in self.cells]
+
+    def _outside_bound_km(self, lat: float, radius: int) -> float:
+        """Lower bound on the distance to any seller outside the scanned rings"""
+        # A seller r+1 cells away is at least r cells of latitude or longitude away
+        reach = radius * self.cell_degrees
+        widest = min(abs(lat) + reach + self.cell_degrees, 89.0)
+        return EARTH_RADIUS_KM * np.radians(reach) * np.cos(np.radians(widest))
+
+    def nearest_sellers(self, lat: float, lng: float, k: int) -> List[Tuple[SellerLocation, float]]:
+        """The ``k`` sellers closest to a point, nearest first, with their distance in km"""
+        if k <= 0 or not self.sellers:
+            return []
+        cell_y, cell_x = (int(value) for value in self._cells(lat, lng))
+        candidates = np.empty(0, dtype=np.int64)
+        distances = np.empty(0)
+        radius = 0
+        while True:
+            slices = self._ring(cell_y, cell_x, radius)
+            if slices:
+                ring = np.concatenate([np.arange(s.start, s.stop) for s in slices])
+                candidates = np.concatenate([candidates, ring])
+                distances = np.concatenate([distances, haversine_km(lat, lng, self.seller_lat[ring], self.seller_lng[ring])])
+            if len(candidates) >= min(k, len(self.sellers)):
+                kth = np.partition(distances, min(k, len(distances)) - 1)[min(k, len(distances)) - 1]
+                if len(candidates) == len(self.sellers) or kth <= self._outside_bound_km(lat, radius):
+                    break
+            radius += 1
+            if radius > MAX_RING_SCAN:
+                candidates = np.arange(len(self.sellers))
+                distances = haversine_km(lat, lng, self.seller_lat, self.seller_lng)
+                break
+
+        best = np.argsort(distances, kind="stable")[:k]
+        return [(self.sellers[candidates[i]], float(distances[i])) for i in best]
+
+
+class GeoIndexCache:
+    """
+    Holds the current index and rebuilds it once it is older than
+    ``max_age`` seconds or has been invalidated, in this or (once
+    ``share_invalidations`` is set up) any other worker process.
+
+    Only a cold or cleared cache is built on the request path; an expired
+    index keeps being served while a background thread builds its
+    replacement, which is then swapped in.
+    """
+
+    def __init__(self, max_age: float, retry_seconds: float = 60.0):
+        self.max_age = max_age
+        self.retry_seconds = retry_seconds
+        self._index: Optional[GeoIndex] = None
+        self._built_at = 0.0
+        self._lock = threading.Lock()
+        # Shared with the other worker processes; clear() anywhere bumps it
+        self._invalidations = None
+        self._built_generation = 0
+        # Bumped by clear() so a rebuild that started before it is discarded
+        self._clears = 0
+        self._rebuilding = False
+        self._next_attempt = 0.0
+
+    def share_invalidations(self, counter) -> None:
+        """Use a ``multiprocessing.Value`` counter so clear() in one process invalidates every process's index"""
+        self._invalidations = counter
+
+    def _generation(self) -> int:
+        return self._invalidations.value if self._invalidations is not None else 0
+
+    def _expired(self) -> bool:
+        return (
+            self._index is None
+            or time.monotonic() - self._built_at >= self.max_age
+            or self._built_generation != self._generation()
+        )
+
+    def _store(self, index: GeoIndex, generation: int) -> None:
+        self._index = index
+        self._built_at = time.monotonic()
+        self._built_generation = generation
+
+    def get(
+        self, loader: Callable[[], GeoIndex], background_loader: Optional[Callable[[], GeoIndex]] = None
+    ) -> GeoIndex:
+        """
+        The current index. ``loader`` builds it on the calling thread when
+        there is none; ``background_loader`` must open its own database
+        session, as it runs after the request has finished.
+        """
+        index = self._index
+        if not self._expired():
+            return index
+        if index is not None and background_loader is not None:
+            self._rebuild_in_background(background_loader)
+            return index
+        with self._lock:
+            # Another thread may have rebuilt it while this one waited
+            if self._expired():
+                generation = self._generation()
+                self._store(loader(), generation)
+            return self._index
+
+    def _rebuild_in_background(self, loader: Callable[[], GeoIndex]) -> None:
+        with self._lock:
+            if self._rebuilding or time.monotonic() < self._next_attempt:
+                return
+            self._rebuilding = True
+            clears = self._clears
+        threading.Thread(target=self._rebuild, args=(loader, clears), name="geo-index-rebuild", daemon=True).start()
+
+    def _rebuild(self, loader: Callable[[], GeoIndex], clears: int) -> None:
+        try:
+            generation = self._generation()
+            index = loader()
+            with self._lock:
+                if self._clears == clears:
+                    self._store(index, generation)
+        except Exception:
+            # Keep serving the old index and try again later
+            logger.warning("Could not rebuild the geospatial index", exc_info=True)
+            self._next_attempt = time.monotonic() + self.retry_seconds
+        finally:
+            self._rebuilding = False
+
+    def clear(self) -> None:
+        with self._lock:
+            self._index = None
+            self._clears += 1
+        if self._invalidations is not None:
+            with self._invalidations.get_lock():
+                self._invalidations.value += 1
+
+
+geo_index = GeoIndexCache(max_age=settings.GEO_INDEX_MAX_AGE_SECONDS)
@@ -0,0 +1,102 @@
+"""
+Prometheus metrics
+
+Request metrics are labelled with the matched route template (e.g.
+``/api/v1/orders/{order_id}``) rather than the raw path, so label
+cardinality is bounded by the number of routes. Pool gauges are refreshed
+after every request and at scrape time.
+
+Under the production launcher every worker writes its metrics to
+``PROMETHEUS_MULTIPROC_DIR`` (prometheus_client's multiprocess mode) and a
+scrape, whichever worker serves it, reports all workers together. Counters
+of recycled workers are kept; gauges only count live workers.
+"""
+import os
+from typing import Sequence
+
+from prometheus_client import REGISTRY, CollectorRegistry, Counter, Gauge, Histogram
+from prometheus_client.multiprocess import MultiProcessCollector
+from starlette.routing import BaseRoute, Match
+from starlette.types import Scope
+
+from app.core.cache import cache
+from app.db import database
+
+# Label for requests that match no route, e.g. 404 probes of arbitrary paths
+UNMATCHED_ROUTE = "<unmatched>"
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template",
+    ["method", "route", "status"],
+)
+REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress",
+    "HTTP requests currently being served",
+    ["method", "route"],
+    multiprocess_mode="livesum",
+)
+ORDERS_CREATED = Counter(
+    "orders_created_total",
+    "Orders created, by endpoint",
+    ["source"],
+)
+POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out", "Connections in use", ["pool"], multiprocess_mode="livesum"
+)
+POOL_OVERFLOW = Gauge(
+    "db_pool_overflow", "Connections open beyond pool_size", ["pool"], multiprocess_mode="livesum"
+)
+POOL_UTILIZATION = Gauge(
+    "db_pool_utilization",
+    "Checked-out connections / (pool_size + max_overflow), of the busiest worker",
+    ["pool"],
+    multiprocess_mode="livemax",
+)
+CACHE_HITS = Counter("cache_hits", "Read-through cache hits")
+CACHE_MISSES = Counter("cache_misses", "Read-through cache misses")
+CACHE_HIT_RATIO = Gauge("cache_hit_ratio", "Cache hits / lookups, per worker", multiprocess_mode="liveall")
+
+
+def route_template(routes: Sequence[BaseRoute], scope: Scope) -> str:
+    """Path template of the route that will serve ``scope``"""
+    partial = None
+    for route in routes:
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return route.path
+        if match == Match.PARTIAL and partial is None:
+            # Path matched but not the method; the request ends in a 405
+            partial = route.path
+    return partial or UNMATCHED_ROUTE
+
+
+def record_cache_lookup(hit: bool) -> None:
+    (CACHE_HITS if hit else CACHE_MISSES).inc()
+
+
+def refresh_gauges() -> None:
+    """Sample this worker's connection pools and cache hit ratio into their gauges"""
+    engines = [("sync", database.engine)]
+    if database.async_engine is not None:
+        engines.append(("async", database.async_engine.sync_engine))
+    for name, engine in engines:
+        status = database.get_pool_status(engine)
+        if status["checked_out"] is None:
+            continue
+        POOL_CHECKED_OUT.labels(name).set(status["checked_out"])
+        POOL_OVERFLOW.labels(name).set(max(status["overflow"] or 0, 0))
+        POOL_UTILIZATION.labels(name).set(database.get_pool_utilization(engine) or 0.0)
+    CACHE_HIT_RATIO.set(cache.stats()["hit_ratio"])
+
+
+def scrape_registry() -> CollectorRegistry:
+    """Every worker's metrics in multiprocess mode, otherwise this process's"""
+    if "PROMETHEUS_MULTIPROC_DIR" not in os.environ:
+        return REGISTRY
+    registry = CollectorRegistry()
+    MultiProcessCollector(registry)
+    return registry
+
+
+cache.on_lookup = record_cache_lookup
@@ -0,0 +1,96 @@
+"""
+Keyset (cursor) pagination helpers
+
+A cursor is an opaque, URL-safe token holding the sort key of the last row
+of a page. Seeking past that key lets the database walk an index instead of
+scanning and discarding ``skip`` rows.
+"""
+import base64
+import json
+from datetime import datetime
+from typing import Any, List, Mapping, Optional, Sequence, Union
+
+from fastapi import Response
+from sqlalchemy import DateTime, Select, tuple_
+from sqlalchemy.orm import Query
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor cannot be decoded"""
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    payload = [value.isoformat() if isinstance(value, datetime) else value for value in values]
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, columns: Sequence[Any]) -> List[Any]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError) as exc:
+        raise InvalidCursorError("Invalid pagination cursor") from exc
+    if not isinstance(values, list) or len(values) != len(columns):
+        raise InvalidCursorError("Invalid pagination cursor")
+
+    return [_decode_value(column, value) for column, value in zip(columns, values)]
+
+
+def _decode_value(column: Any, value: Any) -> Any:
+    """Check a cursor value against its column's Python type so it can only reach SQL as a bound scalar"""
+    if value is None:
+        return None
+    if isinstance(column.type, DateTime):
+        try:
+            return datetime.fromisoformat(value)
+        except (ValueError, TypeError) as exc:
+            raise InvalidCursorError("Invalid pagination cursor") from exc
+    python_type = column.type.python_type
+    if python_type is float and isinstance(value, int) and not isinstance(value, bool):
+        return float(value)
+    if not isinstance(value, python_type) or (isinstance(value, bool) and python_type is not bool):
+        raise InvalidCursorError("Invalid pagination cursor")
+    return value
+
+
+def paginate(
+    query: Union[Query, Select],
+    columns: Sequence[Any],
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+) -> Union[Query, Select]:
+    """
+    Order ``query`` by ``columns`` and apply either keyset or offset paging.
+
+    Works with both legacy ``Query`` objects and 2.0-style ``select()``
+    statements, so the sync and async CRUD modules share it.
+
+    When a cursor is given it takes precedence over ``skip``.
+    """
+    query = query.order_by(*columns)
+    if cursor is not None:
+        key = decode_cursor(cursor, columns)
+        if len(columns) == 1:
+            query = query.filter(columns[0] > key[0])
+        else:
+            query = query.filter(tuple_(*columns) > tuple(key))
+    else:
+        query = query.offset(skip)
+    return query.limit(limit)
+
+
+def cursor_for(obj: Any, columns: Sequence[Any]) -> str:
+    """Build the cursor that seeks past ``obj`` (an ORM object or a serialized dict)"""
+    if isinstance(obj, Mapping):
+        return encode_cursor([obj[column.key] for column in columns])
+    return encode_cursor([getattr(obj, column.key) for column in columns])
+
+
+def set_next_cursor(response: Response, rows: Sequence[Any], columns: Sequence[Any], limit: int) -> None:
+    """Expose the cursor for the following page when this page is full"""
+    if rows and len(rows) >= limit:
+        response.headers[NEXT_CURSOR_HEADER] = cursor_for(rows[-1], columns)
@@ -0,0 +1,280 @@
+"""
+Co-purchase ("customers who bought this also bought") recommendations
+
+Order items are grouped into baskets by order and every pair of distinct
+products in a basket is counted, giving a sparse, symmetric item-item
+co-occurrence matrix held as sorted pair keys and counts in NumPy arrays.
+From it the ``top_k`` most co-purchased products of every product are
+precomputed into a CSR layout (``indptr``/``indices``/``counts``), so a
+lookup is one dict access and one slice.
+
+``RecommendationCache`` folds orders placed since the last refresh into the
+counts once the index is older than ``RECOMMENDATIONS_REFRESH_SECONDS`` and
+starts from scratch every ``RECOMMENDATIONS_FULL_REBUILD_SECONDS``, which
+picks up deleted, cancelled and back-dated orders. Refreshes run in a
+background thread while the old index keeps serving lookups.
+"""
+import logging
+import threading
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Pairs grow quadratically with basket size; larger (wholesale) baskets say little about affinity
+MAX_BASKET_SIZE = 50
+# Pair keys pack two product codes into one int64
+_CODE_BITS = 32
+_CODE_MASK = (1 << _CODE_BITS) - 1
+
+
+class Baskets(NamedTuple):
+    """Aligned (order_id, product_id) columns, one entry per order item"""
+    order_ids: Sequence[str]
+    product_ids: Sequence[str]
+    high_water_mark: Optional[datetime]
+
+
+def basket_pairs(baskets: np.ndarray, products: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Every unordered pair of distinct products sharing a basket, as (lower code, higher code) arrays"""
+    if len(baskets) == 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    # Sorted by basket, then product; repeated items of one product count once
+    keys = np.unique((baskets << _CODE_BITS) | products)
+    baskets, products = keys >> _CODE_BITS, keys & _CODE_MASK
+    starts = np.flatnonzero(np.r_[True, baskets[1:] != baskets[:-1]])
+    sizes = np.diff(np.r_[starts, len(baskets)])
+    products = products[np.repeat(sizes <= MAX_BASKET_SIZE, sizes)]
+    sizes = sizes[sizes <= MAX_BASKET_SIZE]
+
+    # Pair each product with the products after it in its basket
+    ends = np.repeat(np.cumsum(sizes), sizes)
+    partners = ends - np.arange(len(products)) - 1
+    left = np.repeat(np.arange(len(products)), partners)
+    offsets = np.arange(len(left)) - np.repeat(np.cumsum(partners) - partners, partners)
+    return products[left], products[left + offsets + 1]
+
+
+class CoPurchaseCounts:
+    """Sparse co-occurrence counts over a growing product vocabulary"""
+
+    def __init__(self):
+        self.product_ids: List[str] = []
+        self.codes: Dict[str, int] = {}
+        self.pair_keys = np.empty(0, dtype=np.int64)
+        self.pair_counts = np.empty(0, dtype=np.int64)
+
+    def copy(self) -> "CoPurchaseCounts":
+        """Counts that can be extended without changing these"""
+        counts = CoPurchaseCounts()
+        counts.product_ids = list(self.product_ids)
+        counts.codes = dict(self.codes)
+        counts.pair_keys = self.pair_keys
+        counts.pair_counts = self.pair_counts
+        return counts
+
+    def _encode(self, product_id: str) -> int:
+        code = self.codes.get(product_id)
+        if code is None:
+            code = self.codes[product_id] = len(self.product_ids)
+            self.product_ids.append(product_id)
+        return code
+
+    def add(self, order_ids: Sequence[str], product_ids: Sequence[str]) -> int:
+        """Count the pairs in some baskets; each basket must be added whole, and only once. Returns pairs seen."""
+        basket_codes: Dict[str, int] = {}
+        baskets = np.fromiter(
+            (basket_codes.setdefault(order_id, len(basket_codes)) for order_id in order_ids),
+            dtype=np.int64, count=len(order_ids),
+        )
+        products = np.fromiter((self._encode(product_id) for product_id in product_ids), dtype=np.int64,
+                               count=len(product_ids))
+        left, right = basket_pairs(baskets, products)
+        if len(left) == 0:
+            return 0
+        keys = np.concatenate([self.pair_keys, (left << _CODE_BITS) | right])
+        counts = np.concatenate([self.pair_counts, np.ones(len(left), dtype=np.int64)])
+        self.pair_keys, inverse = np.unique(keys, return_inverse=True)
+        self.pair_counts = np.bincount(inverse, weights=counts).astype(np.int64)
+        return len(left)
+
+
+class RelatedProductsIndex:
+    """The ``top_k`` most co-purchased products of every product, in CSR arrays"""
+
+    def __init__(self, counts: CoPurchaseCounts, top_k: int):
+        self.product_ids = list(counts.product_ids)
+        self.codes = dict(counts.codes)
+        n = len(self.product_ids)
+        first = counts.pair_keys >> _CODE_BITS
+        second = counts.pair_keys & _CODE_MASK
+        rows = np.concatenate([first, second])
+        cols = np.concatenate([second, first])
+        weights = np.concatenate([counts.pair_counts, counts.pair_counts])
+
+        # Within each product: most co-purchased first, ties by product_id
+        name_rank = np.empty(n, dtype=np.int64)
+        name_rank[np.argsort(np.array(self.product_ids, dtype=object), kind="stable")] = np.arange(n)
+        order = np.lexsort((name_rank[cols], -weights, rows))
+        rows, cols, weights = rows[order], cols[order], weights[order]
+        row_sizes = np.bincount(rows, minlength=n)
+        rank = np.arange(len(rows)) - np.repeat(np.cumsum(row_sizes) - row_sizes, row_sizes)
+        keep = rank < top_k
+
+        self.indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows[keep], minlength=n), out=self.indptr[1:])
+        self.indices = cols[keep].astype(np.int32)
+        self.counts = weights[keep].astype(np.int32)
+
+    def __len__(self) -> int:
+        return len(self.product_ids)
+
+    def related(self, product_id: str, limit: Optional[int] = None) -> List[Tuple[str, int]]:
+        """Products bought together with ``product_id`` and in how many orders, most frequent first"""
+        code = self.codes.get(product_id)
+        if code is None:
+            return []
+        start, stop = self.indptr[code], self.indptr[code + 1]
+        if limit is not None:
+            stop = min(stop, start + limit)
+        return [
+            (self.product_ids[neighbour], int(count))
+            for neighbour, count in zip(self.indices[start:stop].tolist(), self.counts[start:stop].tolist())
+        ]
+
+
+class Refresh(NamedTuple):
+    """Outcome of one refresh, swapped into the cache in one step"""
+    index: Optional[RelatedProductsIndex]  # None when no new pairs were counted
+    counts: CoPurchaseCounts
+    high_water_mark: Optional[datetime]
+    full: bool
+
+
+BasketLoader = Callable[[Optional[datetime]], Baskets]
+
+
+class RecommendationCache:
+    """
+    Holds the current index, folding in new baskets from ``loader(since)``
+    once it is older than ``refresh_seconds`` and recounting every order
+    once the counts are older than ``full_rebuild_seconds``.
+
+    Only a cold or cleared cache is built on the request path; a stale
+    index keeps being served while a background thread counts the new
+    baskets and builds its replacement, which is then swapped in.
+    """
+
+    def __init__(
+        self, top_k: int, refresh_seconds: float, full_rebuild_seconds: float, retry_seconds: float = 60.0
+    ):
+        self.top_k = top_k
+        self.refresh_seconds = refresh_seconds
+        self.full_rebuild_seconds = full_rebuild_seconds
+        self.retry_seconds = retry_seconds
+        self._index: Optional[RelatedProductsIndex] = None
+        self._counts: Optional[CoPurchaseCounts] = None
+        self._high_water_mark: Optional[datetime] = None
+        self._refreshed_at = 0.0
+        self._rebuilt_at = 0.0
+        self._lock = threading.Lock()
+        # Bumped by clear() so a refresh that started before it is discarded
+        self._clears = 0
+        self._refreshing = False
+        self._next_attempt = 0.0
+
+    def _stale(self) -> bool:
+        return self._index is None or time.monotonic() - self._refreshed_at >= self.refresh_seconds
+
+    def get(self, loader: BasketLoader, background_loader: Optional[BasketLoader] = None) -> RelatedProductsIndex:
+        """
+        The current index. ``loader`` refreshes it on the calling thread when
+        there is none; ``background_loader`` must open its own database
+        session, as it runs after the request has finished.
+        """
+        index = self._index
+        if not self._stale():
+            return index
+        if index is not None and background_loader is not None:
+            self._refresh_in_background(background_loader)
+            return index
+        with self._lock:
+            # Another thread may have refreshed it while this one waited
+            if self._stale():
+                self._store(self._refresh(loader, *self._starting_point()))
+            return self._index
+
+    def _starting_point(self) -> Tuple[Optional[CoPurchaseCounts], Optional[datetime]]:
+        """Counts to extend and the high-water mark to load from; no counts when a full rebuild is due"""
+        if self._counts is None or time.monotonic() - self._rebuilt_at >= self.full_rebuild_seconds:
+            return None, None
+        return self._counts, self._high_water_mark
+
+    def _refresh(
+        self, loader: BasketLoader, counts: Optional[CoPurchaseCounts], since: Optional[datetime]
+    ) -> Refresh:
+        """Count new baskets into a copy of ``counts`` (from scratch when None); touches no cache state"""
+        full = counts is None
+        counts = CoPurchaseCounts() if full else counts.copy()
+        baskets = loader(since)
+        pairs = counts.add(baskets.order_ids, baskets.product_ids)
+        index = RelatedProductsIndex(counts, self.top_k) if full or pairs else None
+        return Refresh(index, counts, baskets.high_water_mark, full)
+
+    def _store(self, refresh: Refresh) -> None:
+        if refresh.index is not None:
+            self._index = refresh.index
+        self._counts = refresh.counts
+        if refresh.full:
+            self._rebuilt_at = time.monotonic()
+        if refresh.high_water_mark is not None:
+            self._high_water_mark = refresh.high_water_mark
+        self._refreshed_at = time.monotonic()
+
+    def _refresh_in_background(self, loader: BasketLoader) -> None:
+        with self._lock:
+            if self._refreshing or time.monotonic() < self._next_attempt:
+                return
+            self._refreshing = True
+            clears = self._clears
+            counts, since = self._starting_point()
+        threading.Thread(
+            target=self._background_refresh,
+            args=(loader, counts, since, clears),
+            name="recommendations-refresh",
+            daemon=True,
+        ).start()
+
+    def _background_refresh(
+        self, loader: BasketLoader, counts: Optional[CoPurchaseCounts], since: Optional[datetime], clears: int
+    ) -> None:
+        try:
+            refresh = self._refresh(loader, counts, since)
+            with self._lock:
+                if self._clears == clears:
+                    self._store(refresh)
+        except Exception:
+            # Keep serving the old index and try again later
+            logger.warning("Could not refresh the recommendation index", exc_info=True)
+            self._next_attempt = time.monotonic() + self.retry_seconds
+        finally:
+            self._refreshing = False
+
+    def clear(self) -> None:
+        with self._lock:
+            self._index = None
+            self._counts = None
+            self._high_water_mark = None
+            self._clears += 1
+
+
+recommendations = RecommendationCache(
+    top_k=settings.RECOMMENDATIONS_TOP_K,
+    refresh_seconds=settings.RECOMMENDATIONS_REFRESH_SECONDS,
+    full_rebuild_seconds=settings.RECOMMENDATIONS_FULL_REBUILD_SECONDS,
+)
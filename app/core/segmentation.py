@@ -0,0 +1,52 @@
+"""
+Recency / frequency / monetary (RFM) customer scoring
+
+Every measure is scored 1-5 against its quintiles over all customers, with
+NumPy over whole columns: 5 is the most recent, most frequent or highest
+spending fifth. Tied values share a score, so a heavily tied measure (most
+Olist customers order once) uses fewer than five buckets. The recency and
+frequency scores place a customer on the usual RFM segment grid.
+"""
+from typing import Dict, NamedTuple
+
+import numpy as np
+
+# Segment of each (recency score, frequency score); rows are recency 1-5, columns frequency 1-5
+SEGMENT_GRID = np.array([
+    ["hibernating", "hibernating", "at_risk", "at_risk", "cant_lose_them"],
+    ["hibernating", "hibernating", "at_risk", "at_risk", "cant_lose_them"],
+    ["about_to_sleep", "about_to_sleep", "need_attention", "loyal_customers", "loyal_customers"],
+    ["promising", "potential_loyalists", "potential_loyalists", "loyal_customers", "loyal_customers"],
+    ["new_customers", "potential_loyalists", "potential_loyalists", "champions", "champions"],
+], dtype=object)
+
+_QUINTILES = (0.2, 0.4, 0.6, 0.8)
+
+
+class RFMScores(NamedTuple):
+    recency: np.ndarray
+    frequency: np.ndarray
+    monetary: np.ndarray
+    segment: np.ndarray
+
+
+def quintile_scores(values: np.ndarray, higher_is_better: bool = True) -> np.ndarray:
+    """Score each value 1-5 by the quintile it falls in; values equal to a quintile edge share the lower bucket"""
+    if len(values) == 0:
+        return np.empty(0, dtype=np.int64)
+    edges = np.quantile(values, _QUINTILES)
+    buckets = np.searchsorted(edges, values, side="left")
+    return buckets + 1 if higher_is_better else len(_QUINTILES) + 1 - buckets
+
+
+def score_rfm(recency_days: np.ndarray, frequency: np.ndarray, monetary: np.ndarray) -> RFMScores:
+    """Scores and segment per customer from aligned measure columns"""
+    recency = quintile_scores(recency_days, higher_is_better=False)
+    frequency_score = quintile_scores(frequency)
+    monetary_score = quintile_scores(monetary)
+    return RFMScores(recency, frequency_score, monetary_score, SEGMENT_GRID[recency - 1, frequency_score - 1])
+
+
+def segment_counts(segments: np.ndarray) -> Dict[str, int]:
+    names, counts = np.unique(segments.astype(str), return_counts=True)
+    return dict(zip(names.tolist(), counts.tolist()))
@@ -0,0 +1,235 @@
+from datetime import datetime
+from itertools import combinations
+from typing import Any, Iterable, List, NamedTuple, Optional, Sequence
+from sqlalchemy import Select, delete, func, insert, literal, null, select
+from sqlalchemy.orm import Session
+from app.db import models
+
+SALES_ROLLUP = "sales"
+HOUR = "hour"
+DAY = "day"
+# Orders that never turned into sales are left out of every rollup
+EXCLUDED_ORDER_STATUSES = ("canceled", "unavailable")
+
+ROLLUP_DIMENSIONS = {
+    "category": models.SalesRollup.product_category_name,
+    "state": models.SalesRollup.customer_state,
+    "seller": models.SalesRollup.seller_id,
+}
+
+# Fact columns each dimension is aggregated from
+_FACT_DIMENSIONS = {
+    "category": models.Product.product_category_name,
+    "state": models.Customer.customer_state,
+    "seller": models.OrderItem.seller_id,
+}
+# Every bucket is aggregated once per combination of dimensions. An order with
+# items in several groups is one distinct order in each, so order counts are
+# only exact at the grouping they were counted for and are never summed across groups
+GROUPINGS = [
+    dimensions
+    for size in range(len(ROLLUP_DIMENSIONS) + 1)
+    for dimensions in combinations(ROLLUP_DIMENSIONS, size)
+]
+
+_MEASURE_COLUMNS = ("order_count", "item_count", "revenue", "freight_value")
+_GRAIN_COLUMNS = ("product_category_name", "customer_state", "seller_id")
+
+
+class RefreshResult(NamedTuple):
+    since: Optional[datetime]
+    high_water_mark: Optional[datetime]
+    hourly_rows: int
+    daily_rows: int
+
+
+def _truncate(db: Session, column, unit: str):
+    """SQL expression truncating a timestamp to the start of its hour or day"""
+    if db.get_bind().dialect.name == "sqlite":
+        # Same text format SQLAlchemy stores, so buckets compare correctly with bound datetimes
+        pattern = "%Y-%m-%d %H:00:00.000000" if unit == HOUR else "%Y-%m-%d 00:00:00.000000"
+        return func.strftime(pattern, column)
+    return func.date_trunc(unit, column)
+
+
+def grouping_key(dimensions: Iterable[str]) -> str:
+    """SalesRollup.dimensions of the rows grouped by ``dimensions`` alone"""
+    kept = set(dimensions)
+    return "+".join(name for name in ROLLUP_DIMENSIONS if name in kept) or "total"
+
+
+def _floor(value: datetime, unit: str) -> datetime:
+    value = value.replace(minute=0, second=0, microsecond=0)
+    return value.replace(hour=0) if unit == DAY else value
+
+
+def _hourly_rows(
+    db: Session, since: Optional[datetime], until: datetime, dimensions: Sequence[str]
+) -> Select:
+    bucket = _truncate(db, models.Order.order_purchase_timestamp, HOUR)
+    query = (
+        select(
+            literal(HOUR),
+            literal(grouping_key(dimensions)),
+            bucket,
+            *(_FACT_DIMENSIONS[name] if name in dimensions else null() for name in ROLLUP_DIMENSIONS),
+            func.count(func.distinct(models.Order.order_id)),
+            func.count(),
+            func.coalesce(func.sum(models.OrderItem.price), 0.0),
+            func.coalesce(func.sum(models.OrderItem.freight_value), 0.0),
+        )
+        .select_from(models.OrderItem)
+        .join(models.Order, models.Order.order_id == models.OrderItem.order_id)
+        .outerjoin(models.Product, models.Product.product_id == models.OrderItem.product_id)
+        .outerjoin(models.Customer, models.Customer.customer_id == models.Order.customer_id)
+        .where(models.Order.order_purchase_timestamp <= until)
+        .where(func.coalesce(models.Order.order_status, "").not_in(EXCLUDED_ORDER_STATUSES))
+        .group_by(bucket, *(_FACT_DIMENSIONS[name] for name in dimensions))
+    )
+    if since is not None:
+        query = query.where(models.Order.order_purchase_timestamp >= since)
+    return query
+
+
+def _daily_rows(db: Session, since: Optional[datetime]) -> Select:
+    """
+    Days are summed from the hourly rows of the same grouping; an order falls
+    in one hour, so its distinct count is never added twice
+    """
+    rollup = models.SalesRollup
+    bucket = _truncate(db, rollup.bucket, DAY)
+    query = (
+        select(
+            literal(DAY),
+            rollup.dimensions,
+            bucket,
+            rollup.product_category_name,
+            rollup.customer_state,
+            rollup.seller_id,
+            *(func.sum(getattr(rollup, name)) for name in _MEASURE_COLUMNS),
+        )
+        .where(rollup.granularity == HOUR)
+        .group_by(rollup.dimensions, bucket, rollup.product_category_name, rollup.customer_state, rollup.seller_id)
+    )
+    if since is not None:
+        query = query.where(rollup.bucket >= since)
+    return query
+
+
+def _replace_from(
+    db: Session, granularity: str, since: Optional[datetime], selects: Sequence[Select]
+) -> int:
+    rollup = models.SalesRollup
+    stale = delete(rollup).where(rollup.granularity == granularity)
+    if since is not None:
+        stale = stale.where(rollup.bucket >= since)
+    db.execute(stale)
+    columns = ("granularity", "dimensions", "bucket", *_GRAIN_COLUMNS, *_MEASURE_COLUMNS)
+    return sum(db.execute(insert(rollup).from_select(columns, rows)).rowcount for rows in selects)
+
+
+def refresh_sales_rollups(db: Session, full: bool = False) -> RefreshResult:
+    """
+    Bring the hourly and daily sales rollups up to date, in one transaction.
+
+    Incremental refreshes re-aggregate from the hour holding the stored
+    high-water mark onwards (that hour may have been partial) and the days
+    from its day onwards; ``full`` rebuilds everything, e.g. after orders
+    were back-dated or cancelled. All aggregation runs inside the database.
+    """
+    state = db.get(models.RollupState, SALES_ROLLUP)
+    if state is None:
+        state = models.RollupState(name=SALES_ROLLUP)
+        db.add(state)
+
+    until = db.execute(select(func.max(models.Order.order_purchase_timestamp))).scalar()
+    if until is None:
+        db.commit()
+        return RefreshResult(None, None, 0, 0)
+    since = None if full or state.high_water_mark is None else _floor(state.high_water_mark, HOUR)
+
+    hourly = _replace_from(
+        db, HOUR, since, [_hourly_rows(db, since, until, dimensions) for dimensions in GROUPINGS]
+    )
+    day_since = _floor(since, DAY) if since is not None else None
+    daily = _replace_from(db, DAY, day_since, [_daily_rows(db, day_since)])
+
+    state.high_water_mark = until
+    state.refreshed_at = models.utcnow()
+    db.commit()
+    return RefreshResult(since, until, hourly, daily)
+
+
+def get_rollup_state(db: Session, name: str = SALES_ROLLUP) -> Optional[models.RollupState]:
+    return db.get(models.RollupState, name)
+
+
+def _measures() -> List[Any]:
+    rollup = models.SalesRollup
+    return [func.sum(getattr(rollup, name)).label(name) for name in _MEASURE_COLUMNS]
+
+
+def _filtered(
+    query: Select,
+    granularity: str,
+    date_from: Optional[datetime],
+    date_to: Optional[datetime],
+    category: Optional[str] = None,
+    state: Optional[str] = None,
+    seller_id: Optional[str] = None,
+    group_by: Optional[str] = None,
+) -> Select:
+    """
+    Restrict to the rows of the grouping that keeps exactly the filtered
+    dimensions and ``group_by``, so measures are only summed across buckets
+    """
+    rollup = models.SalesRollup
+    filters = {"category": category, "state": state, "seller": seller_id}
+    kept = [name for name, value in filters.items() if value is not None]
+    if group_by is not None:
+        kept.append(group_by)
+    query = query.where(rollup.granularity == granularity, rollup.dimensions == grouping_key(kept))
+    if date_from is not None:
+        query = query.where(rollup.bucket >= date_from)
+    if date_to is not None:
+        query = query.where(rollup.bucket < date_to)
+    for name, value in filters.items():
+        if value is not None:
+            query = query.where(ROLLUP_DIMENSIONS[name] == value)
+    return query
+
+
+def get_sales_series(
+    db: Session,
+    granularity: str = DAY,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    category: Optional[str] = None,
+    state: Optional[str] = None,
+    seller_id: Optional[str] = None,
+) -> List[Any]:
+    """Sales per bucket, across every value of the dimensions that are not filtered on"""
+    bucket = models.SalesRollup.bucket
+    query = select(bucket.label("bucket"), *_measures()).group_by(bucket).order_by(bucket)
+    return db.execute(
+        _filtered(query, granularity, date_from, date_to, category, state, seller_id)
+    ).all()
+
+
+def get_sales_breakdown(
+    db: Session,
+    dimension: str,
+    granularity: str = DAY,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    limit: int = 100,
+) -> List[Any]:
+    """Sales per category, state or seller over a period, highest revenue first"""
+    column = ROLLUP_DIMENSIONS[dimension]
+    query = (
+        select(column.label("key"), *_measures())
+        .group_by(column)
+        .order_by(func.sum(models.SalesRollup.revenue).desc(), column)
+        .limit(limit)
+    )
+    return db.execute(_filtered(query, granularity, date_from, date_to, group_by=dimension)).all()
@@ -0,0 +1,47 @@
+"""
+Async counterparts of the customer read functions in app.crud.customer
+"""
+from typing import List, Optional
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.pagination import paginate
+from app.crud.customer import CUSTOMER_KEYSET
+from app.db import models
+
+
+async def get_customer(db: AsyncSession, customer_id: str) -> Optional[models.Customer]:
+    result = await db.execute(select(models.Customer).where(models.Customer.customer_id == customer_id))
+    return result.scalars().first()
+
+
+async def get_customer_by_unique_id(db: AsyncSession, unique_id: str) -> Optional[models.Customer]:
+    result = await db.execute(
+        select(models.Customer).where(models.Customer.customer_unique_id == unique_id)
+    )
+    return result.scalars().first()
+
+
+async def get_customers(
+    db: AsyncSession, skip: int = 0, limit: int = 100, cursor: Optional[str] = None
+) -> List[models.Customer]:
+    statement = paginate(select(models.Customer), CUSTOMER_KEYSET, skip=skip, limit=limit, cursor=cursor)
+    result = await db.execute(statement)
+    return list(result.scalars().all())
+
+
+async def get_customers_by_city(
+    db: AsyncSession, city: str, skip: int = 0, limit: int = 100, cursor: Optional[str] = None
+) -> List[models.Customer]:
+    statement = select(models.Customer).where(models.Customer.customer_city == city)
+    statement = paginate(statement, CUSTOMER_KEYSET, skip=skip, limit=limit, cursor=cursor)
+    result = await db.execute(statement)
+    return list(result.scalars().all())
+
+
+async def get_customers_by_state(
+    db: AsyncSession, state: str, skip: int = 0, limit: int = 100, cursor: Optional[str] = None
+) -> List[models.Customer]:
+    statement = select(models.Customer).where(models.Customer.customer_state == state)
+    statement = paginate(statement, CUSTOMER_KEYSET, skip=skip, limit=limit, cursor=cursor)
+    result = await db.execute(statement)
+    return list(result.scalars().all())
@@ -0,0 +1,84 @@
+"""
+Async counterparts of the order read functions in app.crud.order
+"""
+from typing import Any, Dict, List, Optional, Sequence
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+from app.core.pagination import paginate
+from app.crud.order import (
+    ORDER_KEYSET,
+    ORDER_RESPONSE_FIELDS,
+    assemble_order_rows,
+    order_rows_statement,
+    orders_with_items_statement,
+    relation_rows_statement,
+)
+from app.db import models
+
+
+async def get_order(db: AsyncSession, order_id: str) -> Optional[models.Order]:
+    result = await db.execute(select(models.Order).where(models.Order.order_id == order_id))
+    return result.scalars().first()
+
+
+async def get_order_with_items(db: AsyncSession, order_id: str) -> Optional[models.Order]:
+    # Lazy loading is not available on async sessions, so items are loaded up front
+    result = await db.execute(
+        select(models.Order)
+        .where(models.Order.order_id == order_id)
+        .options(selectinload(models.Order.order_items))
+    )
+    return result.scalars().first()
+
+
+async def get_orders_with_items(
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = 100,
+    customer_id: Optional[str] = None,
+    status: Optional[str] = None,
+    cursor: Optional[str] = None,
+) -> List[models.Order]:
+    statement = orders_with_items_statement(customer_id=customer_id, status=status)
+    statement = paginate(statement, ORDER_KEYSET, skip=skip, limit=limit, cursor=cursor)
+    result = await db.execute(statement)
+    return list(result.scalars().all())
+
+
+async def _relation_rows(db: AsyncSession, include: Sequence[str], order_ids: Sequence[str]) -> Dict[str, Any]:
+    return {
+        relation: (await db.execute(relation_rows_statement(relation, order_ids))).all()
+        for relation in include
+    }
+
+
+async def get_order_rows(
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = 100,
+    customer_id: Optional[str] = None,
+    status: Optional[str] = None,
+    cursor: Optional[str] = None,
+    fields: Sequence[str] = ORDER_RESPONSE_FIELDS,
+    include: Sequence[str] = ("items",),
+) -> List[Dict[str, Any]]:
+    statement = order_rows_statement(fields, customer_id=customer_id, status=status)
+    statement = paginate(statement, ORDER_KEYSET, skip=skip, limit=limit, cursor=cursor)
+    order_rows = (await db.execute(statement)).all()
+    if not order_rows:
+        return []
+    order_ids = [row.order_id for row in order_rows]
+    return assemble_order_rows(order_rows, await _relation_rows(db, include, order_ids))
+
+
+async def get_order_row(
+    db: AsyncSession,
+    order_id: str,
+    fields: Sequence[str] = ORDER_RESPONSE_FIELDS,
+    include: Sequence[str] = ("items",),
+) -> Optional[Dict[str, Any]]:
+    order_rows = (await db.execute(order_rows_statement(fields, order_id=order_id))).all()
+    if not order_rows:
+        return None
+    return assemble_order_rows(order_rows, await _relation_rows(db, include, [order_id]))[0]
@@ -0,0 +1,67 @@
+"""
+Async counterparts of the product read functions in app.crud.product
+"""
+from typing import Any, Dict, List, Optional
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.cache import cache
+from app.core.pagination import paginate
+from app.crud.product import (
+    PRODUCT_KEYSET,
+    category_cache_key,
+    product_cache_key,
+    product_rows_statement,
+    serialize_product,
+)
+from app.db import models
+
+
+async def get_product(db: AsyncSession, product_id: str) -> Optional[models.Product]:
+    result = await db.execute(select(models.Product).where(models.Product.product_id == product_id))
+    return result.scalars().first()
+
+
+async def get_products(
+    db: AsyncSession, skip: int = 0, limit: int = 100, cursor: Optional[str] = None
+) -> List[models.Product]:
+    statement = paginate(select(models.Product), PRODUCT_KEYSET, skip=skip, limit=limit, cursor=cursor)
+    result = await db.execute(statement)
+    return list(result.scalars().all())
+
+
+async def get_product_rows(
+    db: AsyncSession, skip: int = 0, limit: int = 100, cursor: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """get_products as plain dicts read from row tuples, for the fast JSON response path"""
+    result = await db.execute(product_rows_statement(skip, limit, cursor))
+    return [dict(row) for row in result.mappings()]
+
+
+async def get_products_by_category(
+    db: AsyncSession, category: str, skip: int = 0, limit: int = 100, cursor: Optional[str] = None
+) -> List[models.Product]:
+    statement = select(models.Product).where(models.Product.product_category_name == category)
+    statement = paginate(statement, PRODUCT_KEYSET, skip=skip, limit=limit, cursor=cursor)
+    result = await db.execute(statement)
+    return list(result.scalars().all())
+
+
+async def get_product_cached(db: AsyncSession, product_id: str) -> Optional[Dict[str, Any]]:
+    """Read-through cached get_product, sharing its cache entries with the sync routes"""
+
+    async def load():
+        return serialize_product(await get_product(db, product_id))
+
+    return await cache.get_or_load_async(product_cache_key(product_id), load)
+
+
+async def get_products_by_category_cached(
+    db: AsyncSession, category: str, skip: int = 0, limit: int = 100, cursor: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """Read-through cached get_products_by_category, sharing its cache entries with the sync routes"""
+
+    async def load():
+        products = await get_products_by_category(db, category, skip=skip, limit=limit, cursor=cursor)
+        return [serialize_product(db_product) for db_product in products]
+
+    return await cache.get_or_load_async(category_cache_key(category, skip, limit, cursor), load)
@@ -1,9 +1,15 @@
-from typing import List, Optional
+from typing import Iterable, List, Optional, Set
+from sqlalchemy import Select, select
 from sqlalchemy.orm import Session
+from app.core.pagination import paginate
+from app.crud.lookup import get_existing_ids
 from app.db import models
 from app.schemas import customer
 import uuid
 
+# Columns that define the stable sort order used for keyset pagination
+CUSTOMER_KEYSET = (models.Customer.customer_id,)
+
 
 def get_customer(db: Session, customer_id: str) -> Optional[models.Customer]:
     return db.query(models.Customer).filter(models.Customer.customer_id == customer_id).first()
@@ -13,8 +19,15 @@ def get_customer_by_unique_id(db: Session, unique_id: str) -> Optional[models.Cu
     return db.query(models.Customer).filter(models.Customer.customer_unique_id == unique_id).first()
 
 
-def get_customers(db: Session, skip: int = 0, limit: int = 100) -> List[models.Customer]:
-    return db.query(models.Customer).offset(skip).limit(limit).all()
+def get_existing_customer_ids(db: Session, customer_ids: Iterable[str]) -> Set[str]:
+    return get_existing_ids(db, models.Customer.customer_id, customer_ids)
+
+
+def get_customers(
+    db: Session, skip: int = 0, limit: int = 100, cursor: Optional[str] = None
+) -> List[models.Customer]:
+    query = db.query(models.Customer)
+    return paginate(query, CUSTOMER_KEYSET, skip=skip, limit=limit, cursor=cursor).all()
 
 
 def create_customer(db: Session, customer_data: customer.CustomerCreate) -> models.Customer:
@@ -54,24 +67,24 @@ def delete_customer(db: Session, customer_id: str) -> bool:
 
 
 def get_customers_by_city(
-    db: Session, city: str, skip: int = 0, limit: int = 100
+    db: Session, city: str, skip: int = 0, limit: int = 100, cursor: Optional[str] = None
 ) -> List[models.Customer]:
-    return (
-        db.query(models.Customer)
-        .filter(models.Customer.customer_city == city)
-        .offset(skip)
-        .limit(limit)
-        .all()
-    )
+    query = db.query(models.Customer).filter(models.Customer.customer_city == city)
+    return paginate(query, CUSTOMER_KEYSET, skip=skip, limit=limit, cursor=cursor).all()
 
 
 def get_customers_by_state(
-    db: Session, state: str, skip: int = 0, limit: int = 100
+    db: Session, state: str, skip: int = 0, limit: int = 100, cursor: Optional[str] = None
 ) -> List[models.Customer]:
-    return (
-        db.query(models.Customer)
-        .filter(models.Customer.customer_state == state)
-        .offset(skip)
-        .limit(limit)
-        .all()
-    )
+    query = db.query(models.Customer).filter(models.Customer.customer_state == state)
+    return paginate(query, CUSTOMER_KEYSET, skip=skip, limit=limit, cursor=cursor).all()
+
+
+def export_customers_statement(state: Optional[str] = None, city: Optional[str] = None) -> Select:
+    """SELECT every customer column for a bulk export, in keyset order"""
+    statement = select(*models.Customer.__table__.columns)
+    if state is not None:
+        statement = statement.where(models.Customer.customer_state == state)
+    if city is not None:
+        statement = statement.where(models.Customer.customer_city == city)
+    return statement.order_by(*CUSTOMER_KEYSET)
@@ -0,0 +1,57 @@
+from typing import Callable, Optional
+from sqlalchemy import Row, select
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.geo import GeoIndex, SellerLocation
+from app.db import models
+
+
+def load_geo_index(db: Session) -> GeoIndex:
+    """Build the spatial index from the geolocation and seller tables, two full reads"""
+    prefixes = db.execute(
+        select(
+            models.Geolocation.geolocation_zip_code_prefix,
+            models.Geolocation.geolocation_lat,
+            models.Geolocation.geolocation_lng,
+        ).where(
+            models.Geolocation.geolocation_lat.is_not(None),
+            models.Geolocation.geolocation_lng.is_not(None),
+        )
+    ).all()
+    sellers = db.execute(
+        select(
+            models.Seller.seller_id,
+            models.Seller.seller_zip_code_prefix,
+            models.Seller.seller_city,
+            models.Seller.seller_state,
+        )
+    ).all()
+    return GeoIndex(
+        [tuple(row) for row in prefixes],
+        [SellerLocation(*row) for row in sellers],
+        cell_degrees=settings.GEO_GRID_CELL_DEGREES,
+    )
+
+
+def build_geo_index(session_factory: Callable[[], Session]) -> GeoIndex:
+    """load_geo_index in a session of its own, for rebuilds that outlive the request"""
+    with session_factory() as db:
+        return load_geo_index(db)
+
+
+def get_order_item_endpoints(db: Session, order_id: str, order_item_id: int) -> Optional[Row]:
+    """Seller and customer zip prefixes of one order item, in a single primary key lookup"""
+    return db.execute(
+        select(
+            models.OrderItem.order_id,
+            models.OrderItem.order_item_id,
+            models.OrderItem.seller_id,
+            models.Seller.seller_zip_code_prefix,
+            models.Order.customer_id,
+            models.Customer.customer_zip_code_prefix,
+        )
+        .join(models.Order, models.Order.order_id == models.OrderItem.order_id)
+        .outerjoin(models.Seller, models.Seller.seller_id == models.OrderItem.seller_id)
+        .outerjoin(models.Customer, models.Customer.customer_id == models.Order.customer_id)
+        .where(models.OrderItem.order_id == order_id, models.OrderItem.order_item_id == order_item_id)
+    ).first()
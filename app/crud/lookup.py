@@ -0,0 +1,15 @@
+from typing import Iterable, Set
+from sqlalchemy.orm import Session
+
+# Keeps each IN (...) list well below driver bind-parameter limits (e.g. SQLite's 32766)
+IN_CLAUSE_CHUNK_SIZE = 5000
+
+
+def get_existing_ids(db: Session, column, ids: Iterable[str]) -> Set[str]:
+    """Return the subset of ``ids`` present in ``column``, using one IN query per chunk"""
+    wanted = list(set(ids))
+    found: Set[str] = set()
+    for start in range(0, len(wanted), IN_CLAUSE_CHUNK_SIZE):
+        chunk = wanted[start:start + IN_CLAUSE_CHUNK_SIZE]
+        found.update(value for (value,) in db.query(column).filter(column.in_(chunk)))
+    return found
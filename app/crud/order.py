@@ -1,40 +1,92 @@
-from typing import List, Optional
-from sqlalchemy.orm import Session
-from sqlalchemy import func
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy import Select, func, insert, select, update
+from app.core.pagination import paginate
+from app.crud.seller import apply_seller_contributions, seller_contributions
 from app.db import models
 from app.schemas import order
 import uuid
 
+# Columns that define the stable sort order used for keyset pagination
+ORDER_KEYSET = (models.Order.order_purchase_timestamp, models.Order.order_id)
+
+# Fields of OrderResponse, in response order, read as plain rows by the fast JSON path
+ORDER_RESPONSE_FIELDS = (
+    "order_id",
+    "customer_id",
+    "order_status",
+    "order_purchase_timestamp",
+    "total_amount",
+    "item_count",
+    "updated_at",
+)
+# Order columns that sparse fieldsets (?fields=) may select
+ORDER_FIELDS = tuple(models.Order.__table__.columns.keys())
+# Always read so the next cursor and the ETag can be computed, even if not returned
+ORDER_REQUIRED_FIELDS = ("order_id", "order_purchase_timestamp", "updated_at")
+
+# Embeddable relationships (?include=) and the columns returned for each
+ORDER_RELATIONS = {
+    "items": (
+        models.OrderItem.product_id,
+        models.OrderItem.seller_id,
+        models.OrderItem.price,
+        models.OrderItem.freight_value,
+        models.OrderItem.shipping_limit_date,
+        models.OrderItem.order_id,
+        models.OrderItem.order_item_id,
+    ),
+    "payments": tuple(models.OrderPayment.__table__.columns),
+    "reviews": tuple(models.OrderReview.__table__.columns),
+}
+_RELATION_ORDER = {
+    "items": (models.OrderItem.order_id, models.OrderItem.order_item_id),
+    "payments": (models.OrderPayment.order_id, models.OrderPayment.payment_sequential),
+    "reviews": (models.OrderReview.order_id, models.OrderReview.review_id),
+}
+
+# Stored totals closer than this to the recomputed sum are not treated as drift
+TOTAL_TOLERANCE = 0.005
+
+
+def summarize_items(items) -> Tuple[float, int]:
+    """Total amount and item count for a list of order items, as stored on the order"""
+    total_amount = sum(item.price + (item.freight_value or 0.0) for item in items)
+    return total_amount, len(items)
+
 
 def get_order(db: Session, order_id: str) -> Optional[models.Order]:
     return db.query(models.Order).filter(models.Order.order_id == order_id).first()
 
 
-def get_orders(db: Session, skip: int = 0, limit: int = 100) -> List[models.Order]:
-    return db.query(models.Order).offset(skip).limit(limit).all()
+def get_orders(
+    db: Session, skip: int = 0, limit: int = 100, cursor: Optional[str] = None
+) -> List[models.Order]:
+    query = db.query(models.Order)
+    return paginate(query, ORDER_KEYSET, skip=skip, limit=limit, cursor=cursor).all()
 
 
 def get_customer_orders(
-    db: Session, customer_id: str, skip: int = 0, limit: int = 100
+    db: Session, customer_id: str, skip: int = 0, limit: int = 100, cursor: Optional[str] = None
 ) -> List[models.Order]:
-    return (
-        db.query(models.Order)
-        .filter(models.Order.customer_id == customer_id)
-        .offset(skip)
-        .limit(limit)
-        .all()
-    )
+    query = db.query(models.Order).filter(models.Order.customer_id == customer_id)
+    return paginate(query, ORDER_KEYSET, skip=skip, limit=limit, cursor=cursor).all()
 
 
 def create_order(db: Session, order_data: order.OrderCreate) -> models.Order:
     # Generate a unique order_id
     order_id = str(uuid.uuid4())
     
-    # Create the order
+    # Create the order with its totals maintained up front
+    total_amount, item_count = summarize_items(order_data.items)
     db_order = models.Order(
         order_id=order_id,
         customer_id=order_data.customer_id,
-        order_status=order_data.order_status
+        order_status=order_data.order_status,
+        total_amount=total_amount,
+        item_count=item_count
     )
     db.add(db_order)
     db.flush()  # Flush to get the order_id for order items
@@ -52,19 +104,55 @@ def create_order(db: Session, order_data: order.OrderCreate) -> models.Order:
         )
         db.add(db_order_item)
     
+    apply_seller_contributions(db, seller_contributions(db, [order_id]))
     db.commit()
     db.refresh(db_order)
     return db_order
 
 
+def create_orders_bulk(db: Session, orders_data: List[order.OrderCreate]) -> List[Tuple[str, float]]:
+    """
+    Insert many already-validated orders with two executemany statements and one commit.
+
+    Returns the generated order_id and total amount for each order, in input order.
+    """
+    order_rows = []
+    item_rows = []
+    created = []
+    for order_data in orders_data:
+        order_id = str(uuid.uuid4())
+        total_amount, item_count = summarize_items(order_data.items)
+        order_rows.append({
+            "order_id": order_id,
+            "customer_id": order_data.customer_id,
+            "order_status": order_data.order_status,
+            "total_amount": total_amount,
+            "item_count": item_count,
+        })
+        for item_data in order_data.items:
+            item_rows.append({"order_id": order_id, **item_data.dict()})
+        created.append((order_id, total_amount))
+    
+    if order_rows:
+        db.execute(insert(models.Order), order_rows)
+    if item_rows:
+        db.execute(insert(models.OrderItem), item_rows)
+    apply_seller_contributions(db, seller_contributions(db, [order_id for order_id, _ in created]))
+    db.commit()
+    return created
+
+
 def update_order(
     db: Session, order_id: str, order_data: order.OrderUpdate
 ) -> Optional[models.Order]:
     db_order = get_order(db, order_id)
     if db_order:
+        # Status and delivery dates feed the seller scorecards
+        before = seller_contributions(db, [order_id])
         update_data = order_data.dict(exclude_unset=True)
         for field, value in update_data.items():
             setattr(db_order, field, value)
+        apply_seller_contributions(db, seller_contributions(db, [order_id]), before)
         db.commit()
         db.refresh(db_order)
     return db_order
@@ -73,6 +161,7 @@ def update_order(
 def delete_order(db: Session, order_id: str) -> bool:
     db_order = get_order(db, order_id)
     if db_order:
+        apply_seller_contributions(db, {}, seller_contributions(db, [order_id]))
         # Delete order items first
         db.query(models.OrderItem).filter(models.OrderItem.order_id == order_id).delete()
         # Delete order payments
@@ -86,15 +175,34 @@ def delete_order(db: Session, order_id: str) -> bool:
     return False
 
 
+def create_review(
+    db: Session, order_id: str, review_data: order.OrderReviewCreate
+) -> models.OrderReview:
+    before = seller_contributions(db, [order_id])
+    db_review = models.OrderReview(
+        review_id=str(uuid.uuid4()),
+        order_id=order_id,
+        review_creation_date=models.utcnow(),
+        **review_data.dict()
+    )
+    db.add(db_review)
+    apply_seller_contributions(db, seller_contributions(db, [order_id]), before)
+    db.commit()
+    db.refresh(db_review)
+    return db_review
+
+
 def get_order_with_items(db: Session, order_id: str) -> Optional[models.Order]:
     return (
         db.query(models.Order)
+        .options(selectinload(models.Order.order_items))
         .filter(models.Order.order_id == order_id)
         .first()
     )
 
 
 def get_order_total(db: Session, order_id: str) -> float:
+    """Aggregate the total from the items; reads should prefer Order.total_amount"""
     total = (
         db.query(func.sum(models.OrderItem.price + models.OrderItem.freight_value))
         .filter(models.OrderItem.order_id == order_id)
@@ -104,12 +212,198 @@ def get_order_total(db: Session, order_id: str) -> float:
 
 
 def get_orders_by_status(
-    db: Session, status: str, skip: int = 0, limit: int = 100
+    db: Session, status: str, skip: int = 0, limit: int = 100, cursor: Optional[str] = None
 ) -> List[models.Order]:
+    query = db.query(models.Order).filter(models.Order.order_status == status)
+    return paginate(query, ORDER_KEYSET, skip=skip, limit=limit, cursor=cursor).all()
+
+
+def orders_with_items_statement(
+    customer_id: Optional[str] = None, status: Optional[str] = None
+) -> Select:
+    """
+    Build a SELECT of orders with their items eager loaded.
+
+    Items come from a single SELECT ... IN and totals are stored on the
+    order, so building the response afterwards issues no further queries.
+    Shared by the sync and async CRUD modules.
+    """
+    statement = select(models.Order).options(selectinload(models.Order.order_items))
+    if customer_id is not None:
+        statement = statement.where(models.Order.customer_id == customer_id)
+    if status is not None:
+        statement = statement.where(models.Order.order_status == status)
+    return statement
+
+
+def get_orders_with_items(
+    db: Session,
+    skip: int = 0,
+    limit: int = 100,
+    customer_id: Optional[str] = None,
+    status: Optional[str] = None,
+    cursor: Optional[str] = None,
+) -> List[models.Order]:
+    """Return a page of orders with their items loaded"""
+    statement = orders_with_items_statement(customer_id=customer_id, status=status)
+    statement = paginate(statement, ORDER_KEYSET, skip=skip, limit=limit, cursor=cursor)
+    return list(db.execute(statement).scalars().all())
+
+
+def order_rows_statement(
+    fields: Sequence[str] = ORDER_RESPONSE_FIELDS,
+    customer_id: Optional[str] = None,
+    status: Optional[str] = None,
+    order_id: Optional[str] = None,
+) -> Select:
+    """SELECT only the requested order columns as row tuples, without ORM entities"""
+    names = list(dict.fromkeys([*fields, *ORDER_REQUIRED_FIELDS]))
+    statement = select(*(models.Order.__table__.c[name] for name in names))
+    if customer_id is not None:
+        statement = statement.where(models.Order.customer_id == customer_id)
+    if status is not None:
+        statement = statement.where(models.Order.order_status == status)
+    if order_id is not None:
+        statement = statement.where(models.Order.order_id == order_id)
+    return statement
+
+
+def relation_rows_statement(relation: str, order_ids: Sequence[str]) -> Select:
+    """SELECT the rows of one embeddable relationship for a page of orders"""
+    order_id_column = _RELATION_ORDER[relation][0]
     return (
-        db.query(models.Order)
-        .filter(models.Order.order_status == status)
-        .offset(skip)
-        .limit(limit)
-        .all()
+        select(*ORDER_RELATIONS[relation])
+        .where(order_id_column.in_(order_ids))
+        .order_by(*_RELATION_ORDER[relation])
+    )
+
+
+def assemble_order_rows(
+    order_rows: Sequence[Any], relation_rows: Dict[str, Iterable[Sequence[Any]]]
+) -> List[Dict[str, Any]]:
+    """Build order dicts from order row tuples, embedding each relationship's rows under its name"""
+    orders = [row._asdict() for row in order_rows]
+    for relation, rows in relation_rows.items():
+        keys = [column.key for column in ORDER_RELATIONS[relation]]
+        grouped = defaultdict(list)
+        for row in rows:
+            embedded = dict(zip(keys, row))
+            grouped[embedded["order_id"]].append(embedded)
+        for order_row in orders:
+            order_row[relation] = grouped.get(order_row["order_id"], [])
+    return orders
+
+
+def get_order_rows(
+    db: Session,
+    skip: int = 0,
+    limit: int = 100,
+    customer_id: Optional[str] = None,
+    status: Optional[str] = None,
+    cursor: Optional[str] = None,
+    fields: Sequence[str] = ORDER_RESPONSE_FIELDS,
+    include: Sequence[str] = ("items",),
+) -> List[Dict[str, Any]]:
+    """
+    Return a page of orders as plain dicts, reading only ``fields`` and the
+    ``include``d relationships.
+
+    One query for the page plus one per included relationship, and no ORM
+    objects are created. The defaults are shaped like OrderResponse.
+    """
+    statement = order_rows_statement(fields, customer_id=customer_id, status=status)
+    statement = paginate(statement, ORDER_KEYSET, skip=skip, limit=limit, cursor=cursor)
+    order_rows = db.execute(statement).all()
+    if not order_rows:
+        return []
+    order_ids = [row.order_id for row in order_rows]
+    return assemble_order_rows(
+        order_rows,
+        {relation: db.execute(relation_rows_statement(relation, order_ids)).all() for relation in include},
     )
+
+
+def get_order_row(
+    db: Session,
+    order_id: str,
+    fields: Sequence[str] = ORDER_RESPONSE_FIELDS,
+    include: Sequence[str] = ("items",),
+) -> Optional[Dict[str, Any]]:
+    """get_order_rows for a single order"""
+    order_rows = db.execute(order_rows_statement(fields, order_id=order_id)).all()
+    if not order_rows:
+        return None
+    return assemble_order_rows(
+        order_rows,
+        {relation: db.execute(relation_rows_statement(relation, [order_id])).all() for relation in include},
+    )[0]
+
+
+def export_orders_statement(
+    status: Optional[str] = None,
+    customer_id: Optional[str] = None,
+    purchased_from: Optional[datetime] = None,
+    purchased_to: Optional[datetime] = None,
+) -> Select:
+    """
+    SELECT every order column for a bulk export, in keyset order so the
+    purchase timestamp indexes serve both the range filter and the sort.
+    ``purchased_to`` is exclusive.
+    """
+    statement = select(*models.Order.__table__.columns)
+    if status is not None:
+        statement = statement.where(models.Order.order_status == status)
+    if customer_id is not None:
+        statement = statement.where(models.Order.customer_id == customer_id)
+    if purchased_from is not None:
+        statement = statement.where(models.Order.order_purchase_timestamp >= purchased_from)
+    if purchased_to is not None:
+        statement = statement.where(models.Order.order_purchase_timestamp < purchased_to)
+    return statement.order_by(*ORDER_KEYSET)
+
+
+def _item_totals_subquery():
+    return (
+        select(
+            models.OrderItem.order_id.label("order_id"),
+            func.sum(models.OrderItem.price + func.coalesce(models.OrderItem.freight_value, 0.0))
+            .label("total_amount"),
+            func.count().label("item_count"),
+        )
+        .group_by(models.OrderItem.order_id)
+        .subquery()
+    )
+
+
+def reconcile_order_totals(db: Session) -> int:
+    """
+    Recompute the stored total_amount and item_count of every order whose
+    values have drifted from its items, in two set-based UPDATEs.
+
+    Returns the number of orders corrected.
+    """
+    totals = _item_totals_subquery()
+    drifted = (
+        update(models.Order)
+        .where(models.Order.order_id == totals.c.order_id)
+        .where(
+            (func.abs(func.coalesce(models.Order.total_amount, 0.0) - totals.c.total_amount) > TOTAL_TOLERANCE)
+            | (func.coalesce(models.Order.item_count, -1) != totals.c.item_count)
+        )
+        .values(total_amount=totals.c.total_amount, item_count=totals.c.item_count)
+        .execution_options(synchronize_session=False)
+    )
+    has_items = select(models.OrderItem.order_id).where(models.OrderItem.order_id == models.Order.order_id)
+    emptied = (
+        update(models.Order)
+        .where(~has_items.exists())
+        .where(
+            (func.coalesce(models.Order.total_amount, -1.0) != 0.0)
+            | (func.coalesce(models.Order.item_count, -1) != 0)
+        )
+        .values(total_amount=0.0, item_count=0)
+        .execution_options(synchronize_session=False)
+    )
+    corrected = db.execute(drifted).rowcount + db.execute(emptied).rowcount
+    db.commit()
+    return corrected
@@ -1,15 +1,43 @@
-from typing import List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Set
+from sqlalchemy import Select, select
 from sqlalchemy.orm import Session
+from app.core.cache import cache
+from app.core.pagination import paginate
+from app.crud.lookup import get_existing_ids
 from app.db import models
 from app.schemas import product
 
+# Columns that define the stable sort order used for keyset pagination
+PRODUCT_KEYSET = (models.Product.product_id,)
+
 
 def get_product(db: Session, product_id: str) -> Optional[models.Product]:
     return db.query(models.Product).filter(models.Product.product_id == product_id).first()
 
 
-def get_products(db: Session, skip: int = 0, limit: int = 100) -> List[models.Product]:
-    return db.query(models.Product).offset(skip).limit(limit).all()
+def get_existing_product_ids(db: Session, product_ids: Iterable[str]) -> Set[str]:
+    return get_existing_ids(db, models.Product.product_id, product_ids)
+
+
+def get_products(
+    db: Session, skip: int = 0, limit: int = 100, cursor: Optional[str] = None
+) -> List[models.Product]:
+    query = db.query(models.Product)
+    return paginate(query, PRODUCT_KEYSET, skip=skip, limit=limit, cursor=cursor).all()
+
+
+def product_rows_statement(skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> Select:
+    """SELECT a page of products as row tuples, for the fast JSON response path"""
+    # Selected in schema field order so the JSON matches the response_model output
+    columns = [models.Product.__table__.c[name] for name in product.Product.model_fields]
+    return paginate(select(*columns), PRODUCT_KEYSET, skip=skip, limit=limit, cursor=cursor)
+
+
+def get_product_rows(
+    db: Session, skip: int = 0, limit: int = 100, cursor: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """get_products as plain dicts read from row tuples, for the fast JSON response path"""
+    return [dict(row) for row in db.execute(product_rows_statement(skip, limit, cursor)).mappings()]
 
 
 def create_product(db: Session, product_data: product.ProductCreate) -> models.Product:
@@ -17,6 +45,7 @@ def create_product(db: Session, product_data: product.ProductCreate) -> models.P
     db.add(db_product)
     db.commit()
     db.refresh(db_product)
+    invalidate_product_cache(db_product.product_id, db_product.product_category_name)
     return db_product
 
 
@@ -25,30 +54,82 @@ def update_product(
 ) -> Optional[models.Product]:
     db_product = get_product(db, product_id)
     if db_product:
+        old_category = db_product.product_category_name
         update_data = product_data.dict(exclude_unset=True)
         for field, value in update_data.items():
             setattr(db_product, field, value)
         db.commit()
         db.refresh(db_product)
+        invalidate_product_cache(product_id, old_category, db_product.product_category_name)
     return db_product
 
 
 def delete_product(db: Session, product_id: str) -> bool:
     db_product = get_product(db, product_id)
     if db_product:
+        category = db_product.product_category_name
         db.delete(db_product)
         db.commit()
+        invalidate_product_cache(product_id, category)
         return True
     return False
 
 
 def get_products_by_category(
-    db: Session, category: str, skip: int = 0, limit: int = 100
+    db: Session, category: str, skip: int = 0, limit: int = 100, cursor: Optional[str] = None
 ) -> List[models.Product]:
-    return (
-        db.query(models.Product)
-        .filter(models.Product.product_category_name == category)
-        .offset(skip)
-        .limit(limit)
-        .all()
+    query = db.query(models.Product).filter(models.Product.product_category_name == category)
+    return paginate(query, PRODUCT_KEYSET, skip=skip, limit=limit, cursor=cursor).all()
+
+
+def export_products_statement(category: Optional[str] = None) -> Select:
+    """SELECT every product column for a bulk export, in keyset order"""
+    statement = select(*models.Product.__table__.columns)
+    if category is not None:
+        statement = statement.where(models.Product.product_category_name == category)
+    return statement.order_by(*PRODUCT_KEYSET)
+
+
+def serialize_product(db_product: Optional[models.Product]) -> Optional[Dict[str, Any]]:
+    if db_product is None:
+        return None
+    return product.Product.model_validate(db_product).model_dump()
+
+
+def product_cache_key(product_id: str) -> str:
+    return cache.key("product", product_id)
+
+
+def category_cache_key(category: str, skip: int, limit: int, cursor: Optional[str]) -> str:
+    """Key of one category page; pages are dropped together when the category changes"""
+    return cache.key(
+        "category", category, f"v{cache.generation(f'category:{category}')}", skip, limit, cursor or ""
+    )
+
+
+def get_product_cached(db: Session, product_id: str) -> Optional[Dict[str, Any]]:
+    """Read-through cached get_product, returning the serialized product"""
+    return cache.get_or_load(
+        product_cache_key(product_id),
+        lambda: serialize_product(get_product(db, product_id)),
+    )
+
+
+def get_products_by_category_cached(
+    db: Session, category: str, skip: int = 0, limit: int = 100, cursor: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """Read-through cached get_products_by_category"""
+    return cache.get_or_load(
+        category_cache_key(category, skip, limit, cursor),
+        lambda: [
+            serialize_product(db_product)
+            for db_product in get_products_by_category(db, category, skip=skip, limit=limit, cursor=cursor)
+        ],
     )
+
+
+def invalidate_product_cache(product_id: str, *categories: Optional[str]) -> None:
+    cache.delete(product_cache_key(product_id))
+    for category in set(categories):
+        if category is not None:
+            cache.bump(f"category:{category}")
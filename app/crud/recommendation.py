@@ -0,0 +1,37 @@
+from datetime import datetime
+from typing import Callable, Optional
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+from app.core.recommendations import Baskets
+from app.crud.analytics import EXCLUDED_ORDER_STATUSES
+from app.db import models
+
+
+def load_baskets(db: Session, since: Optional[datetime] = None) -> Baskets:
+    """
+    Order and product ids of every item in orders purchased after ``since``
+    (all orders when None), as columns from a single query. Orders are
+    included whole, up to the returned high-water mark.
+    """
+    until = db.execute(select(func.max(models.Order.order_purchase_timestamp))).scalar()
+    query = (
+        select(models.OrderItem.order_id, models.OrderItem.product_id)
+        .join(models.Order, models.Order.order_id == models.OrderItem.order_id)
+        .where(models.OrderItem.product_id.is_not(None))
+        .where(func.coalesce(models.Order.order_status, "").not_in(EXCLUDED_ORDER_STATUSES))
+    )
+    if until is not None:
+        query = query.where(models.Order.order_purchase_timestamp <= until)
+    if since is not None:
+        query = query.where(models.Order.order_purchase_timestamp > since)
+    order_ids, product_ids = [], []
+    for order_id, product_id in db.execute(query.execution_options(yield_per=10_000)):
+        order_ids.append(order_id)
+        product_ids.append(product_id)
+    return Baskets(order_ids, product_ids, until)
+
+
+def read_baskets(session_factory: Callable[[], Session], since: Optional[datetime] = None) -> Baskets:
+    """load_baskets in a session of its own, for refreshes that outlive the request"""
+    with session_factory() as db:
+        return load_baskets(db, since)
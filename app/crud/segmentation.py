@@ -0,0 +1,148 @@
+from datetime import datetime, timezone
+from typing import Any, List, NamedTuple, Optional
+import numpy as np
+from sqlalchemy import delete, func, select
+from sqlalchemy.orm import Session
+from app.core.pagination import paginate
+from app.core.segmentation import score_rfm
+from app.crud.analytics import EXCLUDED_ORDER_STATUSES
+from app.db import models
+from app.db.bulk import write_columns
+
+CUSTOMER_SEGMENTS = "customer_segments"
+
+# Columns that define the stable sort order used for keyset pagination within a segment
+SEGMENT_KEYSET = (models.CustomerSegment.customer_unique_id,)
+
+_FETCH_SIZE = 50_000
+_SECONDS_PER_DAY = 86400.0
+
+
+class SegmentationResult(NamedTuple):
+    as_of: Optional[datetime]
+    customers: int
+    orders: int
+
+
+def _epoch_seconds(db: Session, column):
+    if db.get_bind().dialect.name == "sqlite":
+        return (func.julianday(column) - 2440587.5) * _SECONDS_PER_DAY
+    return func.extract("epoch", column)
+
+
+def _as_epoch(value: datetime) -> float:
+    # SQLite hands back naive datetimes, stored as UTC
+    return (value if value.tzinfo else value.replace(tzinfo=timezone.utc)).timestamp()
+
+
+def load_order_columns(db: Session):
+    """
+    (customer_unique_id, purchase epoch seconds, order total) of every order
+    that counts as a sale, as NumPy columns from one streamed query
+    """
+    query = (
+        select(
+            models.Customer.customer_unique_id,
+            _epoch_seconds(db, models.Order.order_purchase_timestamp),
+            func.coalesce(models.Order.total_amount, 0.0),
+        )
+        .join(models.Customer, models.Customer.customer_id == models.Order.customer_id)
+        .where(models.Customer.customer_unique_id.is_not(None))
+        .where(models.Order.order_purchase_timestamp.is_not(None))
+        .where(func.coalesce(models.Order.order_status, "").not_in(EXCLUDED_ORDER_STATUSES))
+        .execution_options(yield_per=_FETCH_SIZE)
+    )
+    unique_ids: List[Any] = []
+    purchased: List[float] = []
+    totals: List[float] = []
+    for partition in db.execute(query).partitions():
+        for unique_id, purchased_at, total in partition:
+            unique_ids.append(unique_id)
+            purchased.append(purchased_at)
+            totals.append(total)
+    return (
+        np.array(unique_ids, dtype=object),
+        np.array(purchased, dtype=float),
+        np.array(totals, dtype=float),
+    )
+
+
+def compute_customer_segments(db: Session, as_of: Optional[datetime] = None) -> SegmentationResult:
+    """
+    Recompute every customer's RFM scores and segment and replace the
+    customer_segments table in one transaction.
+
+    Orders are grouped by customer_unique_id. Recency is measured in days
+    back from ``as_of``, which defaults to the latest purchase so historical
+    datasets are not all scored as lapsed.
+    """
+    unique_ids, purchased, totals = load_order_columns(db)
+    db.execute(delete(models.CustomerSegment))
+    if len(unique_ids) == 0:
+        _record_run(db, as_of)
+        db.commit()
+        return SegmentationResult(as_of, 0, 0)
+
+    customers, inverse = np.unique(unique_ids.astype(str), return_inverse=True)
+    last_purchase = np.full(len(customers), -np.inf)
+    np.maximum.at(last_purchase, inverse, purchased)
+    frequency = np.bincount(inverse, minlength=len(customers))
+    monetary = np.bincount(inverse, weights=totals, minlength=len(customers))
+
+    if as_of is None:
+        reference = float(purchased.max())
+        as_of = datetime.fromtimestamp(reference, timezone.utc)
+    else:
+        reference = _as_epoch(as_of)
+    recency_days = np.maximum(reference - last_purchase, 0.0) / _SECONDS_PER_DAY
+    scores = score_rfm(recency_days, frequency, monetary)
+
+    write_columns(db.connection(), models.CustomerSegment.__table__, {
+        "customer_unique_id": customers,
+        "recency_days": np.round(recency_days, 3),
+        "frequency": frequency,
+        "monetary": np.round(monetary, 2),
+        "recency_score": scores.recency,
+        "frequency_score": scores.frequency,
+        "monetary_score": scores.monetary,
+        "segment": scores.segment,
+    })
+    _record_run(db, as_of)
+    db.commit()
+    return SegmentationResult(as_of, len(customers), len(unique_ids))
+
+
+def _record_run(db: Session, as_of: Optional[datetime]) -> None:
+    state = db.get(models.RollupState, CUSTOMER_SEGMENTS)
+    if state is None:
+        state = models.RollupState(name=CUSTOMER_SEGMENTS)
+        db.add(state)
+    state.high_water_mark = as_of
+    state.refreshed_at = models.utcnow()
+
+
+def get_customer_segment(db: Session, customer_unique_id: str) -> Optional[models.CustomerSegment]:
+    return db.get(models.CustomerSegment, customer_unique_id)
+
+
+def get_segment_customers(
+    db: Session, segment: str, skip: int = 0, limit: int = 100, cursor: Optional[str] = None
+) -> List[models.CustomerSegment]:
+    query = db.query(models.CustomerSegment).filter(models.CustomerSegment.segment == segment)
+    return paginate(query, SEGMENT_KEYSET, skip=skip, limit=limit, cursor=cursor).all()
+
+
+def get_segment_summary(db: Session) -> List[Any]:
+    """Customers and average measures per segment, largest segment first"""
+    segment = models.CustomerSegment
+    return db.execute(
+        select(
+            segment.segment,
+            func.count().label("customer_count"),
+            func.avg(segment.recency_days).label("average_recency_days"),
+            func.avg(segment.frequency).label("average_frequency"),
+            func.avg(segment.monetary).label("average_monetary"),
+        )
+        .group_by(segment.segment)
+        .order_by(func.count().desc(), segment.segment)
+    ).all()
@@ -0,0 +1,225 @@
+from typing import Dict, Iterable, List, Optional, Set
+from sqlalchemy import and_, case, delete, func, insert, literal, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from app.core.geo import geo_index
+from app.core.pagination import paginate
+from app.crud.analytics import EXCLUDED_ORDER_STATUSES
+from app.crud.lookup import IN_CLAUSE_CHUNK_SIZE, get_existing_ids
+from app.db import models
+from app.schemas import seller
+
+# Columns that define the stable sort order used for keyset pagination
+SELLER_KEYSET = (models.Seller.seller_id,)
+
+# Additive seller_stats counters; each order contributes to every seller with items in it
+SELLER_STAT_FIELDS = (
+    "order_count",
+    "item_count",
+    "gmv",
+    "review_count",
+    "review_score_sum",
+    "delivered_count",
+    "on_time_count",
+    "dispatch_count",
+    "dispatch_seconds_sum",
+)
+
+SellerContributions = Dict[str, Dict[str, float]]
+
+# INSERT constructs supporting ON CONFLICT DO UPDATE, by database backend
+UPSERT_INSERTS = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+
+
+def get_seller(db: Session, seller_id: str) -> Optional[models.Seller]:
+    return db.query(models.Seller).filter(models.Seller.seller_id == seller_id).first()
+
+
+def get_existing_seller_ids(db: Session, seller_ids: Iterable[str]) -> Set[str]:
+    return get_existing_ids(db, models.Seller.seller_id, seller_ids)
+
+
+def get_sellers(
+    db: Session, skip: int = 0, limit: int = 100, cursor: Optional[str] = None
+) -> List[models.Seller]:
+    query = db.query(models.Seller)
+    return paginate(query, SELLER_KEYSET, skip=skip, limit=limit, cursor=cursor).all()
+
+
+def create_seller(db: Session, seller_data: seller.SellerCreate) -> models.Seller:
+    db_seller = models.Seller(**seller_data.dict())
+    db.add(db_seller)
+    db.commit()
+    db.refresh(db_seller)
+    # Nearest-seller lookups must see the new location
+    geo_index.clear()
+    return db_seller
+
+
+def update_seller(
+    db: Session, seller_id: str, seller_data: seller.SellerUpdate
+) -> Optional[models.Seller]:
+    db_seller = get_seller(db, seller_id)
+    if db_seller:
+        update_data = seller_data.dict(exclude_unset=True)
+        for field, value in update_data.items():
+            setattr(db_seller, field, value)
+        db.commit()
+        db.refresh(db_seller)
+        geo_index.clear()
+    return db_seller
+
+
+def seller_has_order_items(db: Session, seller_id: str) -> bool:
+    return db.query(
+        select(models.OrderItem.seller_id).where(models.OrderItem.seller_id == seller_id).exists()
+    ).scalar()
+
+
+def delete_seller(db: Session, seller_id: str) -> bool:
+    db_seller = get_seller(db, seller_id)
+    if db_seller:
+        db.execute(delete(models.SellerStats).where(models.SellerStats.seller_id == seller_id))
+        db.delete(db_seller)
+        db.commit()
+        geo_index.clear()
+        return True
+    return False
+
+
+def get_seller_stats(db: Session, seller_id: str) -> Optional[models.SellerStats]:
+    return db.get(models.SellerStats, seller_id)
+
+
+def _seconds_between(db: Session, start, end):
+    if db.get_bind().dialect.name == "sqlite":
+        return (func.julianday(end) - func.julianday(start)) * 86400.0
+    return func.extract("epoch", end - start)
+
+
+def seller_stats_statement(db: Session, order_ids: Optional[Iterable[str]] = None):
+    """
+    SELECT the seller_stats counters contributed by ``order_ids`` (every
+    order when None), one row per seller. Reviews and delivery outcomes are
+    order-level and count once for each seller in the order.
+    """
+    item = models.OrderItem
+    order = models.Order
+    per_seller = select(
+        item.order_id,
+        item.seller_id,
+        func.count().label("item_total"),
+        func.coalesce(func.sum(item.price), 0.0).label("gmv"),
+    ).group_by(item.order_id, item.seller_id)
+    reviews = select(
+        models.OrderReview.order_id,
+        func.count().label("reviews"),
+        func.coalesce(func.sum(models.OrderReview.review_score), 0).label("score"),
+    ).group_by(models.OrderReview.order_id)
+    if order_ids is not None:
+        order_ids = list(order_ids)
+        per_seller = per_seller.where(item.order_id.in_(order_ids))
+        reviews = reviews.where(models.OrderReview.order_id.in_(order_ids))
+    per_seller = per_seller.subquery()
+    reviews = reviews.subquery()
+
+    delivered = and_(
+        order.order_delivered_customer_date.is_not(None), order.order_estimated_delivery_date.is_not(None)
+    )
+    dispatched = and_(order.order_approved_at.is_not(None), order.order_delivered_carrier_date.is_not(None))
+    return (
+        select(
+            per_seller.c.seller_id,
+            func.count().label("order_count"),
+            func.sum(per_seller.c.item_total).label("item_count"),
+            func.sum(per_seller.c.gmv).label("gmv"),
+            func.sum(func.coalesce(reviews.c.reviews, 0)).label("review_count"),
+            func.sum(func.coalesce(reviews.c.score, 0)).label("review_score_sum"),
+            func.sum(case((delivered, 1), else_=0)).label("delivered_count"),
+            func.sum(case(
+                (and_(delivered, order.order_delivered_customer_date <= order.order_estimated_delivery_date), 1),
+                else_=0,
+            )).label("on_time_count"),
+            func.sum(case((dispatched, 1), else_=0)).label("dispatch_count"),
+            func.sum(case(
+                (dispatched, _seconds_between(db, order.order_approved_at, order.order_delivered_carrier_date)),
+                else_=0.0,
+            )).label("dispatch_seconds_sum"),
+        )
+        .select_from(per_seller)
+        .join(order, order.order_id == per_seller.c.order_id)
+        .outerjoin(reviews, reviews.c.order_id == per_seller.c.order_id)
+        .where(func.coalesce(order.order_status, "").not_in(EXCLUDED_ORDER_STATUSES))
+        .group_by(per_seller.c.seller_id)
+    )
+
+
+def seller_contributions(db: Session, order_ids: Iterable[str]) -> SellerContributions:
+    """Current seller_stats contribution of some orders; take one before and one after changing them"""
+    db.flush()
+    order_ids = list(order_ids)
+    contributions: SellerContributions = {}
+    for start in range(0, len(order_ids), IN_CLAUSE_CHUNK_SIZE):
+        chunk = order_ids[start:start + IN_CLAUSE_CHUNK_SIZE]
+        for row in db.execute(seller_stats_statement(db, chunk)).mappings():
+            totals = contributions.setdefault(row["seller_id"], dict.fromkeys(SELLER_STAT_FIELDS, 0))
+            for name in SELLER_STAT_FIELDS:
+                totals[name] += row[name] or 0
+    return contributions
+
+
+def _add_to_seller_stats(db: Session, seller_id: str, delta: Dict[str, float]) -> None:
+    """
+    Create the seller's seller_stats row with ``delta`` or add ``delta`` to
+    it, in one statement: two transactions writing a seller's first row do
+    not both INSERT it
+    """
+    backend = db.get_bind().dialect.name
+    if backend not in UPSERT_INSERTS:
+        raise ValueError(f"No upsert configured for database backend '{backend}'")
+    stats = models.SellerStats
+    statement = UPSERT_INSERTS[backend](stats).values(seller_id=seller_id, updated_at=models.utcnow(), **delta)
+    increments = {name: getattr(stats, name) + statement.excluded[name] for name, value in delta.items() if value}
+    db.execute(statement.on_conflict_do_update(
+        index_elements=[stats.seller_id],
+        set_={**increments, "updated_at": statement.excluded.updated_at},
+    ))
+    # A row loaded earlier in this session is now stale
+    loaded = db.identity_map.get(db.identity_key(stats, seller_id))
+    if loaded is not None:
+        db.expire(loaded)
+
+
+def apply_seller_contributions(
+    db: Session, after: SellerContributions, before: Optional[SellerContributions] = None
+) -> None:
+    """
+    Add the difference between two contribution snapshots to seller_stats.
+    Counters are upserted and incremented in SQL, so concurrent writers
+    neither lose updates nor collide creating a seller's first row.
+    Does not commit.
+    """
+    before = before or {}
+    for seller_id in set(after) | set(before):
+        delta = {
+            name: after.get(seller_id, {}).get(name, 0) - before.get(seller_id, {}).get(name, 0)
+            for name in SELLER_STAT_FIELDS
+        }
+        if not any(delta.values()):
+            continue
+        _add_to_seller_stats(db, seller_id, delta)
+
+
+def rebuild_seller_stats(db: Session) -> int:
+    """Recompute every seller's counters in one INSERT ... SELECT, e.g. after a bulk load; returns sellers written"""
+    db.execute(delete(models.SellerStats))
+    statement = seller_stats_statement(db)
+    columns = ("seller_id", *SELLER_STAT_FIELDS, "updated_at")
+    written = db.execute(
+        insert(models.SellerStats).from_select(columns, statement.add_columns(literal(models.utcnow())))
+    ).rowcount
+    db.commit()
+    return written
@@ -0,0 +1,84 @@
+"""
+Bulk writes shared by the Olist loaders and batch jobs
+
+PostgreSQL (psycopg2) is written to with ``COPY FROM STDIN``; other databases
+(e.g. SQLite) fall back to batched ``executemany`` inserts.
+"""
+import csv
+import io
+from typing import Any, Dict, Iterable, Iterator, List, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import Table, insert
+from sqlalchemy.engine import Connection, Engine
+
+DEFAULT_BATCH_SIZE = 50_000
+
+
+def batches(rows: Iterable[Tuple[Any, ...]], batch_size: int) -> Iterator[List[Tuple[Any, ...]]]:
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def copy_rows(
+    connection: Connection,
+    table: Table,
+    columns: Sequence[str],
+    rows: Iterable[Tuple[Any, ...]],
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> int:
+    """Stream rows into PostgreSQL with COPY FROM STDIN, one buffer per batch"""
+    cursor = connection.connection.cursor()
+    statement = (
+        f'COPY {table.name} ({", ".join(columns)}) '
+        "FROM STDIN WITH (FORMAT csv, NULL '')"
+    )
+    count = 0
+    try:
+        for batch in batches(rows, batch_size):
+            buffer = io.StringIO()
+            csv.writer(buffer).writerows(batch)
+            buffer.seek(0)
+            cursor.copy_expert(statement, buffer)
+            count += len(batch)
+    finally:
+        cursor.close()
+    return count
+
+
+def supports_copy(engine: Engine) -> bool:
+    return engine.dialect.name == "postgresql" and engine.dialect.driver == "psycopg2"
+
+
+def _python_values(values: np.ndarray) -> List[Any]:
+    """Column array as Python values the DB drivers accept; NaT becomes None"""
+    if np.issubdtype(values.dtype, np.datetime64):
+        return values.astype("datetime64[us]").tolist()
+    return values.tolist()
+
+
+def write_columns(
+    connection: Connection,
+    table: Table,
+    columns: Dict[str, np.ndarray],
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> int:
+    """Write column arrays to ``table`` with COPY on PostgreSQL and executemany elsewhere"""
+    names = list(columns)
+    rows: Iterator[Tuple[Any, ...]] = zip(*(_python_values(values) for values in columns.values()))
+    if supports_copy(connection.engine):
+        return copy_rows(connection, table, names, rows, batch_size)
+    statement = insert(table)
+    count = 0
+    while True:
+        batch = [dict(zip(names, row)) for _, row in zip(range(batch_size), rows)]
+        if not batch:
+            return count
+        connection.execute(statement, batch)
+        count += len(batch)
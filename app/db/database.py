@@ -1,16 +1,163 @@
+import os
+import weakref
+from typing import Any, Callable, Dict, Optional
 from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import QueuePool
 from app.core.config import settings
 
-engine = create_engine(settings.DATABASE_URL)
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+
+def get_engine_options(database_url: str) -> Dict[str, Any]:
+    """Build pool and timeout arguments for create_engine from settings"""
+    url = make_url(database_url)
+    options: Dict[str, Any] = {
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+    }
+    if url.get_backend_name() == "sqlite":
+        # SQLite uses its own single-file pools without overflow or timeouts
+        return options
+
+    options.update(
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+    )
+    if settings.DB_STATEMENT_TIMEOUT_MS is not None and url.get_backend_name() == "postgresql":
+        if url.get_driver_name() == "asyncpg":
+            options["connect_args"] = {
+                "server_settings": {"statement_timeout": str(settings.DB_STATEMENT_TIMEOUT_MS)}
+            }
+        else:
+            options["connect_args"] = {"options": f"-c statement_timeout={settings.DB_STATEMENT_TIMEOUT_MS}"}
+    return options
+
+
+# pool_size + max_overflow per engine; QueuePool has no public accessor for max_overflow
+_pool_capacities: "weakref.WeakKeyDictionary[Engine, int]" = weakref.WeakKeyDictionary()
+
+
+def register_pool_capacity(db_engine: Engine, options: Dict[str, Any]) -> Engine:
+    """
+    Remember the most connections ``db_engine``'s pool will hand out, from
+    the ``options`` it was created with; engines without an explicit,
+    bounded ``max_overflow`` are left unregistered
+    """
+    max_overflow = options.get("max_overflow")
+    if isinstance(db_engine.pool, QueuePool) and max_overflow is not None and max_overflow >= 0:
+        _pool_capacities[db_engine] = db_engine.pool.size() + max_overflow
+    return db_engine
+
+
+_engine_options = get_engine_options(settings.DATABASE_URL)
+engine = register_pool_capacity(create_engine(settings.DATABASE_URL, **_engine_options), _engine_options)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
 
+
+def get_async_database_url(database_url: str) -> str:
+    """Swap the driver of a sync database URL for its async counterpart"""
+    url = make_url(database_url)
+    backend = url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for database backend '{backend}'")
+    return url.set(drivername=ASYNC_DRIVERS[backend]).render_as_string(hide_password=False)
+
+
+# The async engine is only created when enabled so its driver stays optional
+async_engine = None
+AsyncSessionLocal = None
+if settings.ASYNC_DATABASE:
+    _async_database_url = settings.ASYNC_DATABASE_URL or get_async_database_url(settings.DATABASE_URL)
+    _async_engine_options = get_engine_options(_async_database_url)
+    async_engine = create_async_engine(_async_database_url, **_async_engine_options)
+    register_pool_capacity(async_engine.sync_engine, _async_engine_options)
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+
+def _dispose_inherited_pools() -> None:
+    """
+    Forget pooled connections copied from the parent after a fork, without
+    closing them under the parent; the child then opens its own connections.
+    """
+    engine.dispose(close=False)
+    if async_engine is not None:
+        async_engine.sync_engine.dispose(close=False)
+
+
+# Covers fork-based servers that import the app before forking workers
+# (e.g. gunicorn --preload); the bundled launcher spawns fresh processes instead
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_dispose_inherited_pools)
+
+
+def get_pool_status(db_engine: Engine) -> Dict[str, Any]:
+    """Snapshot of live pool usage; counters a pool class does not track are None"""
+    pool = db_engine.pool
+
+    def counter(name: str):
+        method = getattr(pool, name, None)
+        return method() if callable(method) else None
+
+    return {
+        "pool_class": type(pool).__name__,
+        "size": counter("size"),
+        "checked_in": counter("checkedin"),
+        "checked_out": counter("checkedout"),
+        "overflow": counter("overflow"),
+        "status": pool.status(),
+    }
+
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+
+def get_session_factory() -> Callable[[], Session]:
+    """
+    For work that outlives the request, such as a streamed response body:
+    it must open and close a session of its own, because the request's
+    ``get_db`` session may be closed before the work finishes
+    """
+    return SessionLocal
+
+
+async def get_async_db():
+    if AsyncSessionLocal is None:
+        raise RuntimeError("Async database is disabled; set ASYNC_DATABASE=true to enable it")
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def get_pool_capacity(db_engine: Engine) -> Optional[int]:
+    """
+    Most connections the engine's pool will hand out (pool_size + max_overflow),
+    as registered by register_pool_capacity; None for pools without a known limit
+    """
+    return _pool_capacities.get(db_engine)
+
+
+def get_pool_utilization(db_engine: Engine) -> Optional[float]:
+    """
+    Fraction of the pool's maximum connections (pool_size + max_overflow)
+    currently checked out; None for pools that do not track checkouts or
+    have no limit
+    """
+    checked_out = get_pool_status(db_engine)["checked_out"]
+    capacity = get_pool_capacity(db_engine)
+    if checked_out is None or not capacity:
+        return None
+    return checked_out / capacity
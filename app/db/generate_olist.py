@@ -0,0 +1,429 @@
+"""
+Synthetic Olist-shaped data generator
+
+Produces every table of the schema with the statistical shape of the
+public Olist dataset: customers skewed towards a few states, Zipfian
+product and seller popularity, multi-item orders, split payments and
+reviews. Column values are generated as NumPy arrays one chunk of orders at
+a time, so tens of millions of rows can be produced with bounded memory, and
+written with PostgreSQL ``COPY`` or batched ``executemany`` inserts like the
+Olist loader.
+
+Output is deterministic for a given seed and scale.
+
+Usage:
+    python -m app.db.generate_olist --orders 1000000 [--customers N] [--seed 42] [--truncate] [--database-url URL]
+"""
+import argparse
+import time
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.crud.seller import rebuild_seller_stats
+from app.db import models
+from app.db.bulk import DEFAULT_BATCH_SIZE, write_columns
+from app.db.ingest_olist import OLIST_SOURCES, IngestResult
+
+# Customers and orders are generated per chunk of this many rows; fixed so the
+# output does not depend on the write batch size
+CHUNK_SIZE = 100_000
+
+START_DATE = np.datetime64("2016-09-01T00:00:00", "s")
+SPAN_SECONDS = 2 * 365 * 24 * 3600
+DAY = 24 * 3600
+
+# Share of Olist customers per state, with its approximate centroid (lat, lng)
+STATES = {
+    "SP": (0.420, -23.0, -47.5), "RJ": (0.129, -22.5, -43.2), "MG": (0.117, -19.5, -44.5),
+    "RS": (0.055, -30.0, -52.5), "PR": (0.051, -24.8, -51.5), "SC": (0.037, -27.3, -50.0),
+    "BA": (0.034, -12.5, -41.5), "DF": (0.022, -15.8, -47.9), "ES": (0.020, -19.6, -40.5),
+    "GO": (0.020, -16.0, -49.5), "PE": (0.017, -8.3, -37.5), "CE": (0.013, -5.2, -39.5),
+    "PA": (0.010, -4.0, -52.0), "MT": (0.009, -13.0, -56.0), "MA": (0.008, -5.0, -45.0),
+    "MS": (0.007, -20.5, -54.5), "PB": (0.005, -7.2, -36.7), "PI": (0.005, -7.5, -42.5),
+    "RN": (0.005, -5.8, -36.5), "AL": (0.004, -9.6, -36.6), "SE": (0.004, -10.6, -37.4),
+    "TO": (0.003, -10.2, -48.3), "RO": (0.003, -10.9, -62.8), "AM": (0.002, -3.5, -63.0),
+    "AC": (0.001, -9.0, -70.0), "AP": (0.001, 1.4, -51.8), "RR": (0.001, 2.0, -61.4),
+}
+
+# Portuguese category names and their English translation, most popular first
+CATEGORIES = {
+    "cama_mesa_banho": "bed_bath_table", "beleza_saude": "health_beauty", "esporte_lazer": "sports_leisure",
+    "moveis_decoracao": "furniture_decor", "informatica_acessorios": "computers_accessories",
+    "utilidades_domesticas": "housewares", "relogios_presentes": "watches_gifts", "telefonia": "telephony",
+    "ferramentas_jardim": "garden_tools", "automotivo": "auto", "brinquedos": "toys", "cool_stuff": "cool_stuff",
+    "perfumaria": "perfumery", "bebes": "baby", "eletronicos": "electronics", "papelaria": "stationery",
+    "fashion_bolsas_e_acessorios": "fashion_bags_accessories", "pet_shop": "pet_shop",
+    "moveis_escritorio": "office_furniture", "consoles_games": "consoles_games",
+}
+
+ORDER_STATUSES = (
+    ["delivered", "shipped", "canceled", "unavailable", "invoiced", "processing", "created", "approved"],
+    [0.9702, 0.0111, 0.0063, 0.0061, 0.0032, 0.0030, 0.0005, 0.0006],
+)
+ITEMS_PER_ORDER = ([1, 2, 3, 4, 5, 6], [0.901, 0.076, 0.014, 0.005, 0.002, 0.002])
+PAYMENT_TYPES = (["credit_card", "boleto", "voucher", "debit_card"], [0.739, 0.195, 0.051, 0.015])
+REVIEW_SCORES = ([1, 2, 3, 4, 5], [0.115, 0.032, 0.082, 0.193, 0.578])
+REVIEW_TITLES = ["Recomendo", "Muito bom", "Otimo", "Super recomendo", "Excelente", "Nao recomendo"]
+REVIEW_MESSAGES = [
+    "Produto chegou antes do prazo.", "Muito bom, recomendo.", "Produto de otima qualidade.",
+    "Ainda nao recebi o produto.", "Veio com defeito.", "Entrega rapida e produto conforme anunciado.",
+]
+LEAD_ORIGINS = (
+    ["organic_search", "paid_search", "social", "unknown", "direct_traffic", "email", "referral", "other"],
+    [0.287, 0.199, 0.169, 0.143, 0.062, 0.061, 0.036, 0.043],
+)
+BUSINESS_SEGMENTS = [
+    "home_decor", "health_beauty", "car_accessories", "household_utilities", "construction_tools_house_garden",
+    "audio_video_electronics", "computers", "pet", "food_supplement", "sports_leisure",
+]
+LEAD_TYPES = (["online_medium", "online_big", "industry", "offline", "online_small", "online_beginner"],
+              [0.40, 0.15, 0.15, 0.12, 0.10, 0.08])
+BEHAVIOUR_PROFILES = (["cat", "eagle", "wolf", "shark"], [0.65, 0.16, 0.12, 0.07])
+BUSINESS_TYPES = (["reseller", "manufacturer", "other"], [0.71, 0.28, 0.01])
+
+
+class OlistScale(NamedTuple):
+    customers: int
+    sellers: int
+    products: int
+    orders: int
+    geolocations: int
+    leads: int
+
+
+def default_scale(orders: int, customers: Optional[int] = None) -> OlistScale:
+    """Row counts in the proportions of the public dataset (~99k orders, 3k sellers, 33k products)"""
+    customers = customers if customers is not None else orders
+    return OlistScale(
+        customers=max(customers, 1),
+        sellers=max(orders * 3 // 100, 1),
+        products=max(orders // 3, 1),
+        orders=orders,
+        geolocations=min(max(orders // 5, 100), 90_000),
+        leads=max(orders * 8 // 100, 10),
+    )
+
+
+def _ids(prefix: str, numbers: np.ndarray) -> np.ndarray:
+    """Fixed-width string keys, e.g. ``order-0000000042``"""
+    return np.char.add(prefix, np.char.zfill(numbers.astype(str), 10))
+
+
+def _choice(rng: np.random.Generator, options: Tuple[List[Any], List[float]], size: int) -> np.ndarray:
+    values, weights = options
+    weights = np.asarray(weights, dtype=float)
+    return np.asarray(values)[rng.choice(len(values), size=size, p=weights / weights.sum())]
+
+
+def zipf_weights(rng: np.random.Generator, n: int, exponent: float) -> np.ndarray:
+    """Bounded Zipf probabilities over ``n`` items, randomly assigned so id order carries no rank"""
+    weights = np.arange(1, n + 1, dtype=float) ** -exponent
+    return (weights / weights.sum())[rng.permutation(n)]
+
+
+def _seconds(values: np.ndarray) -> np.ndarray:
+    return values.astype("int64").astype("timedelta64[s]")
+
+
+def _where_nat(mask: np.ndarray, values: np.ndarray) -> np.ndarray:
+    return np.where(mask, values, np.datetime64("NaT"))
+
+
+def _maybe(rng: np.random.Generator, options: Sequence[str], share: float, size: int) -> np.ndarray:
+    """Random strings for ``share`` of the rows and None for the rest"""
+    values = np.asarray(options, dtype=object)[rng.integers(0, len(options), size)]
+    values[rng.random(size) >= share] = None
+    return values
+
+
+class Catalog(NamedTuple):
+    """Entities orders refer to, with the popularity and pricing that shape the orders"""
+    product_weights: np.ndarray
+    product_prices: np.ndarray
+    product_sellers: np.ndarray
+
+
+class OlistGenerator:
+    """
+    Generates column arrays per table. Each table draws from its own random
+    stream, so tables can be produced independently and in chunks.
+    """
+
+    def __init__(self, scale: OlistScale, seed: int = 42):
+        self.scale = scale
+        self.seed = seed
+        self.seller_ids = _ids("seller-", np.arange(scale.sellers))
+        self.product_ids = _ids("product-", np.arange(scale.products))
+        rng = self._rng("geolocation")
+        states = list(STATES)
+        shares = np.array([STATES[state][0] for state in states])
+        self.geo_prefixes = np.char.zfill(
+            np.sort(rng.choice(np.arange(1000, 99_999), size=scale.geolocations, replace=False)).astype(str), 5
+        )
+        self.geo_states = np.asarray(states)[rng.choice(len(states), scale.geolocations, p=shares / shares.sum())]
+        self.geo_cities = np.char.add(
+            np.char.add(np.char.lower(self.geo_states), "-city-"), rng.integers(0, 300, scale.geolocations).astype(str)
+        )
+
+    def _rng(self, table: str, chunk: int = 0) -> np.random.Generator:
+        return np.random.default_rng([self.seed, int.from_bytes(table.encode(), "little") % 2 ** 32, chunk])
+
+    def geolocation(self) -> Dict[str, np.ndarray]:
+        rng = self._rng("geolocation", 1)
+        centroids = np.array([STATES[state][1:] for state in self.geo_states])
+        return {
+            "geolocation_zip_code_prefix": self.geo_prefixes,
+            "geolocation_lat": np.round(centroids[:, 0] + rng.normal(0, 0.8, len(centroids)), 6),
+            "geolocation_lng": np.round(centroids[:, 1] + rng.normal(0, 0.8, len(centroids)), 6),
+            "geolocation_city": self.geo_cities,
+            "geolocation_state": self.geo_states,
+        }
+
+    def _located(self, rng: np.random.Generator, size: int, prefix: str) -> Dict[str, np.ndarray]:
+        # Addresses come from the geolocation pool, which is itself skewed by state
+        places = rng.integers(0, self.scale.geolocations, size)
+        return {
+            f"{prefix}_zip_code_prefix": self.geo_prefixes[places],
+            f"{prefix}_city": self.geo_cities[places],
+            f"{prefix}_state": self.geo_states[places],
+        }
+
+    def customers(self, start: int, stop: int) -> Dict[str, np.ndarray]:
+        rng = self._rng("customers", start // CHUNK_SIZE)
+        return {
+            "customer_id": _ids("customer-", np.arange(start, stop)),
+            "customer_unique_id": _ids("person-", np.arange(start, stop)),
+            **self._located(rng, stop - start, "customer"),
+        }
+
+    def sellers(self) -> Dict[str, np.ndarray]:
+        rng = self._rng("sellers")
+        return {"seller_id": self.seller_ids, **self._located(rng, self.scale.sellers, "seller")}
+
+    def category_translations(self) -> Dict[str, np.ndarray]:
+        return {
+            "product_category_name": np.asarray(list(CATEGORIES)),
+            "product_category_name_english": np.asarray(list(CATEGORIES.values())),
+        }
+
+    def products(self) -> Dict[str, np.ndarray]:
+        rng = self._rng("products")
+        n = self.scale.products
+        categories = np.asarray(list(CATEGORIES))
+        category_weights = np.arange(1, len(categories) + 1, dtype=float) ** -0.8
+        return {
+            "product_id": self.product_ids,
+            "product_category_name": categories[rng.choice(len(categories), n, p=category_weights / category_weights.sum())],
+            "product_name_length": rng.integers(10, 76, n),
+            "product_description_length": np.clip(rng.lognormal(6.4, 0.7, n).astype(int), 4, 3992),
+            "product_photos_qty": np.clip(rng.geometric(0.45, n), 1, 20),
+            "product_weight_g": np.round(np.clip(rng.lognormal(6.6, 1.2, n), 50, 40425), 0),
+            "product_length_cm": np.round(rng.uniform(7, 105, n), 0),
+            "product_height_cm": np.round(rng.uniform(2, 105, n), 0),
+            "product_width_cm": np.round(rng.uniform(6, 118, n), 0),
+        }
+
+    def catalog(self) -> Catalog:
+        rng = self._rng("catalog")
+        return Catalog(
+            product_weights=zipf_weights(rng, self.scale.products, 0.7),
+            product_prices=np.round(np.clip(rng.lognormal(4.4, 0.9, self.scale.products), 0.85, 6735), 2),
+            # Each product is listed by one seller; sellers inherit the skew of their products
+            product_sellers=rng.choice(
+                self.scale.sellers, self.scale.products, p=zipf_weights(rng, self.scale.sellers, 0.8)
+            ),
+        )
+
+    def leads(self) -> Dict[str, Dict[str, np.ndarray]]:
+        rng = self._rng("leads")
+        n = self.scale.leads
+        first_contact = START_DATE + _seconds(rng.integers(0, SPAN_SECONDS, n))
+        qualified = {
+            "mql_id": _ids("mql-", np.arange(n)),
+            "first_contact_date": first_contact,
+            "landing_page_id": np.char.add("landing-", rng.integers(0, 500, n).astype(str)),
+            "origin": _choice(rng, LEAD_ORIGINS, n),
+        }
+        # About one lead in ten closes; each closed deal onboards a distinct seller where possible
+        closed_count = min(max(n // 10, 1), n)
+        closed_leads = np.sort(rng.choice(n, closed_count, replace=False))
+        sellers = rng.choice(self.scale.sellers, closed_count, replace=closed_count > self.scale.sellers)
+        closed = {
+            "mql_id": qualified["mql_id"][closed_leads],
+            "seller_id": self.seller_ids[sellers],
+            "sdr_id": np.char.add("sdr-", rng.integers(0, 32, closed_count).astype(str)),
+            "sr_id": np.char.add("sr-", rng.integers(0, 22, closed_count).astype(str)),
+            "won_date": first_contact[closed_leads] + _seconds(rng.exponential(45 * DAY, closed_count)),
+            "business_segment": np.asarray(BUSINESS_SEGMENTS)[rng.integers(0, len(BUSINESS_SEGMENTS), closed_count)],
+            "lead_type": _choice(rng, LEAD_TYPES, closed_count),
+            "lead_behaviour_profile": _choice(rng, BEHAVIOUR_PROFILES, closed_count),
+            "has_gtin": rng.random(closed_count) < 0.6,
+            "average_stock": _maybe(rng, ["5-20", "20-50", "50-200", "200+", "1-5"], 0.1, closed_count),
+            "business_type": _choice(rng, BUSINESS_TYPES, closed_count),
+            "declared_product_catalog_size": np.round(rng.lognormal(4.0, 1.0, closed_count), 0),
+            "declared_monthly_revenue": np.round(rng.lognormal(10.0, 1.5, closed_count), 2),
+        }
+        return {"leads_qualified": qualified, "leads_closed": closed}
+
+    def orders(self, catalog: Catalog, start: int, stop: int) -> Dict[str, Dict[str, np.ndarray]]:
+        """Orders ``start``..``stop`` with their items, payments and reviews"""
+        rng = self._rng("orders", start // CHUNK_SIZE)
+        n = stop - start
+        order_ids = _ids("order-", np.arange(start, stop))
+
+        # Volume grows over the period, as in the real dataset
+        purchased = START_DATE + _seconds(rng.random(n) ** 0.7 * SPAN_SECONDS)
+        status = _choice(rng, ORDER_STATUSES, n)
+        shipped = np.isin(status, ["delivered", "shipped"])
+        delivered = status == "delivered"
+        approved = _where_nat(status != "created", purchased + _seconds(rng.exponential(0.4 * DAY, n)))
+        carrier = _where_nat(shipped, approved + _seconds(rng.gamma(2.0, 1.4 * DAY, n)))
+        delivered_at = _where_nat(delivered, carrier + _seconds(rng.gamma(3.0, 3.0 * DAY, n)))
+        estimated = (purchased + _seconds(rng.integers(12, 36, n) * DAY)).astype("datetime64[D]").astype("datetime64[s]")
+
+        item_counts = _choice(rng, ITEMS_PER_ORDER, n).astype(np.int64)
+        item_order = np.repeat(np.arange(n), item_counts)
+        first_item = np.cumsum(item_counts) - item_counts
+        products = rng.choice(len(catalog.product_weights), item_order.size, p=catalog.product_weights)
+        prices = catalog.product_prices[products]
+        freight = np.round(prices * rng.uniform(0.05, 0.35, item_order.size) + rng.uniform(5, 15, item_order.size), 2)
+        totals = np.round(np.bincount(item_order, weights=prices + freight, minlength=n), 2)
+
+        items = {
+            "order_id": order_ids[item_order],
+            "order_item_id": np.arange(item_order.size) - first_item[item_order] + 1,
+            "product_id": self.product_ids[products],
+            "seller_id": self.seller_ids[catalog.product_sellers[products]],
+            "shipping_limit_date": purchased[item_order] + _seconds(np.full(item_order.size, 6 * DAY)),
+            "price": prices,
+            "freight_value": freight,
+        }
+
+        # ~3% of orders pay part of the total with a voucher as a second payment
+        split = rng.random(n) < 0.03
+        first_share = np.where(split, np.round(totals * rng.uniform(0.3, 0.9, n), 2), totals)
+        first_type = _choice(rng, PAYMENT_TYPES, n)
+        installments = np.where(first_type == "credit_card", rng.choice([1, 1, 1, 2, 3, 4, 5, 6, 8, 10], n), 1)
+        payments = {
+            "order_id": np.concatenate([order_ids, order_ids[split]]),
+            "payment_sequential": np.concatenate([np.ones(n, dtype=np.int64), np.full(split.sum(), 2)]),
+            "payment_type": np.concatenate([first_type, np.full(split.sum(), "voucher")]),
+            "payment_installments": np.concatenate([installments, np.ones(split.sum(), dtype=np.int64)]),
+            "payment_value": np.concatenate([first_share, np.round(totals[split] - first_share[split], 2)]),
+        }
+
+        reviewed = rng.random(n) < 0.99
+        review_count = int(reviewed.sum())
+        reviewed_at = np.where(delivered, delivered_at, estimated)[reviewed].astype("datetime64[D]") + 1
+        created = reviewed_at.astype("datetime64[s]")
+        reviews = {
+            "review_id": _ids("review-", np.arange(start, stop)[reviewed]),
+            "order_id": order_ids[reviewed],
+            "review_score": _choice(rng, REVIEW_SCORES, review_count),
+            "review_comment_title": _maybe(rng, REVIEW_TITLES, 0.12, review_count),
+            "review_comment_message": _maybe(rng, REVIEW_MESSAGES, 0.41, review_count),
+            "review_creation_date": created,
+            "review_answer_timestamp": created + _seconds(rng.exponential(2 * DAY, review_count)),
+        }
+
+        orders = {
+            "order_id": order_ids,
+            # Uniform over customers, so some customers order repeatedly
+            "customer_id": _ids("customer-", rng.integers(0, self.scale.customers, n)),
+            "order_status": status,
+            "order_purchase_timestamp": purchased,
+            "order_approved_at": approved,
+            "order_delivered_carrier_date": carrier,
+            "order_delivered_customer_date": delivered_at,
+            "order_estimated_delivery_date": estimated,
+            "total_amount": totals,
+            "item_count": item_counts,
+        }
+        return {"orders": orders, "order_items": items, "order_payments": payments, "order_reviews": reviews}
+
+
+def generate(
+    engine: Engine,
+    scale: OlistScale,
+    seed: int = 42,
+    truncate: bool = False,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> List[IngestResult]:
+    """
+    Create the schema and write a synthetic dataset of ``scale``.
+
+    Reference tables are written in one transaction each; customers and
+    orders (with their items, payments and reviews) in one transaction per
+    chunk. Timings include generating the rows. Seller scorecard counters
+    are rebuilt once every order is written.
+    """
+    models.Base.metadata.create_all(bind=engine)
+    tables = {source.table.name: source.table for source in OLIST_SOURCES}
+    if truncate:
+        with engine.begin() as connection:
+            for table in reversed(list(tables.values())):
+                connection.execute(table.delete())
+
+    totals: Dict[str, List[float]] = {name: [0, 0.0] for name in tables}
+
+    def write(make_chunk: Callable[[], Dict[str, Dict[str, np.ndarray]]]) -> None:
+        started = time.perf_counter()
+        chunk = make_chunk()
+        with engine.begin() as connection:
+            if connection.dialect.name == "postgresql":
+                # Generated timestamps are naive UTC
+                connection.exec_driver_sql("SET LOCAL TIME ZONE 'UTC'")
+            for name, columns in chunk.items():
+                totals[name][0] += write_columns(connection, tables[name], columns, batch_size)
+        # A chunk's generation and write time is attributed to its first table
+        totals[next(iter(chunk))][1] += time.perf_counter() - started
+
+    generator = OlistGenerator(scale, seed)
+    for start in range(0, scale.customers, CHUNK_SIZE):
+        write(lambda: {"customers": generator.customers(start, min(start + CHUNK_SIZE, scale.customers))})
+    write(lambda: {"sellers": generator.sellers()})
+    write(lambda: {"products": generator.products()})
+    write(lambda: {"product_category_name_translation": generator.category_translations()})
+    write(lambda: {"geolocation": generator.geolocation()})
+    write(generator.leads)
+
+    catalog = generator.catalog()
+    for start in range(0, scale.orders, CHUNK_SIZE):
+        write(lambda: generator.orders(catalog, start, min(start + CHUNK_SIZE, scale.orders)))
+
+    with Session(engine) as db:
+        rebuild_seller_stats(db)
+    return [IngestResult(name, int(rows), seconds) for name, (rows, seconds) in totals.items()]
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Generate a synthetic Olist-shaped dataset")
+    parser.add_argument("--orders", type=int, default=100_000)
+    parser.add_argument("--customers", type=int, help="Defaults to one customer per order")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--database-url", help="Defaults to DATABASE_URL from settings")
+    parser.add_argument("--truncate", action="store_true", help="Delete existing rows before generating")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    args = parser.parse_args(argv)
+
+    if args.database_url:
+        engine = create_engine(args.database_url)
+    else:
+        from app.db.database import engine
+
+    scale = default_scale(args.orders, args.customers)
+    total_rows = 0
+    total_seconds = 0.0
+    for result in generate(engine, scale, seed=args.seed, truncate=args.truncate, batch_size=args.batch_size):
+        total_rows += result.rows
+        total_seconds += result.seconds
+        print(f"{result.table}: {result.rows:,} rows in {result.seconds:.2f}s ({result.rows_per_second:,.0f} rows/s)")
+    print(f"Generated {total_rows:,} rows in {total_seconds:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
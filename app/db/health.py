@@ -0,0 +1,143 @@
+"""
+Readiness probes
+
+The database probe runs ``SELECT 1`` in a worker thread on a connection of
+its own, outside the application's pool, so an exhausted pool cannot hold it
+up and it never takes a connection requests need. The driver's connect and
+statement timeouts bound how long that thread can run; the request gives up
+after the same timeout. While one probe thread is still running no other is
+started, so a stalled database cannot pile up probe threads: concurrent
+readiness checks share the running probe's result instead.
+"""
+import asyncio
+import math
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import NullPool
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.db import database
+from app.schemas import health as schemas_health
+
+_probe_engines: Dict[str, Engine] = {}
+_probe_running = threading.Lock()
+_pending_probe: Optional["asyncio.Future[float]"] = None
+# time.monotonic() after which the pending probe has overrun its timeout
+_pending_deadline = 0.0
+
+
+def probe_connect_args(db_engine: Engine, timeout: float) -> Dict[str, Any]:
+    """Driver arguments that make connecting and running a statement give up after ``timeout`` seconds"""
+    backend = db_engine.url.get_backend_name()
+    if backend == "postgresql" and db_engine.url.get_driver_name() == "psycopg2":
+        return {
+            "connect_timeout": max(math.ceil(timeout), 1),
+            "options": f"-c statement_timeout={max(int(timeout * 1000), 1)}",
+        }
+    if backend == "sqlite":
+        # How long to wait on a locked database file
+        return {"timeout": timeout}
+    return {}
+
+
+def probe_engine(db_engine: Engine, timeout: float) -> Engine:
+    """Unpooled engine for ``db_engine``'s database with driver-level timeouts"""
+    key = f"{db_engine.url.render_as_string(hide_password=False)}|{timeout}"
+    engine = _probe_engines.get(key)
+    if engine is None:
+        engine = _probe_engines[key] = create_engine(
+            db_engine.url, poolclass=NullPool, connect_args=probe_connect_args(db_engine, timeout)
+        )
+    return engine
+
+
+def _select_one(db_engine: Engine) -> float:
+    started = time.perf_counter()
+    with db_engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+    return time.perf_counter() - started
+
+
+def _probe_once(db_engine: Engine) -> float:
+    try:
+        return _select_one(db_engine)
+    finally:
+        _probe_running.release()
+
+
+def _joinable(probe: Optional["asyncio.Future[float]"]) -> bool:
+    """Whether this caller can wait for ``probe`` rather than report it as stuck"""
+    return (
+        probe is not None
+        and probe.get_loop() is asyncio.get_running_loop()
+        and time.monotonic() < _pending_deadline
+    )
+
+
+async def probe_database(db_engine: Engine, timeout: float) -> schemas_health.DatabaseProbe:
+    """
+    Round-trip latency of a trivial query, bounded by ``timeout`` seconds.
+    Callers arriving while a probe runs wait for that probe's result.
+    """
+    global _pending_probe, _pending_deadline
+    if _probe_running.acquire(blocking=False):
+        # Shielded so a timeout cannot cancel the task before its thread starts and releases the lock
+        _pending_probe = asyncio.ensure_future(run_in_threadpool(_probe_once, probe_engine(db_engine, timeout)))
+        _pending_deadline = time.monotonic() + timeout
+        # Retrieve the outcome of a probe that finishes after its request gave up
+        _pending_probe.add_done_callback(lambda task: task.cancelled() or task.exception())
+    elif not _joinable(_pending_probe):
+        return schemas_health.DatabaseProbe(reachable=False, error="Previous probe has not finished")
+    try:
+        seconds = await asyncio.wait_for(asyncio.shield(_pending_probe), timeout)
+    except asyncio.TimeoutError:
+        return schemas_health.DatabaseProbe(reachable=False, error=f"Timed out after {timeout:g}s")
+    except Exception as exc:
+        return schemas_health.DatabaseProbe(reachable=False, error=f"{type(exc).__name__}: {exc}")
+    return schemas_health.DatabaseProbe(reachable=True, latency_ms=round(seconds * 1000, 3))
+
+
+def pool_saturation() -> List[schemas_health.PoolSaturation]:
+    engines = [("sync", database.engine)]
+    if database.async_engine is not None:
+        engines.append(("async", database.async_engine.sync_engine))
+    return [
+        schemas_health.PoolSaturation(
+            pool=name,
+            checked_out=database.get_pool_status(engine)["checked_out"],
+            capacity=database.get_pool_capacity(engine),
+            utilization=database.get_pool_utilization(engine),
+        )
+        for name, engine in engines
+    ]
+
+
+async def check_readiness() -> schemas_health.ReadinessReport:
+    """
+    Ready when the database answers within READINESS_DB_TIMEOUT_SECONDS and
+    no pool is above READINESS_MAX_POOL_UTILIZATION
+    """
+    pools = pool_saturation()
+    probe = await probe_database(database.engine, settings.READINESS_DB_TIMEOUT_SECONDS)
+    max_utilization = max((pool.utilization or 0.0 for pool in pools), default=0.0)
+
+    reasons = []
+    if not probe.reachable:
+        reasons.append(f"Database unreachable: {probe.error}")
+    if max_utilization >= settings.READINESS_MAX_POOL_UTILIZATION:
+        reasons.append(
+            f"Connection pool utilization {max_utilization:.0%} is at or above "
+            f"{settings.READINESS_MAX_POOL_UTILIZATION:.0%}"
+        )
+    return schemas_health.ReadinessReport(
+        status="not_ready" if reasons else "ready",
+        database=probe,
+        pools=pools,
+        max_pool_utilization=max_utilization,
+        reasons=reasons,
+    )
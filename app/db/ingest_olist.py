@@ -0,0 +1,248 @@
+"""
+Bulk loader for the Olist e-commerce CSV dataset
+
+Streams each CSV into its table with PostgreSQL ``COPY FROM STDIN`` and falls
+back to batched ``executemany`` inserts on other databases (e.g. SQLite).
+
+Usage:
+    python -m app.db.ingest_olist path/to/olist_csvs [--truncate] [--database-url URL]
+"""
+import argparse
+import csv
+import os
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+from sqlalchemy import Boolean, DateTime, Float, Integer, Table, create_engine
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
+
+from app.crud.order import reconcile_order_totals
+from app.crud.seller import rebuild_seller_stats
+from app.db import models
+from app.db.bulk import DEFAULT_BATCH_SIZE, batches, copy_rows, supports_copy
+
+
+class OlistSource(NamedTuple):
+    filename: str
+    table: Table
+    # CSV header -> model column, for headers that differ from the model
+    renames: Dict[str, str] = {}
+
+
+# Listed in foreign key order: parents are loaded before the tables that reference them
+OLIST_SOURCES: List[OlistSource] = [
+    OlistSource("olist_customers_dataset.csv", models.Customer.__table__),
+    OlistSource("olist_sellers_dataset.csv", models.Seller.__table__),
+    OlistSource(
+        "olist_products_dataset.csv",
+        models.Product.__table__,
+        # The published dataset misspells "length" in these headers
+        {
+            "product_name_lenght": "product_name_length",
+            "product_description_lenght": "product_description_length",
+        },
+    ),
+    OlistSource("product_category_name_translation.csv", models.ProductCategoryNameTranslation.__table__),
+    OlistSource("olist_geolocation_dataset.csv", models.Geolocation.__table__),
+    OlistSource("olist_marketing_qualified_leads_dataset.csv", models.LeadsQualified.__table__),
+    OlistSource("olist_closed_deals_dataset.csv", models.LeadsClosed.__table__),
+    OlistSource("olist_orders_dataset.csv", models.Order.__table__),
+    OlistSource("olist_order_items_dataset.csv", models.OrderItem.__table__),
+    OlistSource("olist_order_payments_dataset.csv", models.OrderPayment.__table__),
+    OlistSource("olist_order_reviews_dataset.csv", models.OrderReview.__table__),
+]
+
+
+class IngestResult(NamedTuple):
+    table: str
+    rows: int
+    seconds: float
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds > 0 else float(self.rows)
+
+
+def read_rows(
+    path: str, table: Table, renames: Dict[str, str]
+) -> Tuple[List[str], Iterator[Tuple[Optional[str], ...]]]:
+    """
+    Open a CSV and return the target column names and a row iterator.
+
+    Headers without a matching column (e.g. ``has_company``) are dropped and
+    empty fields become ``None``.
+    """
+    with open(path, newline="", encoding="utf-8") as handle:
+        header = [renames.get(name, name) for name in next(csv.reader(handle))]
+    indexes = [i for i, name in enumerate(header) if name in table.c]
+    columns = [header[i] for i in indexes]
+
+    def rows() -> Iterator[Tuple[Optional[str], ...]]:
+        # Opened here so the file is only held open while the rows are consumed
+        with open(path, newline="", encoding="utf-8") as handle:
+            reader = csv.reader(handle)
+            next(reader)
+            for record in reader:
+                yield tuple(record[i] or None for i in indexes)
+
+    return columns, rows()
+
+
+def dedupe_primary_key(
+    rows: Iterable[Tuple[Any, ...]], columns: Sequence[str], table: Table
+) -> Iterator[Tuple[Any, ...]]:
+    """Keep the first row for each primary key; the raw files contain repeats (e.g. review_id)"""
+    key_indexes = [columns.index(column.name) for column in table.primary_key.columns]
+    seen = set()
+    for row in rows:
+        key = tuple(row[i] for i in key_indexes)
+        if key in seen:
+            continue
+        seen.add(key)
+        yield row
+
+
+def aggregate_geolocation(
+    rows: Iterable[Tuple[Any, ...]], columns: Sequence[str]
+) -> Iterator[Tuple[Any, ...]]:
+    """
+    Collapse the ~1M raw geolocation rows to one row per zip code prefix.
+
+    Coordinates are averaged; city and state are taken from the first row.
+    """
+    prefix_i = columns.index("geolocation_zip_code_prefix")
+    lat_i = columns.index("geolocation_lat")
+    lng_i = columns.index("geolocation_lng")
+
+    prefixes: Dict[str, List[Any]] = {}
+    for row in rows:
+        entry = prefixes.get(row[prefix_i])
+        if entry is None:
+            entry = prefixes[row[prefix_i]] = [row, 0.0, 0.0, 0]
+        if row[lat_i] is not None and row[lng_i] is not None:
+            entry[1] += float(row[lat_i])
+            entry[2] += float(row[lng_i])
+            entry[3] += 1
+
+    for first_row, lat_sum, lng_sum, count in prefixes.values():
+        row = list(first_row)
+        if count:
+            row[lat_i] = repr(lat_sum / count)
+            row[lng_i] = repr(lng_sum / count)
+        yield tuple(row)
+
+
+def _parse_bool(value: str) -> bool:
+    return value.strip().lower() in ("true", "t", "1", "yes")
+
+
+def _converter(column) -> Callable[[str], Any]:
+    if isinstance(column.type, DateTime):
+        return datetime.fromisoformat
+    if isinstance(column.type, Boolean):
+        return _parse_bool
+    if isinstance(column.type, Integer):
+        return lambda value: int(float(value))
+    if isinstance(column.type, Float):
+        return float
+    return str
+
+
+def insert_rows(
+    connection: Connection,
+    table: Table,
+    columns: Sequence[str],
+    rows: Iterable[Tuple[Any, ...]],
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> int:
+    """Portable fallback: batched executemany inserts with values converted to column types"""
+    converters = [_converter(table.c[name]) for name in columns]
+    insert = table.insert()
+    count = 0
+    for batch in batches(rows, batch_size):
+        connection.execute(
+            insert,
+            [
+                {
+                    name: None if value is None else convert(value)
+                    for name, convert, value in zip(columns, converters, row)
+                }
+                for row in batch
+            ],
+        )
+        count += len(batch)
+    return count
+
+
+def ingest(
+    engine: Engine,
+    data_dir: str,
+    truncate: bool = False,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> List[IngestResult]:
+    """
+    Load every Olist CSV found in ``data_dir``, one transaction per table.
+
+    Missing files are skipped so partial datasets can be loaded. Stored order
+    totals are reconciled after order items are loaded, and the seller
+    scorecard counters rebuilt after any order data is loaded.
+    """
+    models.Base.metadata.create_all(bind=engine)
+    load = copy_rows if supports_copy(engine) else insert_rows
+    sources = [source for source in OLIST_SOURCES if os.path.exists(os.path.join(data_dir, source.filename))]
+
+    if truncate:
+        with engine.begin() as connection:
+            for source in reversed(sources):
+                connection.execute(source.table.delete())
+
+    results = []
+    for source in sources:
+        started = time.perf_counter()
+        columns, rows = read_rows(os.path.join(data_dir, source.filename), source.table, source.renames)
+        if source.table.name == models.Geolocation.__tablename__:
+            rows = aggregate_geolocation(rows, columns)
+        else:
+            rows = dedupe_primary_key(rows, columns, source.table)
+
+        with engine.begin() as connection:
+            count = load(connection, source.table, columns, rows, batch_size)
+        results.append(IngestResult(source.table.name, count, time.perf_counter() - started))
+
+    if any(source.table is models.OrderItem.__table__ for source in sources):
+        # COPY bypasses the ORM, so the denormalized order totals are rebuilt in bulk
+        with Session(engine) as db:
+            reconcile_order_totals(db)
+    stats_tables = {models.Order.__table__, models.OrderItem.__table__, models.OrderReview.__table__}
+    if any(source.table in stats_tables for source in sources):
+        with Session(engine) as db:
+            rebuild_seller_stats(db)
+    return results
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Bulk load the Olist CSV dataset")
+    parser.add_argument("data_dir", help="Directory containing the Olist CSV files")
+    parser.add_argument("--database-url", help="Defaults to DATABASE_URL from settings")
+    parser.add_argument("--truncate", action="store_true", help="Delete existing rows before loading")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    args = parser.parse_args(argv)
+
+    if args.database_url:
+        engine = create_engine(args.database_url)
+    else:
+        from app.db.database import engine
+
+    total_rows = 0
+    total_seconds = 0.0
+    for result in ingest(engine, args.data_dir, truncate=args.truncate, batch_size=args.batch_size):
+        total_rows += result.rows
+        total_seconds += result.seconds
+        print(f"{result.table}: {result.rows:,} rows in {result.seconds:.2f}s ({result.rows_per_second:,.0f} rows/s)")
+    print(f"Loaded {total_rows:,} rows in {total_seconds:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
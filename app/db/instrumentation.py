@@ -0,0 +1,69 @@
+"""
+Per-request SQL statement accounting
+
+Listeners on the ``Engine`` class time every statement executed by any
+engine (sync, the async engine's sync core, and test engines alike) and add
+it to the ``QueryStats`` of the request being served, found through a
+context variable. Statements outside a tracked request are ignored.
+"""
+import time
+from contextvars import ContextVar, Token
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+class QueryStats:
+    """Statement count, cumulative database time and the slowest statement of one request"""
+
+    def __init__(self):
+        self.count = 0
+        self.total_seconds = 0.0
+        self.slowest_seconds = 0.0
+        self.slowest_statement: Optional[str] = None
+
+    def record(self, statement: str, seconds: float) -> None:
+        self.count += 1
+        self.total_seconds += seconds
+        if seconds >= self.slowest_seconds:
+            self.slowest_seconds = seconds
+            self.slowest_statement = statement
+
+    def server_timing(self) -> str:
+        """Server-Timing header value, durations in milliseconds"""
+        return (
+            f'db;dur={self.total_seconds * 1000:.2f};desc="queries={self.count}", '
+            f"db-slowest;dur={self.slowest_seconds * 1000:.2f}"
+        )
+
+
+_current_stats: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+def start_tracking() -> Token:
+    """Begin collecting statements for the current request; pass the token to stop_tracking"""
+    return _current_stats.set(QueryStats())
+
+
+def current_stats() -> Optional[QueryStats]:
+    return _current_stats.get()
+
+
+def stop_tracking(token: Token) -> None:
+    _current_stats.reset(token)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    # Statements on one connection never overlap, so a single slot suffices;
+    # a statement that fails simply has its slot overwritten by the next one
+    conn.info["query_started_at"] = time.perf_counter()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started_at = conn.info.pop("query_started_at", None)
+    stats = _current_stats.get()
+    if stats is not None and started_at is not None:
+        stats.record(statement, time.perf_counter() - started_at)
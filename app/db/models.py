@@ -1,9 +1,19 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Text, Boolean
+from datetime import datetime, timezone
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Text, Boolean, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.db.database import Base
 
 
+def utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def updated_at_column() -> Column:
+    """Last-change timestamp used for ETag / Last-Modified validators"""
+    return Column(DateTime(timezone=True), default=utcnow, onupdate=utcnow, server_default=func.now())
+
+
 class Product(Base):
     __tablename__ = "products"
     
@@ -16,22 +26,36 @@ class Product(Base):
     product_length_cm = Column(Float)
     product_height_cm = Column(Float)
     product_width_cm = Column(Float)
+    updated_at = updated_at_column()
     
     # Relationships
     order_items = relationship("OrderItem", back_populates="product")
+    
+    __table_args__ = (
+        # Category listings page by product_id
+        Index("ix_products_category_product_id", "product_category_name", "product_id"),
+    )
 
 
 class Customer(Base):
     __tablename__ = "customers"
     
     customer_id = Column(String, primary_key=True, index=True)
-    customer_unique_id = Column(String, unique=True, index=True)
+    # Not unique: Olist issues a new customer_id for each order of the same person
+    customer_unique_id = Column(String, index=True)
     customer_zip_code_prefix = Column(String)
     customer_city = Column(String)
     customer_state = Column(String)
+    updated_at = updated_at_column()
     
     # Relationships
     orders = relationship("Order", back_populates="customer")
+    
+    __table_args__ = (
+        # City and state listings page by customer_id
+        Index("ix_customers_city_customer_id", "customer_city", "customer_id"),
+        Index("ix_customers_state_customer_id", "customer_state", "customer_id"),
+    )
 
 
 class Seller(Base):
@@ -52,17 +76,33 @@ class Order(Base):
     order_id = Column(String, primary_key=True, index=True)
     customer_id = Column(String, ForeignKey("customers.customer_id"))
     order_status = Column(String)
-    order_purchase_timestamp = Column(DateTime(timezone=True), server_default=func.now())
+    # Set client-side as well so the stored value round-trips exactly through pagination cursors;
+    # NOT NULL because keyset pagination cannot seek past a NULL
+    order_purchase_timestamp = Column(
+        DateTime(timezone=True), nullable=False, default=utcnow, server_default=func.now()
+    )
     order_approved_at = Column(DateTime(timezone=True))
     order_delivered_carrier_date = Column(DateTime(timezone=True))
     order_delivered_customer_date = Column(DateTime(timezone=True))
     order_estimated_delivery_date = Column(DateTime(timezone=True))
+    # Denormalized from order_items so reads need no aggregation
+    total_amount = Column(Float, nullable=False, default=0.0, server_default="0")
+    item_count = Column(Integer, nullable=False, default=0, server_default="0")
+    updated_at = updated_at_column()
     
     # Relationships
     customer = relationship("Customer", back_populates="orders")
     order_items = relationship("OrderItem", back_populates="order")
     order_payments = relationship("OrderPayment", back_populates="order")
     order_reviews = relationship("OrderReview", back_populates="order")
+    
+    __table_args__ = (
+        # Keyset pagination seeks on (order_purchase_timestamp, order_id)
+        Index("ix_orders_purchase_timestamp_order_id", "order_purchase_timestamp", "order_id"),
+        # Customer order history and status listings filter first, then page in the same order
+        Index("ix_orders_customer_id_purchase_timestamp", "customer_id", "order_purchase_timestamp", "order_id"),
+        Index("ix_orders_status_purchase_timestamp", "order_status", "order_purchase_timestamp", "order_id"),
+    )
 
 
 class OrderItem(Base):
@@ -70,8 +110,8 @@ class OrderItem(Base):
     
     order_id = Column(String, ForeignKey("orders.order_id"), primary_key=True)
     order_item_id = Column(Integer, primary_key=True)
-    product_id = Column(String, ForeignKey("products.product_id"))
-    seller_id = Column(String, ForeignKey("sellers.seller_id"))
+    product_id = Column(String, ForeignKey("products.product_id"), index=True)
+    seller_id = Column(String, ForeignKey("sellers.seller_id"), index=True)
     shipping_limit_date = Column(DateTime(timezone=True))
     price = Column(Float)
     freight_value = Column(Float)
@@ -99,7 +139,7 @@ class OrderReview(Base):
     __tablename__ = "order_reviews"
     
     review_id = Column(String, primary_key=True, index=True)
-    order_id = Column(String, ForeignKey("orders.order_id"))
+    order_id = Column(String, ForeignKey("orders.order_id"), index=True)
     review_score = Column(Integer)
     review_comment_title = Column(String)
     review_comment_message = Column(Text)
@@ -152,3 +192,82 @@ class LeadsClosed(Base):
     business_type = Column(String)
     declared_product_catalog_size = Column(Float)
     declared_monthly_revenue = Column(Float)
+
+
+class SalesRollup(Base):
+    """
+    Order item sales pre-aggregated per time bucket and per grouping of
+    product category, customer state and seller; refreshed from the fact
+    tables by app.crud.analytics and the only table the analytics endpoints read.
+    Dimensions a grouping leaves out are NULL.
+    """
+    __tablename__ = "sales_rollups"
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    granularity = Column(String, nullable=False)  # "hour" or "day"
+    dimensions = Column(String, nullable=False)  # dimensions kept, e.g. "category+seller" or "total"
+    bucket = Column(DateTime(timezone=True), nullable=False)
+    product_category_name = Column(String)
+    customer_state = Column(String)
+    seller_id = Column(String)
+    order_count = Column(Integer, nullable=False)
+    item_count = Column(Integer, nullable=False)
+    revenue = Column(Float, nullable=False)
+    freight_value = Column(Float, nullable=False)
+    
+    __table_args__ = (
+        # Every analytics query filters on granularity, one grouping and a
+        # bucket range; incremental refreshes delete from a bucket onwards
+        Index("ix_sales_rollups_granularity_dimensions_bucket", "granularity", "dimensions", "bucket"),
+    )
+
+
+class RollupState(Base):
+    """High-water mark of each rollup: the latest order_purchase_timestamp it includes"""
+    __tablename__ = "rollup_state"
+    
+    name = Column(String, primary_key=True)
+    high_water_mark = Column(DateTime(timezone=True))
+    refreshed_at = Column(DateTime(timezone=True))
+
+
+class SellerStats(Base):
+    """
+    Running per-seller totals behind the seller scorecard, adjusted by
+    app.crud.seller as orders, reviews and status updates are written
+    """
+    __tablename__ = "seller_stats"
+    
+    seller_id = Column(String, primary_key=True)
+    order_count = Column(Integer, nullable=False, default=0, server_default="0")
+    item_count = Column(Integer, nullable=False, default=0, server_default="0")
+    gmv = Column(Float, nullable=False, default=0.0, server_default="0")
+    review_count = Column(Integer, nullable=False, default=0, server_default="0")
+    review_score_sum = Column(Integer, nullable=False, default=0, server_default="0")
+    delivered_count = Column(Integer, nullable=False, default=0, server_default="0")
+    on_time_count = Column(Integer, nullable=False, default=0, server_default="0")
+    dispatch_count = Column(Integer, nullable=False, default=0, server_default="0")
+    dispatch_seconds_sum = Column(Float, nullable=False, default=0.0, server_default="0")
+    updated_at = updated_at_column()
+
+
+class CustomerSegment(Base):
+    """
+    RFM scores and segment per person (customer_unique_id, since Olist issues
+    a new customer_id per order); rewritten in bulk by app.db.segment_customers
+    """
+    __tablename__ = "customer_segments"
+    
+    customer_unique_id = Column(String, primary_key=True)
+    recency_days = Column(Float, nullable=False)
+    frequency = Column(Integer, nullable=False)
+    monetary = Column(Float, nullable=False)
+    recency_score = Column(Integer, nullable=False)
+    frequency_score = Column(Integer, nullable=False)
+    monetary_score = Column(Integer, nullable=False)
+    segment = Column(String, nullable=False)
+    
+    __table_args__ = (
+        # Segment listings seek on (segment, customer_unique_id)
+        Index("ix_customer_segments_segment_customer_unique_id", "segment", "customer_unique_id"),
+    )
@@ -0,0 +1,21 @@
+"""
+Recompute stored order totals that have drifted from their order items
+
+Usage:
+    python -m app.db.reconcile_order_totals
+"""
+from app.crud.order import reconcile_order_totals
+from app.db.database import SessionLocal
+
+
+def main() -> None:
+    db = SessionLocal()
+    try:
+        corrected = reconcile_order_totals(db)
+    finally:
+        db.close()
+    print(f"Reconciled totals for {corrected:,} orders")
+
+
+if __name__ == "__main__":
+    main()
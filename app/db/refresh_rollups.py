@@ -0,0 +1,39 @@
+"""
+Refresh the sales analytics rollups from the order fact tables
+
+Incremental by default: only hours and days from the stored high-water mark
+onwards are recomputed. Schedule it (e.g. every few minutes) to keep the
+/analytics endpoints current.
+
+Usage:
+    python -m app.db.refresh_rollups [--full]
+"""
+import argparse
+import time
+from typing import Optional, Sequence
+
+from app.crud.analytics import refresh_sales_rollups
+from app.db.database import SessionLocal
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Refresh the sales analytics rollups")
+    parser.add_argument(
+        "--full", action="store_true",
+        help="Rebuild every bucket, e.g. after orders were back-dated, cancelled or edited"
+    )
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    db = SessionLocal()
+    try:
+        result = refresh_sales_rollups(db, full=args.full)
+    finally:
+        db.close()
+    since = result.since.isoformat() if result.since else "the beginning"
+    print(f"Refreshed {result.hourly_rows:,} hourly and {result.daily_rows:,} daily rows from {since} "
+          f"up to {result.high_water_mark} in {time.perf_counter() - started:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
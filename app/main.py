@@ -1,13 +1,59 @@
-from fastapi import FastAPI
+import logging
+import time
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, Response
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+from app.core import metrics
 from app.core.config import settings
+from app.core.geo import geo_index
+from app.core.recommendations import recommendations
+from app.core.pagination import InvalidCursorError, NEXT_CURSOR_HEADER
 from app.api.v1.api import api_router
+from app.crud import geo as crud_geo
+from app.crud import recommendation as crud_recommendation
+from app.db import database, health, instrumentation
+from app.schemas import health as schemas_health
+
+logger = logging.getLogger(__name__)
+
+
+def warm_geo_index() -> None:
+    """Build the spatial index before the first request instead of during it"""
+    try:
+        with database.SessionLocal() as db:
+            geo_index.get(lambda: crud_geo.load_geo_index(db))
+    except Exception:
+        # Not fatal: the index is built on first use instead
+        logger.warning("Could not build the geospatial index at startup", exc_info=True)
+
+
+def warm_recommendations() -> None:
+    """Count co-purchases before the first request instead of during it"""
+    try:
+        with database.SessionLocal() as db:
+            recommendations.get(lambda since: crud_recommendation.load_baskets(db, since))
+    except Exception:
+        logger.warning("Could not build the recommendation index at startup", exc_info=True)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if settings.GEO_INDEX_WARM_ON_STARTUP:
+        await run_in_threadpool(warm_geo_index)
+    if settings.RECOMMENDATIONS_WARM_ON_STARTUP:
+        await run_in_threadpool(warm_recommendations)
+    yield
+
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
     version=settings.VERSION,
     description="E-commerce REST API for managing products, customers, and orders",
-    openapi_url=f"{settings.API_V1_STR}/openapi.json"
+    openapi_url=f"{settings.API_V1_STR}/openapi.json",
+    lifespan=lifespan,
 )
 
 # Set up CORS
@@ -17,11 +63,79 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, "ETag", "Server-Timing"],
 )
 
+
+@app.middleware("http")
+async def query_instrumentation(request: Request, call_next):
+    """
+    Count and time the SQL statements of each request and report them in a
+    Server-Timing header and a log line
+    """
+    if not settings.QUERY_INSTRUMENTATION:
+        return await call_next(request)
+    
+    token = instrumentation.start_tracking()
+    stats = instrumentation.current_stats()
+    started = time.perf_counter()
+    try:
+        response = await call_next(request)
+    finally:
+        instrumentation.stop_tracking(token)
+    elapsed = time.perf_counter() - started
+    
+    response.headers.append("Server-Timing", f"{stats.server_timing()}, app;dur={elapsed * 1000:.2f}")
+    route = request.scope.get("route")
+    path = route.path if route is not None else request.url.path
+    logger.info(
+        "%s %s %s %.1fms queries=%d db=%.1fms slowest=%.1fms",
+        request.method, path, response.status_code, elapsed * 1000,
+        stats.count, stats.total_seconds * 1000, stats.slowest_seconds * 1000,
+    )
+    threshold = settings.QUERY_COUNT_WARNING_THRESHOLD
+    if threshold is not None and stats.count > threshold:
+        logger.warning(
+            "%s %s ran %d SQL statements (threshold %d); slowest %.1fms: %s",
+            request.method, path, stats.count, threshold, stats.slowest_seconds * 1000,
+            stats.slowest_statement,
+        )
+    return response
+
+
+@app.middleware("http")
+async def prometheus_metrics(request: Request, call_next):
+    """Record request latency and in-flight requests per route template"""
+    if not settings.METRICS_ENABLED:
+        return await call_next(request)
+    
+    route = metrics.route_template(app.router.routes, request.scope)
+    in_progress = metrics.REQUESTS_IN_PROGRESS.labels(request.method, route)
+    in_progress.inc()
+    started = time.perf_counter()
+    status_code = status.HTTP_500_INTERNAL_SERVER_ERROR
+    try:
+        response = await call_next(request)
+        status_code = response.status_code
+        return response
+    finally:
+        in_progress.dec()
+        metrics.REQUEST_LATENCY.labels(request.method, route, str(status_code)).observe(
+            time.perf_counter() - started
+        )
+        # Workers that never serve a scrape still publish their pool usage
+        metrics.refresh_gauges()
+
+
 # Include API router
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
+
+@app.exception_handler(InvalidCursorError)
+async def invalid_cursor_handler(request: Request, exc: InvalidCursorError):
+    return JSONResponse(status_code=status.HTTP_400_BAD_REQUEST, content={"detail": str(exc)})
+
+
 @app.get("/")
 async def root():
     return {"message": "E-commerce API is running", "version": settings.VERSION}
@@ -29,3 +143,29 @@ async def root():
 @app.get("/health")
 async def health_check():
     return {"status": "healthy"}
+
+
+@app.get(
+    "/health/ready",
+    response_model=schemas_health.ReadinessReport,
+    responses={503: {"description": "Database unreachable or connection pool saturated"}},
+)
+async def readiness_check():
+    """
+    Readiness check for load balancers
+
+    Probes the database with a bounded timeout and reports connection pool
+    saturation; answers 503 when either check fails so traffic is shed
+    before requests start queueing for connections.
+    """
+    report = await health.check_readiness()
+    if report.status != "ready":
+        return JSONResponse(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, content=report.model_dump())
+    return report
+
+
+@app.get("/metrics", include_in_schema=False)
+def prometheus_scrape():
+    """Prometheus exposition of the metrics of every worker process"""
+    metrics.refresh_gauges()
+    return Response(generate_latest(metrics.scrape_registry()), media_type=CONTENT_TYPE_LATEST)
@@ -0,0 +1,34 @@
+from pydantic import BaseModel
+from typing import Optional
+
+
+class PoolStatus(BaseModel):
+    pool_class: str
+    size: Optional[int] = None
+    checked_in: Optional[int] = None
+    checked_out: Optional[int] = None
+    overflow: Optional[int] = None
+    status: str
+
+
+class PoolSettings(BaseModel):
+    pool_size: int
+    max_overflow: int
+    pool_timeout: int
+    pool_recycle: int
+    pool_pre_ping: bool
+    statement_timeout_ms: Optional[int] = None
+
+
+class PoolReport(BaseModel):
+    settings: PoolSettings
+    sync_pool: PoolStatus
+    async_pool: Optional[PoolStatus] = None
+
+
+class CacheStats(BaseModel):
+    backend: str
+    hits: int
+    misses: int
+    hit_ratio: float
+    size: Optional[int] = None
@@ -0,0 +1,47 @@
+from enum import Enum
+from pydantic import BaseModel
+from typing import Optional
+from datetime import datetime
+
+
+class Granularity(str, Enum):
+    hour = "hour"
+    day = "day"
+
+
+class Dimension(str, Enum):
+    category = "category"
+    state = "state"
+    seller = "seller"
+
+
+class SalesMeasures(BaseModel):
+    # Distinct orders with at least one matching item; in a breakdown an order
+    # spanning several categories or sellers is counted once under each
+    order_count: int
+    item_count: int
+    revenue: float
+    freight_value: float
+
+
+class SalesPoint(SalesMeasures):
+    bucket: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class SalesBreakdown(SalesMeasures):
+    key: Optional[str] = None
+
+    class Config:
+        from_attributes = True
+
+
+class RollupStatus(BaseModel):
+    name: str
+    high_water_mark: Optional[datetime] = None
+    refreshed_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
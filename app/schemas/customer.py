@@ -1,5 +1,6 @@
 from pydantic import BaseModel
 from typing import Optional
+from datetime import datetime
 
 
 class CustomerBase(BaseModel):
@@ -21,6 +22,7 @@ class CustomerUpdate(BaseModel):
 
 class CustomerInDBBase(CustomerBase):
     customer_id: str
+    updated_at: Optional[datetime] = None
     
     class Config:
         from_attributes = True
@@ -0,0 +1,20 @@
+from pydantic import BaseModel
+from typing import Optional
+
+
+class NearestSeller(BaseModel):
+    seller_id: str
+    seller_zip_code_prefix: str
+    seller_city: Optional[str] = None
+    seller_state: Optional[str] = None
+    distance_km: float
+
+
+class OrderItemDistance(BaseModel):
+    order_id: str
+    order_item_id: int
+    seller_id: str
+    customer_id: str
+    seller_zip_code_prefix: Optional[str] = None
+    customer_zip_code_prefix: Optional[str] = None
+    distance_km: float
@@ -0,0 +1,23 @@
+from pydantic import BaseModel
+from typing import List, Optional
+
+
+class DatabaseProbe(BaseModel):
+    reachable: bool
+    latency_ms: Optional[float] = None
+    error: Optional[str] = None
+
+
+class PoolSaturation(BaseModel):
+    pool: str
+    checked_out: Optional[int] = None
+    capacity: Optional[int] = None
+    utilization: Optional[float] = None
+
+
+class ReadinessReport(BaseModel):
+    status: str
+    database: DatabaseProbe
+    pools: List[PoolSaturation]
+    max_pool_utilization: float
+    reasons: List[str] = []
@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import Optional, List
 from datetime import datetime
 
@@ -32,8 +32,36 @@ class OrderCreate(OrderBase):
     items: List[OrderItemCreate]
 
 
+# Upper bound on orders accepted by one POST /orders/batch request
+MAX_ORDER_BATCH_SIZE = 10000
+
+
+class OrderBatchCreate(BaseModel):
+    orders: List[OrderCreate] = Field(..., min_length=1, max_length=MAX_ORDER_BATCH_SIZE)
+
+
 class OrderUpdate(BaseModel):
     order_status: Optional[str] = None
+    order_approved_at: Optional[datetime] = None
+    order_delivered_carrier_date: Optional[datetime] = None
+    order_delivered_customer_date: Optional[datetime] = None
+    order_estimated_delivery_date: Optional[datetime] = None
+
+
+class OrderReviewCreate(BaseModel):
+    review_score: int = Field(..., ge=1, le=5)
+    review_comment_title: Optional[str] = None
+    review_comment_message: Optional[str] = None
+
+
+class OrderReviewInDB(OrderReviewCreate):
+    review_id: str
+    order_id: str
+    review_creation_date: Optional[datetime] = None
+    review_answer_timestamp: Optional[datetime] = None
+    
+    class Config:
+        from_attributes = True
 
 
 class OrderInDBBase(OrderBase):
@@ -43,6 +71,7 @@ class OrderInDBBase(OrderBase):
     order_delivered_carrier_date: Optional[datetime] = None
     order_delivered_customer_date: Optional[datetime] = None
     order_estimated_delivery_date: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
     
     class Config:
         from_attributes = True
@@ -63,7 +92,22 @@ class OrderResponse(BaseModel):
     order_status: str
     order_purchase_timestamp: datetime
     total_amount: float
+    item_count: int
+    updated_at: Optional[datetime] = None
     items: List[OrderItemInDB]
     
     class Config:
         from_attributes = True
+
+
+class OrderBatchResult(BaseModel):
+    index: int
+    order_id: Optional[str] = None
+    total_amount: Optional[float] = None
+    error: Optional[str] = None
+
+
+class OrderBatchResponse(BaseModel):
+    created: int
+    failed: int
+    results: List[OrderBatchResult]
@@ -1,5 +1,6 @@
 from pydantic import BaseModel
 from typing import Optional
+from datetime import datetime
 
 
 class ProductBase(BaseModel):
@@ -23,6 +24,7 @@ class ProductUpdate(ProductBase):
 
 class ProductInDBBase(ProductBase):
     product_id: str
+    updated_at: Optional[datetime] = None
     
     class Config:
         from_attributes = True
@@ -0,0 +1,7 @@
+from pydantic import BaseModel
+
+
+class RelatedProduct(BaseModel):
+    product_id: str
+    # Orders containing both products
+    co_purchase_count: int
@@ -0,0 +1,42 @@
+from enum import Enum
+from pydantic import BaseModel
+
+
+class Segment(str, Enum):
+    champions = "champions"
+    loyal_customers = "loyal_customers"
+    potential_loyalists = "potential_loyalists"
+    new_customers = "new_customers"
+    promising = "promising"
+    need_attention = "need_attention"
+    about_to_sleep = "about_to_sleep"
+    at_risk = "at_risk"
+    cant_lose_them = "cant_lose_them"
+    hibernating = "hibernating"
+
+
+class CustomerSegment(BaseModel):
+    customer_unique_id: str
+    # Days between the last purchase and the job's reference date
+    recency_days: float
+    frequency: int
+    monetary: float
+    # 1-5, higher is better
+    recency_score: int
+    frequency_score: int
+    monetary_score: int
+    segment: Segment
+
+    class Config:
+        from_attributes = True
+
+
+class SegmentSummary(BaseModel):
+    segment: Segment
+    customer_count: int
+    average_recency_days: float
+    average_frequency: float
+    average_monetary: float
+
+    class Config:
+        from_attributes = True
@@ -0,0 +1,48 @@
+from pydantic import BaseModel
+from typing import Optional
+from datetime import datetime
+
+
+class SellerBase(BaseModel):
+    seller_zip_code_prefix: Optional[str] = None
+    seller_city: Optional[str] = None
+    seller_state: Optional[str] = None
+
+
+class SellerCreate(SellerBase):
+    seller_id: str
+
+
+class SellerUpdate(SellerBase):
+    pass
+
+
+class SellerInDBBase(SellerBase):
+    seller_id: str
+    
+    class Config:
+        from_attributes = True
+
+
+class Seller(SellerInDBBase):
+    pass
+
+
+class SellerInDB(SellerInDBBase):
+    pass
+
+
+class SellerScorecard(BaseModel):
+    seller_id: str
+    order_count: int = 0
+    item_count: int = 0
+    # Sum of item prices over orders that were not canceled or unavailable
+    gmv: float = 0.0
+    review_count: int = 0
+    average_review_score: Optional[float] = None
+    delivered_count: int = 0
+    # Share of delivered orders that arrived by the estimated delivery date
+    on_time_delivery_rate: Optional[float] = None
+    # Mean hours from payment approval to hand-off to the carrier
+    average_dispatch_hours: Optional[float] = None
+    updated_at: Optional[datetime] = None
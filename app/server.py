@@ -0,0 +1,318 @@
+"""
+Production server launcher
+
+Runs the API in several uvicorn worker processes sharing one listening
+socket. The socket is bound by the supervising process, which never imports
+the application; workers are spawned fresh, so each imports the app and
+creates its own database engine and pool instead of inheriting connections.
+
+Workers are replaced after ``SERVER_MAX_REQUESTS`` requests (plus a random
+jitter), which bounds memory growth; a worker keeps serving until its
+replacement is up, so recycling never leaves the socket unserved. SIGTERM
+or SIGINT stops the workers gracefully, giving in-flight requests
+``SERVER_GRACEFUL_TIMEOUT_SECONDS`` to finish.
+
+State that must agree across workers is shared: metrics are aggregated
+through prometheus_client's multiprocess mode, and geospatial index
+invalidations through a shared counter. The in-process memory cache cannot
+be shared, so with several workers ``CACHE_BACKEND=memory`` (the default)
+falls back to ``none`` with a warning; use ``redis`` to cache across workers.
+
+Usage:
+    python run.py --production [--workers N] [--host HOST] [--port PORT]
+"""
+import argparse
+import logging
+import multiprocessing
+import os
+import random
+import shutil
+import signal
+import sys
+import tempfile
+import threading
+from socket import socket
+from typing import List, Optional, Sequence, Tuple
+
+import uvicorn
+from prometheus_client import multiprocess
+from uvicorn.main import STARTUP_FAILURE
+
+from app.core.config import settings
+
+logger = logging.getLogger("uvicorn.error")
+
+APP = "app.main:app"
+
+multiprocessing.allow_connection_pickling()
+spawn = multiprocessing.get_context("spawn")
+
+
+def default_workers() -> int:
+    return settings.SERVER_WORKERS or os.cpu_count() or 1
+
+
+def worker_request_limit(
+    max_requests: Optional[int], jitter: int, rng: Optional[random.Random] = None
+) -> Optional[int]:
+    """Requests a worker serves before it is recycled; None means never"""
+    if not max_requests:
+        return None
+    return max_requests + (rng or random).randint(0, max(jitter, 0))
+
+
+def build_config(host: str, port: int) -> uvicorn.Config:
+    return uvicorn.Config(
+        APP,
+        host=host,
+        port=port,
+        loop=settings.SERVER_LOOP,
+        http=settings.SERVER_HTTP,
+        timeout_keep_alive=settings.SERVER_KEEPALIVE_SECONDS,
+        timeout_graceful_shutdown=settings.SERVER_GRACEFUL_TIMEOUT_SECONDS,
+        proxy_headers=True,
+        log_level="info",
+        access_log=False,
+    )
+
+
+class RecyclingServer(uvicorn.Server):
+    """
+    uvicorn server that tells the supervisor when it is serving and when it
+    has reached its request limit, instead of exiting at the limit; the
+    supervisor stops it once a replacement is serving
+    """
+
+    def __init__(self, config: uvicorn.Config, request_limit: Optional[int], ready, retiring):
+        super().__init__(config)
+        self.request_limit = request_limit
+        self.ready = ready
+        self.retiring = retiring
+
+    async def on_tick(self, counter: int) -> bool:
+        # Ticks only start once the app's startup has completed and the socket is served
+        if not self.ready.is_set():
+            self.ready.set()
+        if self.request_limit is not None and self.server_state.total_requests >= self.request_limit:
+            self.retiring.set()
+        return await super().on_tick(counter)
+
+
+def prepare_metrics_dir() -> Tuple[str, bool]:
+    """
+    Point prometheus_client's multiprocess mode at an empty directory, which
+    the spawned workers inherit through the environment; returns the
+    directory and whether it was created here
+    """
+    directory = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+    created = directory is None
+    if created:
+        directory = tempfile.mkdtemp(prefix="prometheus-")
+    os.makedirs(directory, exist_ok=True)
+    # Files left by a previous run would be added to this run's counters
+    for name in os.listdir(directory):
+        if name.endswith(".db"):
+            os.remove(os.path.join(directory, name))
+    os.environ["PROMETHEUS_MULTIPROC_DIR"] = directory
+    return directory, created
+
+
+def run_worker(
+    config: uvicorn.Config, sockets: List[socket], request_limit: Optional[int], ready, retiring, geo_invalidations
+) -> None:
+    """Worker process entry point; exits with STARTUP_FAILURE if the app never started serving"""
+    from app.core.geo import geo_index
+
+    geo_index.share_invalidations(geo_invalidations)
+    config.configure_logging()
+    server = RecyclingServer(config, request_limit, ready, retiring)
+    try:
+        server.run(sockets=sockets)
+    finally:
+        if not server.started:
+            sys.exit(STARTUP_FAILURE)
+
+
+class Worker:
+    """A worker process and the events it reports its state through"""
+
+    def __init__(self, process: multiprocessing.process.BaseProcess, ready, retiring):
+        self.process = process
+        self.ready = ready
+        self.retiring = retiring
+
+    @property
+    def pid(self) -> Optional[int]:
+        return self.process.pid
+
+
+class Supervisor:
+    """
+    Keeps ``workers`` processes serving ``config``'s socket until told to stop.
+
+    A worker that reaches its request limit keeps serving until its
+    replacement has started; only then is it stopped gracefully. One
+    replacement is started at a time, so workers that reach their limit
+    together are recycled one after another and never all at once.
+    """
+
+    def __init__(
+        self,
+        config: uvicorn.Config,
+        workers: int,
+        max_requests: Optional[int] = None,
+        max_requests_jitter: int = 0,
+    ):
+        self.config = config
+        self.workers = workers
+        self.max_requests = max_requests
+        self.max_requests_jitter = max_requests_jitter
+        self.should_exit = threading.Event()
+        self.processes: List[Worker] = []
+        # (slot, worker) started to take over from a retiring worker
+        self.successor: Optional[Tuple[int, Worker]] = None
+        # Stopped workers still finishing their in-flight requests
+        self.retired: List[Worker] = []
+        self.exit_code = 0
+        # Seller changes in any worker invalidate every worker's geospatial index
+        self.geo_invalidations = spawn.Value("q", 0)
+
+    def spawn_worker(self, sockets: List[socket]) -> Worker:
+        limit = worker_request_limit(self.max_requests, self.max_requests_jitter)
+        ready, retiring = spawn.Event(), spawn.Event()
+        process = spawn.Process(
+            target=run_worker, args=(self.config, sockets, limit, ready, retiring, self.geo_invalidations)
+        )
+        process.start()
+        return Worker(process, ready, retiring)
+
+    def handle_exit(self, sig: int, frame) -> None:
+        self.should_exit.set()
+
+    def reap(self, worker: Worker) -> None:
+        worker.process.join()
+        # Drops the exited worker from live-only gauges such as in-flight requests
+        multiprocess.mark_process_dead(worker.pid)
+
+    def failed_to_start(self, worker: Worker) -> bool:
+        if worker.process.exitcode != STARTUP_FAILURE:
+            return False
+        # Restarting would only fail again (bad config, unreachable imports)
+        logger.error("Worker [%d] failed to start; shutting down", worker.pid)
+        self.exit_code = STARTUP_FAILURE
+        self.should_exit.set()
+        return True
+
+    def supervise(self, sockets: List[socket]) -> None:
+        """One pass: replace exited workers, recycle retiring ones and reap stopped ones"""
+        for index, worker in enumerate(self.processes):
+            if worker.process.is_alive():
+                continue
+            self.reap(worker)
+            if self.failed_to_start(worker):
+                return
+            if self.successor is not None and self.successor[0] == index:
+                logger.info(
+                    "Worker [%d] exited with code %s; its replacement takes over", worker.pid, worker.process.exitcode
+                )
+                self.processes[index] = self.successor[1]
+                self.successor = None
+            else:
+                logger.info(
+                    "Worker [%d] exited with code %s; starting a replacement", worker.pid, worker.process.exitcode
+                )
+                self.processes[index] = self.spawn_worker(sockets)
+
+        if self.successor is not None:
+            index, successor = self.successor
+            if successor.ready.is_set():
+                retiring = self.processes[index]
+                logger.info("Worker [%d] reached its request limit; replaced by [%d]", retiring.pid, successor.pid)
+                retiring.process.terminate()
+                self.retired.append(retiring)
+                self.processes[index] = successor
+                self.successor = None
+            elif not successor.process.is_alive():
+                self.reap(successor)
+                if self.failed_to_start(successor):
+                    return
+                self.successor = None
+        if self.successor is None:
+            for index, worker in enumerate(self.processes):
+                if worker.retiring.is_set():
+                    self.successor = (index, self.spawn_worker(sockets))
+                    break
+
+        for worker in [worker for worker in self.retired if not worker.process.is_alive()]:
+            self.reap(worker)
+            self.retired.remove(worker)
+
+    def run(self) -> int:
+        metrics_dir, created_metrics_dir = prepare_metrics_dir()
+        sockets = [self.config.bind_socket()]
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(sig, self.handle_exit)
+
+        logger.info("Starting %d workers on %s:%d", self.workers, self.config.host, self.config.port)
+        self.processes = [self.spawn_worker(sockets) for _ in range(self.workers)]
+        while not self.should_exit.wait(0.1):
+            self.supervise(sockets)
+
+        self.shutdown()
+        for sock in sockets:
+            sock.close()
+        if created_metrics_dir:
+            shutil.rmtree(metrics_dir, ignore_errors=True)
+        return self.exit_code
+
+    def shutdown(self) -> None:
+        """SIGTERM every worker, then kill those still running after the graceful timeout"""
+        workers = self.processes + self.retired + ([self.successor[1]] if self.successor else [])
+        for worker in workers:
+            if worker.process.is_alive():
+                worker.process.terminate()
+        timeout = (self.config.timeout_graceful_shutdown or 0) + 5
+        for worker in workers:
+            worker.process.join(timeout)
+            if worker.process.is_alive():
+                logger.warning("Worker [%d] did not stop in time; killing it", worker.pid)
+                worker.process.kill()
+                worker.process.join()
+
+
+def disable_cache() -> None:
+    """Switch this process and the workers it spawns, which read settings from the environment, to CACHE_BACKEND=none"""
+    os.environ["CACHE_BACKEND"] = "none"
+    settings.CACHE_BACKEND = "none"
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Run the API with multiple worker processes")
+    parser.add_argument("--host", default=settings.SERVER_HOST)
+    parser.add_argument("--port", type=int, default=settings.SERVER_PORT)
+    parser.add_argument("--workers", type=int, default=default_workers())
+    parser.add_argument("--max-requests", type=int, default=settings.SERVER_MAX_REQUESTS)
+    parser.add_argument("--max-requests-jitter", type=int, default=settings.SERVER_MAX_REQUESTS_JITTER)
+    args = parser.parse_args(argv)
+    # Also sets up uvicorn's logging, so build it before warning
+    config = build_config(args.host, args.port)
+    if args.workers > 1 and settings.CACHE_BACKEND == "memory":
+        # Each worker would invalidate only its own copy and serve stale products from the others
+        logger.warning(
+            "CACHE_BACKEND=memory is per process and cannot be shared by %d workers; running without a cache. "
+            "Set CACHE_BACKEND=redis to cache across workers",
+            args.workers,
+        )
+        disable_cache()
+
+    supervisor = Supervisor(
+        config,
+        workers=args.workers,
+        max_requests=args.max_requests,
+        max_requests_jitter=args.max_requests_jitter,
+    )
+    sys.exit(supervisor.run())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+Compare two load test result files
+
+Usage:
+    python -m benchmarks.compare benchmarks/results/base.json benchmarks/results/head.json
+"""
+import argparse
+import json
+from typing import Any, Dict, Optional, Sequence
+
+METRICS = ("rps", "p50_ms", "p95_ms", "p99_ms", "queries_per_request")
+
+
+def _format(value: Optional[float]) -> str:
+    return "n/a" if value is None else f"{value:.2f}"
+
+
+def change(base: Optional[float], head: Optional[float]) -> str:
+    if base is None or head is None:
+        return "n/a"
+    if base == 0:
+        return "new" if head else "0%"
+    return f"{(head - base) / base:+.1%}"
+
+
+def compare(base: Dict[str, Any], head: Dict[str, Any]) -> str:
+    lines = [f"{'scenario':<20}{'metric':<22}{'base':>10}{'head':>10}{'change':>10}"]
+    for name, head_result in head["results"].items():
+        base_result = base["results"].get(name)
+        if base_result is None:
+            continue
+        for metric in METRICS:
+            base_value, head_value = base_result.get(metric), head_result.get(metric)
+            lines.append(
+                f"{name:<20}{metric:<22}{_format(base_value):>10}{_format(head_value):>10}"
+                f"{change(base_value, head_value):>10}"
+            )
+    return "\n".join(lines)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Compare two load test result files")
+    parser.add_argument("base")
+    parser.add_argument("head")
+    args = parser.parse_args(argv)
+    with open(args.base) as base, open(args.head) as head:
+        print(compare(json.load(base), json.load(head)))
+
+
+if __name__ == "__main__":
+    main()
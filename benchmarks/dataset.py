@@ -0,0 +1,58 @@
+"""
+Synthetic Olist-shaped dataset for benchmarks
+
+Thin wrapper around ``app.db.generate_olist``: every table is generated
+deterministically from a seed, with Olist-like skew, and stored order totals
+match the items, as the API keeps them.
+
+Usage:
+    python -m benchmarks.dataset [--customers 100000] [--orders 1000000] [--database-url URL]
+"""
+import argparse
+from typing import Optional, Sequence
+
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.engine import Engine
+
+from app.db import models
+from app.db.generate_olist import DEFAULT_BATCH_SIZE, OlistScale, default_scale, generate
+
+
+def seed_dataset(engine: Engine, size: OlistScale, seed: int = 42, batch_size: int = DEFAULT_BATCH_SIZE) -> float:
+    """Create the schema and insert a synthetic dataset; returns the elapsed seconds"""
+    return sum(result.seconds for result in generate(engine, size, seed=seed, batch_size=batch_size))
+
+
+def is_seeded(engine: Engine) -> bool:
+    models.Base.metadata.create_all(bind=engine)
+    with engine.connect() as connection:
+        return bool(connection.execute(select(func.count()).select_from(models.Order)).scalar())
+
+
+def default_size(customers: int, orders: int) -> OlistScale:
+    return default_scale(orders, customers)
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--database-url", default="sqlite:///./benchmark.db")
+    parser.add_argument("--customers", type=int, default=100_000)
+    parser.add_argument("--orders", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=42)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Seed a synthetic Olist-shaped benchmark dataset")
+    add_arguments(parser)
+    args = parser.parse_args(argv)
+
+    engine = create_engine(args.database_url)
+    if is_seeded(engine):
+        parser.exit(1, "Database already contains orders; point --database-url at an empty database\n")
+    size = default_size(args.customers, args.orders)
+    seconds = seed_dataset(engine, size, seed=args.seed)
+    print(f"Seeded {size.customers:,} customers, {size.products:,} products, {size.sellers:,} sellers and "
+          f"{size.orders:,} orders in {seconds:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
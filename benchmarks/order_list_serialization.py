@@ -0,0 +1,140 @@
+"""
+Benchmark the standard and fast JSON paths of GET /orders/?limit=1000
+
+Seeds a throwaway SQLite database, then issues the same request in both
+modes and reports requests per second and peak memory allocated per request
+(tracemalloc). Measures the full in-process request cycle through the
+ASGI app, without a network hop.
+
+Usage:
+    python -m benchmarks.order_list_serialization [--orders 5000] [--requests 50] [--limit 1000]
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional, Sequence
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.db import models
+from app.db.database import get_db
+from app.main import app
+
+
+def seed(engine, orders: int) -> None:
+    models.Base.metadata.create_all(bind=engine)
+    rng = random.Random(42)
+    started = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    order_rows = []
+    item_rows = []
+    for i in range(orders):
+        order_id = f"bench-order-{i:07d}"
+        items = [
+            {
+                "order_id": order_id,
+                "order_item_id": item_id,
+                "product_id": "bench-product",
+                "seller_id": "bench-seller",
+                "price": round(rng.uniform(5, 500), 2),
+                "freight_value": round(rng.uniform(0, 50), 2),
+                "shipping_limit_date": started + timedelta(days=3),
+            }
+            for item_id in range(1, rng.randint(1, 3) + 1)
+        ]
+        item_rows.extend(items)
+        order_rows.append({
+            "order_id": order_id,
+            "customer_id": "bench-customer",
+            "order_status": "delivered",
+            "order_purchase_timestamp": started + timedelta(minutes=i),
+            "total_amount": sum(item["price"] + item["freight_value"] for item in items),
+            "item_count": len(items),
+        })
+
+    with engine.begin() as connection:
+        connection.execute(insert(models.Customer), [{"customer_id": "bench-customer", "customer_unique_id": "bench"}])
+        connection.execute(insert(models.Product), [{"product_id": "bench-product"}])
+        connection.execute(insert(models.Seller), [{"seller_id": "bench-seller"}])
+        connection.execute(insert(models.Order), order_rows)
+        connection.execute(insert(models.OrderItem), item_rows)
+
+
+def run(client: TestClient, url: str, requests: int, fast: bool) -> Dict[str, float]:
+    settings.FAST_JSON_RESPONSES = fast
+    client.get(url)  # warm up caches and compiled statements
+
+    started = time.perf_counter()
+    for _ in range(requests):
+        response = client.get(url)
+        response.raise_for_status()
+    elapsed = time.perf_counter() - started
+
+    # Allocations are traced in a separate pass; tracing slows everything down
+    tracemalloc.start()
+    client.get(url)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "requests_per_second": requests / elapsed,
+        "ms_per_request": elapsed / requests * 1000,
+        "peak_kib": peak / 1024,
+        "bytes": len(response.content),
+    }
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Compare the standard and fast JSON order list paths")
+    parser.add_argument("--orders", type=int, default=5000, help="Orders to seed")
+    parser.add_argument("--requests", type=int, default=50, help="Timed requests per mode")
+    parser.add_argument("--limit", type=int, default=1000, help="Page size requested")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine(
+            f"sqlite:///{os.path.join(directory, 'bench.db')}", connect_args={"check_same_thread": False}
+        )
+        seed(engine, args.orders)
+        Session = sessionmaker(bind=engine)
+
+        def override_get_db():
+            db = Session()
+            try:
+                yield db
+            finally:
+                db.close()
+
+        app.dependency_overrides[get_db] = override_get_db
+        original = settings.FAST_JSON_RESPONSES
+        url = f"{settings.API_V1_STR}/orders/?limit={args.limit}"
+        try:
+            with TestClient(app) as client:
+                results = {
+                    "standard": run(client, url, args.requests, fast=False),
+                    "fast": run(client, url, args.requests, fast=True),
+                }
+        finally:
+            settings.FAST_JSON_RESPONSES = original
+            app.dependency_overrides.clear()
+            engine.dispose()
+
+    print(f"GET {url} ({args.orders:,} orders seeded, {args.requests} requests per mode)")
+    print(f"{'mode':<10}{'req/s':>10}{'ms/req':>10}{'peak KiB':>12}{'bytes':>12}")
+    for mode, result in results.items():
+        print(
+            f"{mode:<10}{result['requests_per_second']:>10.1f}{result['ms_per_request']:>10.1f}"
+            f"{result['peak_kib']:>12.0f}{result['bytes']:>12,}"
+        )
+    speedup = results["fast"]["requests_per_second"] / results["standard"]["requests_per_second"]
+    print(f"fast path: {speedup:.2f}x requests per second")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,25 @@
 #!/usr/bin/env python3
 """
 Simple script to run the E-commerce API application
+
+    python run.py                  # development: one process with auto-reload
+    python run.py --production     # multiple workers, see app/server.py; set CACHE_BACKEND=redis
+                                   # to keep caching, as the per-process memory cache is turned off
 """
+import sys
+
 import uvicorn
 
 if __name__ == "__main__":
-    uvicorn.run(
-        "app.main:app",
-        host="0.0.0.0",
-        port=8000,
-        reload=True,
-        log_level="info"
-    )
+    if "--production" in sys.argv[1:]:
+        from app.server import main
+
+        main([arg for arg in sys.argv[1:] if arg != "--production"])
+    else:
+        uvicorn.run(
+            "app.main:app",
+            host="0.0.0.0",
+            port=8000,
+            reload=True,
+            log_level="info"
+        )
@@ -1,16 +1,27 @@
+import os
+import shutil
+import tempfile
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from app.main import app
-from app.db.database import get_db, Base
+from app.db.database import get_db, get_session_factory, Base
 from app.core.config import settings
+from app.core.cache import cache
+from app.core.geo import geo_index
+from app.core.recommendations import recommendations
 
-# Create test database
-SQLALCHEMY_DATABASE_URL = "sqlite:///./test.db"
+# Create test database, outside the working tree
+TEST_DATABASE_DIR = tempfile.mkdtemp(prefix="ecommerce-tests-")
+SQLALCHEMY_DATABASE_URL = f"sqlite:///{os.path.join(TEST_DATABASE_DIR, 'test.db')}"
 engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# The startup warm-ups would read the configured DATABASE_URL, not the test database
+settings.GEO_INDEX_WARM_ON_STARTUP = False
+settings.RECOMMENDATIONS_WARM_ON_STARTUP = False
+
 
 def override_get_db():
     try:
@@ -25,6 +36,8 @@ def db_engine():
     Base.metadata.create_all(bind=engine)
     yield engine
     Base.metadata.drop_all(bind=engine)
+    engine.dispose()
+    shutil.rmtree(TEST_DATABASE_DIR, ignore_errors=True)
 
 
 @pytest.fixture(scope="function")
@@ -38,6 +51,18 @@ def db_session(db_engine):
     connection.close()
 
 
+@pytest.fixture(autouse=True)
+def clear_cache():
+    # Each test rolls its data back, so cached reads must not outlive it
+    cache.clear()
+    geo_index.clear()
+    recommendations.clear()
+    yield
+    cache.clear()
+    geo_index.clear()
+    recommendations.clear()
+
+
 @pytest.fixture(scope="function")
 def client(db_session):
     def override_get_db():
@@ -47,6 +72,8 @@ def client(db_session):
             pass
     
     app.dependency_overrides[get_db] = override_get_db
+    # Sessions opened outside the request (streamed exports) share the test transaction
+    app.dependency_overrides[get_session_factory] = lambda: lambda: TestingSessionLocal(bind=db_session.connection())
     with TestClient(app) as test_client:
         yield test_client
     app.dependency_overrides.clear()
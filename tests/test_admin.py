@@ -0,0 +1,16 @@
+import pytest
+from fastapi import status
+
+
+class TestAdmin:
+    """Test suite for admin endpoints"""
+
+    def test_get_pool_report(self, client):
+        """Test GET /admin/pool reports configured limits and live pool usage"""
+        response = client.get("/api/v1/admin/pool")
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert data["settings"]["pool_size"] >= 1
+        assert data["sync_pool"]["pool_class"]
+        assert "checked_out" in data["sync_pool"]
+        assert "overflow" in data["sync_pool"]
@@ -0,0 +1,107 @@
+from datetime import datetime
+import pytest
+from fastapi import status
+from sqlalchemy import func, select
+from app.crud import analytics as crud_analytics
+from app.db import models
+
+
+def add_order(db, order_id, purchased_at, items, customer_id="customer-sp", order_status="delivered"):
+    db.add(models.Order(
+        order_id=order_id, customer_id=customer_id, order_status=order_status, order_purchase_timestamp=purchased_at
+    ))
+    db.add_all(
+        models.OrderItem(order_id=order_id, order_item_id=number, product_id=product_id, seller_id=seller_id,
+                         price=price, freight_value=1.0)
+        for number, (product_id, seller_id, price) in enumerate(items, start=1)
+    )
+    db.flush()
+
+
+class TestSalesRollups:
+    """Test suite for sales rollups and the analytics endpoints"""
+
+    @pytest.fixture(autouse=True)
+    def orders(self, db_session):
+        db_session.add_all([
+            models.Product(product_id="p-toys", product_category_name="toys"),
+            models.Product(product_id="p-books", product_category_name="books"),
+            models.Customer(customer_id="customer-sp", customer_unique_id="u-sp", customer_state="SP"),
+            models.Customer(customer_id="customer-rj", customer_unique_id="u-rj", customer_state="RJ"),
+            models.Seller(seller_id="s1"),
+            models.Seller(seller_id="s2"),
+        ])
+        add_order(db_session, "o1", datetime(2018, 1, 1, 10, 5), [("p-toys", "s1", 10.0), ("p-books", "s2", 20.0)])
+        add_order(db_session, "o2", datetime(2018, 1, 1, 10, 40), [("p-toys", "s1", 5.0)], customer_id="customer-rj")
+        add_order(db_session, "o3", datetime(2018, 1, 2, 9, 0), [("p-toys", "s1", 7.0)])
+        add_order(db_session, "o4", datetime(2018, 1, 2, 9, 30), [("p-toys", "s1", 99.0)], order_status="canceled")
+
+    def test_refresh_builds_hourly_and_daily_rollups(self, db_session):
+        """Test rollup rows and high-water mark after the first refresh"""
+        result = crud_analytics.refresh_sales_rollups(db_session)
+        assert result.since is None
+        assert result.high_water_mark == datetime(2018, 1, 2, 9, 30)
+        # 10:00 has 18 rows over the 8 groupings (e.g. toys/SP/s1, books/SP/s2 and toys/RJ/s1 at full grain,
+        # a single total); 09:00 the next day has one order, so one row per grouping
+        assert result.hourly_rows == 26
+        assert result.daily_rows == 26
+
+        # o1 has items in two categories from two sellers but is still one order
+        daily = crud_analytics.get_sales_series(db_session, granularity="day")
+        assert [(row.bucket.day, row.order_count, row.item_count, row.revenue) for row in daily] == [
+            (1, 2, 3, 35.0), (2, 1, 1, 7.0)
+        ]
+        by_state = crud_analytics.get_sales_series(db_session, granularity="day", state="SP")
+        assert [(row.bucket.day, row.order_count) for row in by_state] == [(1, 1), (2, 1)]
+
+    def test_incremental_refresh(self, db_session):
+        """Test that only new buckets are recomputed and totals match a full rebuild"""
+        crud_analytics.refresh_sales_rollups(db_session)
+        add_order(db_session, "o5", datetime(2018, 1, 2, 9, 45), [("p-books", "s2", 3.0)])
+        add_order(db_session, "o6", datetime(2018, 1, 3, 12, 0), [("p-books", "s2", 4.0)], customer_id="customer-rj")
+
+        result = crud_analytics.refresh_sales_rollups(db_session)
+        assert result.since == datetime(2018, 1, 2, 9, 0)
+        incremental = crud_analytics.get_sales_series(db_session, granularity="hour")
+
+        crud_analytics.refresh_sales_rollups(db_session, full=True)
+        assert crud_analytics.get_sales_series(db_session, granularity="hour") == incremental
+        assert [row.revenue for row in incremental] == [35.0, 10.0, 4.0]
+        rows = db_session.execute(select(func.count()).select_from(models.SalesRollup)).scalar()
+        assert rows == 80
+
+    def test_sales_endpoint(self, client, db_session):
+        """Test the time series with filters"""
+        crud_analytics.refresh_sales_rollups(db_session)
+        response = client.get("/api/v1/analytics/sales?granularity=hour&category=toys&state=SP")
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert [(point["bucket"][:13], point["revenue"]) for point in data] == [
+            ("2018-01-01T10", 10.0), ("2018-01-02T09", 7.0)
+        ]
+
+        response = client.get("/api/v1/analytics/sales?date_from=2018-01-02T00:00:00")
+        assert [point["order_count"] for point in response.json()] == [1]
+
+    def test_breakdown_endpoint(self, client, db_session):
+        """Test sales by category, state and seller ranked by revenue"""
+        crud_analytics.refresh_sales_rollups(db_session)
+        response = client.get("/api/v1/analytics/sales/by/category")
+        assert response.status_code == status.HTTP_200_OK
+        assert [(row["key"], row["revenue"]) for row in response.json()] == [("toys", 22.0), ("books", 20.0)]
+
+        response = client.get("/api/v1/analytics/sales/by/seller")
+        assert [(row["key"], row["order_count"]) for row in response.json()] == [("s1", 3), ("s2", 1)]
+
+        response = client.get("/api/v1/analytics/sales/by/state?limit=1")
+        assert [(row["key"], row["revenue"]) for row in response.json()] == [("SP", 37.0)]
+
+        assert client.get("/api/v1/analytics/sales/by/planet").status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+    def test_status_endpoint(self, client, db_session):
+        """Test rollup freshness before and after a refresh"""
+        assert client.get("/api/v1/analytics/status").status_code == status.HTTP_404_NOT_FOUND
+        crud_analytics.refresh_sales_rollups(db_session)
+        response = client.get("/api/v1/analytics/status")
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["high_water_mark"].startswith("2018-01-02T09:30")
@@ -0,0 +1,149 @@
+import pytest
+from fastapi import FastAPI, status
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+from app.api.v1.endpoints import async_customers, async_orders, async_products
+from app.core.cache import cache
+from app.core.config import settings
+from app.crud import product as crud_product
+from app.crud.order import reconcile_order_totals
+from app.db import models
+from app.db.database import Base, get_async_db, get_async_database_url
+
+@pytest.fixture(scope="module")
+def async_database_url(tmp_path_factory):
+    return f"sqlite:///{tmp_path_factory.mktemp('async') / 'test_async.db'}"
+
+
+@pytest.fixture(scope="module")
+def seeded_engine(async_database_url):
+    engine = create_engine(async_database_url)
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    session.add_all([
+        models.Customer(customer_id="async-customer-1", customer_unique_id="async-unique-1", customer_state="SP"),
+        models.Product(product_id="async-product-1", product_category_name="books"),
+        models.Order(order_id="async-order-1", customer_id="async-customer-1", order_status="delivered"),
+        models.OrderItem(
+            order_id="async-order-1", order_item_id=1, product_id="async-product-1",
+            seller_id="async-seller-1", price=20.0, freight_value=5.0
+        ),
+        models.OrderItem(
+            order_id="async-order-1", order_item_id=2, product_id="async-product-1",
+            seller_id="async-seller-1", price=10.0, freight_value=1.0
+        ),
+    ])
+    session.commit()
+    reconcile_order_totals(session)
+    session.close()
+    yield engine
+    Base.metadata.drop_all(bind=engine)
+    engine.dispose()
+
+
+@pytest.fixture
+def async_client(seeded_engine, async_database_url):
+    async_engine = create_async_engine(get_async_database_url(async_database_url), poolclass=NullPool)
+    AsyncTestingSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False)
+
+    async def override_get_async_db():
+        async with AsyncTestingSessionLocal() as db:
+            yield db
+
+    app = FastAPI()
+    app.include_router(async_products.router, prefix="/products")
+    app.include_router(async_customers.router, prefix="/customers")
+    app.include_router(async_orders.router, prefix="/orders")
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+class TestAsyncEndpoints:
+    """Test suite for the async read endpoints"""
+
+    def test_get_async_database_url(self):
+        """Test deriving async driver URLs from sync ones"""
+        assert get_async_database_url("postgresql://u:p@localhost/db") == "postgresql+asyncpg://u:p@localhost/db"
+        assert get_async_database_url("sqlite:///./test.db") == "sqlite+aiosqlite:///./test.db"
+        with pytest.raises(ValueError):
+            get_async_database_url("mysql://u:p@localhost/db")
+
+    def test_get_order(self, async_client):
+        """Test getting an order with its items and total"""
+        response = async_client.get("/orders/async-order-1")
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert data["total_amount"] == 36.0
+        assert len(data["items"]) == 2
+
+    def test_get_order_not_modified(self, async_client):
+        """Test that a matching If-None-Match returns 304 from the async routes"""
+        etag = async_client.get("/orders/async-order-1").headers["ETag"]
+        response = async_client.get("/orders/async-order-1", headers={"If-None-Match": etag})
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    def test_get_orders_sparse_fieldsets(self, async_client):
+        """Test ?fields= and ?include= on the async routes"""
+        response = async_client.get("/orders/async-order-1?fields=order_id,total_amount&include=items")
+        data = response.json()
+        assert set(data) == {"order_id", "total_amount", "items"}
+        assert data["total_amount"] == 36.0
+        assert len(data["items"]) == 2
+        
+        response = async_client.get("/orders/?fields=order_id")
+        assert all(set(order) == {"order_id"} for order in response.json())
+
+    def test_get_nonexistent_order(self, async_client):
+        """Test getting an order that doesn't exist"""
+        response = async_client.get("/orders/nonexistent-id")
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_get_orders_by_status(self, async_client):
+        """Test listing orders by status"""
+        response = async_client.get("/orders/status/delivered")
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert [order["order_id"] for order in data] == ["async-order-1"]
+        assert data[0]["total_amount"] == 36.0
+
+    def test_get_customer_orders(self, async_client):
+        """Test listing a customer's orders"""
+        response = async_client.get("/customers/async-customer-1/orders")
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.json()) == 1
+
+    def test_get_products_by_category(self, async_client):
+        """Test listing products by category"""
+        response = async_client.get("/products/category/books")
+        assert response.status_code == status.HTTP_200_OK
+        assert [p["product_id"] for p in response.json()] == ["async-product-1"]
+
+    def test_product_reads_use_the_product_cache(self, async_client):
+        """Test that the async product routes read through the same cache entries as the sync ones"""
+        before = cache.stats()
+        assert async_client.get("/products/async-product-1").json()["product_category_name"] == "books"
+        assert async_client.get("/products/async-product-1").status_code == status.HTTP_200_OK
+        async_client.get("/products/category/books")
+        async_client.get("/products/category/books")
+        after = cache.stats()
+        assert (after["hits"] - before["hits"], after["misses"] - before["misses"]) == (2, 2)
+        assert cache.backend.get(crud_product.product_cache_key("async-product-1")) is not None
+
+        crud_product.invalidate_product_cache("async-product-1", "books")
+        async_client.get("/products/category/books")
+        assert cache.stats()["misses"] - after["misses"] == 1
+
+    def test_fast_json_products_match(self, async_client, monkeypatch):
+        """Test that the async product list honours FAST_JSON_RESPONSES with identical output"""
+        monkeypatch.setattr(settings, "FAST_JSON_RESPONSES", False)
+        standard = async_client.get("/products/")
+        monkeypatch.setattr(settings, "FAST_JSON_RESPONSES", True)
+        monkeypatch.setattr(async_products.crud_product, "get_products", None)
+        fast = async_client.get("/products/")
+        assert fast.status_code == status.HTTP_200_OK
+        assert fast.content == standard.content
+        assert fast.headers["ETag"] == standard.headers["ETag"]
@@ -0,0 +1,78 @@
+import pytest
+from sqlalchemy import create_engine, func, select
+from app.db import models
+from benchmarks import dataset
+from benchmarks.compare import compare
+from benchmarks.load_test import Sample, percentile, summarize
+
+
+@pytest.fixture
+def bench_engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'bench.db'}")
+    yield engine
+    engine.dispose()
+
+
+class TestBenchmarkDataset:
+    """Test suite for the synthetic benchmark dataset"""
+
+    def test_seed_dataset(self, bench_engine):
+        """Test that the seeded dataset has the requested size and consistent totals"""
+        size = dataset.default_size(customers=50, orders=300)
+        assert not dataset.is_seeded(bench_engine)
+        dataset.seed_dataset(bench_engine, size, batch_size=128)
+        assert dataset.is_seeded(bench_engine)
+        
+        with bench_engine.connect() as connection:
+            def count(model):
+                return connection.execute(select(func.count()).select_from(model)).scalar()
+
+            assert count(models.Customer) == 50
+            assert count(models.Order) == 300
+            assert count(models.OrderPayment) >= 300
+            items = connection.execute(
+                select(func.count(), func.sum(models.OrderItem.price + models.OrderItem.freight_value))
+            ).one()
+            stored = connection.execute(
+                select(func.sum(models.Order.item_count), func.sum(models.Order.total_amount))
+            ).one()
+        assert stored[0] == items[0]
+        assert stored[1] == pytest.approx(items[1])
+
+    def test_seed_is_deterministic(self, tmp_path):
+        """Test that the same seed produces the same rows"""
+        size = dataset.default_size(customers=10, orders=20)
+        snapshots = []
+        for name in ("a.db", "b.db"):
+            engine = create_engine(f"sqlite:///{tmp_path / name}")
+            dataset.seed_dataset(engine, size, seed=7)
+            with engine.connect() as connection:
+                snapshots.append(connection.execute(
+                    select(models.Order.customer_id, models.Order.total_amount).order_by(models.Order.order_id)
+                ).all())
+            engine.dispose()
+        assert snapshots[0] == snapshots[1]
+
+
+class TestLoadTestReport:
+    """Test suite for load test summaries and comparisons"""
+
+    def test_summarize(self):
+        """Test percentiles, error counts and queries per request"""
+        samples = [Sample(ms / 1000, 200, 2) for ms in range(1, 101)] + [Sample(0.5, 500, None)]
+        result = summarize(samples, elapsed=2.0)
+        assert result["requests"] == 101
+        assert result["errors"] == 1
+        assert result["rps"] == 50.5
+        assert result["p50_ms"] == pytest.approx(51.0)
+        assert result["p99_ms"] == pytest.approx(100.0)
+        assert result["queries_per_request"] == 2.0
+        assert percentile([], 0.5) == 0.0
+
+    def test_compare(self):
+        """Test relative changes between two result files"""
+        base = {"results": {"orders_list": {"rps": 100.0, "p95_ms": 20.0, "queries_per_request": 2.0}}}
+        head = {"results": {"orders_list": {"rps": 150.0, "p95_ms": 10.0, "queries_per_request": 2.0}}}
+        report = compare(base, head)
+        assert "+50.0%" in report
+        assert "-50.0%" in report
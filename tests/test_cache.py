@@ -0,0 +1,105 @@
+import fnmatch
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from app.core.cache import Cache, MemoryCacheBackend, RedisCacheBackend
+
+
+class FakeRedis:
+    """In-memory stand-in for the subset of redis-py used by RedisCacheBackend"""
+
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, ex=None):
+        self.data[key] = value.encode()
+
+    def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+
+    def incr(self, key):
+        self.data[key] = str(int(self.data.get(key, b"0")) + 1).encode()
+        return int(self.data[key])
+
+    def scan_iter(self, match, count=None):
+        return [key for key in list(self.data) if fnmatch.fnmatchcase(key, match)]
+
+
+@pytest.fixture(params=["memory", "redis"])
+def test_cache(request):
+    if request.param == "memory":
+        backend = MemoryCacheBackend(max_entries=3)
+    else:
+        backend = RedisCacheBackend(FakeRedis())
+    return Cache(backend, ttl=60, namespace="test")
+
+
+class TestCache:
+    """Test suite for the read-through cache"""
+
+    def test_read_through_counts_hits_and_misses(self, test_cache):
+        """Test that the loader runs once and later reads are hits"""
+        calls = []
+
+        def loader():
+            calls.append(1)
+            return {"product_id": "p1"}
+
+        key = test_cache.key("product", "p1")
+        assert test_cache.get_or_load(key, loader) == {"product_id": "p1"}
+        assert test_cache.get_or_load(key, loader) == {"product_id": "p1"}
+        assert len(calls) == 1
+        assert test_cache.stats()["hits"] == 1
+        assert test_cache.stats()["misses"] == 1
+
+    def test_concurrent_lookups_are_all_counted(self, test_cache):
+        """Test that hits and misses from many threads add up to the number of lookups"""
+        key = test_cache.key("product", "p1")
+        test_cache.get_or_load(key, lambda: {"product_id": "p1"})
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(lambda _: test_cache.get_or_load(key, lambda: None), range(2000)))
+        assert test_cache.stats()["hits"] == 2000
+        assert test_cache.stats()["misses"] == 1
+
+    def test_none_is_not_cached(self, test_cache):
+        """Test that missing rows are looked up again"""
+        key = test_cache.key("product", "missing")
+        assert test_cache.get_or_load(key, lambda: None) is None
+        assert test_cache.get_or_load(key, lambda: {"product_id": "missing"}) == {"product_id": "missing"}
+
+    def test_generation_bump_invalidates_group(self, test_cache):
+        """Test that bumping a generation makes previously built keys unreachable"""
+        def page_key():
+            return test_cache.key("category", "books", test_cache.generation("category:books"), 0)
+
+        test_cache.get_or_load(page_key(), lambda: ["old"])
+        test_cache.bump("category:books")
+        assert test_cache.get_or_load(page_key(), lambda: ["new"]) == ["new"]
+
+    def test_clear(self, test_cache):
+        """Test that clear drops every cached value"""
+        test_cache.get_or_load(test_cache.key("product", "p1"), lambda: {"v": 1})
+        test_cache.bump("category:books")
+        test_cache.clear()
+        assert test_cache.get_or_load(test_cache.key("product", "p1"), lambda: {"v": 2}) == {"v": 2}
+        assert test_cache.generation("category:books") == 0
+
+    def test_memory_backend_evicts_least_recently_used(self):
+        """Test the memory backend size limit"""
+        backend = MemoryCacheBackend(max_entries=2)
+        backend.set("a", "1", ttl=60)
+        backend.set("b", "2", ttl=60)
+        backend.get("a")
+        backend.set("c", "3", ttl=60)
+        assert backend.get("b") is None
+        assert backend.get("a") == "1"
+        assert backend.size() == 2
+
+    def test_memory_backend_expires_entries(self):
+        """Test the memory backend TTL"""
+        backend = MemoryCacheBackend()
+        backend.set("a", "1", ttl=0)
+        assert backend.get("a") is None
@@ -172,3 +172,19 @@ class TestCustomers:
         assert data["customer_unique_id"] == minimal_customer["customer_unique_id"]
         assert data["customer_city"] is None
         assert data["customer_state"] is None
+
+    def test_export_customers_csv(self, client, sample_customer):
+        """Test streaming a CSV export filtered by state"""
+        import csv
+        import io
+
+        client.post("/api/v1/customers/", json=sample_customer)
+        client.post("/api/v1/customers/", json={"customer_unique_id": "other-customer", "customer_state": "SP"})
+        
+        response = client.get("/api/v1/customers/export?format=csv&state=TS")
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"].startswith("text/csv")
+        rows = list(csv.DictReader(io.StringIO(response.text)))
+        assert len(rows) == 1
+        assert rows[0]["customer_unique_id"] == sample_customer["customer_unique_id"]
+        assert rows[0]["customer_city"] == "Test City"
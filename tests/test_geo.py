@@ -0,0 +1,158 @@
+import multiprocessing
+import threading
+import time
+import numpy as np
+import pytest
+from fastapi import status
+from app.core.geo import GeoIndex, GeoIndexCache, SellerLocation, haversine_km
+from app.db import models
+
+
+def random_index(seed, sellers, cell_degrees=0.5):
+    rng = np.random.default_rng(seed)
+    prefixes = [
+        (f"{i:05d}", float(lat), float(lng))
+        for i, (lat, lng) in enumerate(zip(rng.uniform(-33, 4, 2000), rng.uniform(-73, -35, 2000)))
+    ]
+    locations = [
+        SellerLocation(f"seller-{i}", f"{prefix:05d}", None, None)
+        for i, prefix in enumerate(rng.integers(0, 2000, sellers))
+    ]
+    return GeoIndex(prefixes, locations, cell_degrees=cell_degrees), prefixes
+
+
+class TestGeoIndex:
+    """Test suite for the in-memory spatial index"""
+
+    def test_haversine(self):
+        """Test a known distance (Sao Paulo to Rio de Janeiro, ~360 km)"""
+        assert haversine_km(-23.55, -46.63, -22.91, -43.17) == pytest.approx(361, abs=5)
+        assert haversine_km(-23.55, -46.63, -23.55, -46.63) == 0
+
+    @pytest.mark.parametrize("sellers,k", [(500, 5), (500, 50), (3, 10), (40, 1)])
+    def test_nearest_matches_brute_force(self, sellers, k):
+        """Test that ring scans return the same sellers as a full scan"""
+        index, prefixes = random_index(sellers, sellers)
+        for _, lat, lng in prefixes[:50]:
+            expected = np.sort(haversine_km(lat, lng, index.seller_lat, index.seller_lng))[:k]
+            found = [distance for _, distance in index.nearest_sellers(lat, lng, k)]
+            assert found == pytest.approx(expected.tolist())
+
+    def test_unknown_prefixes(self):
+        """Test that sellers and prefixes without coordinates are skipped"""
+        index = GeoIndex([("01001", -23.55, -46.63)], [SellerLocation("s1", "99999", None, None)])
+        assert len(index) == 0
+        assert index.nearest_sellers(-23.55, -46.63, 3) == []
+        assert index.coordinates("99999") is None
+        assert index.distance_km("01001", "99999") is None
+
+    def test_clear_invalidates_every_process_sharing_the_counter(self):
+        """Test that clear() in one worker makes the other workers rebuild their index"""
+        invalidations = multiprocessing.Value("q", 0)
+        workers = [GeoIndexCache(max_age=3600), GeoIndexCache(max_age=3600)]
+        builds = []
+
+        def loader():
+            builds.append(1)
+            return GeoIndex([], [])
+
+        for cache in workers:
+            cache.share_invalidations(invalidations)
+            cache.get(loader)
+        workers[1].get(loader)
+        assert len(builds) == 2
+        
+        workers[0].clear()
+        workers[1].get(loader)
+        workers[1].get(loader)
+        assert len(builds) == 3
+
+    def test_expired_index_served_while_rebuilding_in_background(self):
+        """Test that an expired index keeps serving until its background replacement is swapped in"""
+        old, new = GeoIndex([], []), GeoIndex([("01001", -23.55, -46.63)], [])
+        release, rebuilt = threading.Event(), threading.Event()
+
+        def background_loader():
+            release.wait(5)
+            rebuilt.set()
+            return new
+
+        cache = GeoIndexCache(max_age=0)
+        assert cache.get(lambda: old) is old
+        assert cache.get(lambda: pytest.fail("built on the request path"), background_loader) is old
+        assert cache.get(lambda: pytest.fail("built on the request path"), background_loader) is old
+        release.set()
+        assert rebuilt.wait(5)
+        for _ in range(100):
+            if cache._index is new:
+                break
+            time.sleep(0.01)
+        assert cache._index is new
+
+    def test_failed_background_rebuild_keeps_old_index(self):
+        """Test that a failing rebuild leaves the current index in place and backs off"""
+        old = GeoIndex([], [])
+        attempts = []
+
+        def failing_loader():
+            attempts.append(1)
+            raise RuntimeError("database unavailable")
+
+        cache = GeoIndexCache(max_age=0, retry_seconds=3600)
+        cache.get(lambda: old)
+        assert cache.get(lambda: old, failing_loader) is old
+        for _ in range(100):
+            if not cache._rebuilding:
+                break
+            time.sleep(0.01)
+        assert cache.get(lambda: old, failing_loader) is old
+        assert len(attempts) == 1
+
+
+class TestGeoEndpoints:
+    """Test suite for nearest-seller and delivery distance endpoints"""
+
+    @pytest.fixture(autouse=True)
+    def locations(self, db_session):
+        db_session.add_all([
+            models.Geolocation(geolocation_zip_code_prefix="01001", geolocation_lat=-23.55, geolocation_lng=-46.63),
+            models.Geolocation(geolocation_zip_code_prefix="20001", geolocation_lat=-22.91, geolocation_lng=-43.17),
+            models.Geolocation(geolocation_zip_code_prefix="30001", geolocation_lat=-19.92, geolocation_lng=-43.94),
+            models.Seller(seller_id="seller-sp", seller_zip_code_prefix="01001", seller_state="SP"),
+            models.Seller(seller_id="seller-rj", seller_zip_code_prefix="20001", seller_state="RJ"),
+            models.Seller(seller_id="seller-mg", seller_zip_code_prefix="30001", seller_state="MG"),
+            models.Seller(seller_id="seller-nowhere", seller_zip_code_prefix="99999"),
+            models.Customer(customer_id="customer-rj", customer_unique_id="u-rj", customer_zip_code_prefix="20001"),
+            models.Customer(customer_id="customer-x", customer_unique_id="u-x", customer_zip_code_prefix="99999"),
+            models.Order(order_id="order-1", customer_id="customer-rj", order_status="delivered"),
+            models.OrderItem(order_id="order-1", order_item_id=1, seller_id="seller-sp", price=10.0, freight_value=5.0),
+        ])
+        db_session.flush()
+
+    def test_nearest_sellers(self, client):
+        """Test that sellers are ranked by distance from the customer"""
+        response = client.get("/api/v1/customers/customer-rj/nearest-sellers?k=2")
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert [seller["seller_id"] for seller in data] == ["seller-rj", "seller-mg"]
+        assert data[0]["distance_km"] == 0
+        assert data[1]["distance_km"] == pytest.approx(341, abs=5)
+
+    def test_nearest_sellers_unknown_customer_location(self, client):
+        """Test 404 for a missing customer and for a customer without coordinates"""
+        assert client.get("/api/v1/customers/missing/nearest-sellers").status_code == status.HTTP_404_NOT_FOUND
+        response = client.get("/api/v1/customers/customer-x/nearest-sellers")
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        assert "99999" in response.json()["detail"]
+
+    def test_order_item_distance(self, client):
+        """Test the seller-to-customer distance of an order item"""
+        response = client.get("/api/v1/orders/order-1/items/1/distance")
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert data["seller_id"] == "seller-sp"
+        assert data["customer_id"] == "customer-rj"
+        assert data["distance_km"] == pytest.approx(361, abs=5)
+        
+        response = client.get("/api/v1/orders/order-1/items/2/distance")
+        assert response.status_code == status.HTTP_404_NOT_FOUND
@@ -0,0 +1,122 @@
+import csv
+import pytest
+from sqlalchemy import create_engine, func, select
+from app.db import models
+from app.db.ingest_olist import ingest
+
+
+def write_csv(path, header, rows):
+    with open(path, "w", newline="", encoding="utf-8") as handle:
+        writer = csv.writer(handle)
+        writer.writerow(header)
+        writer.writerows(rows)
+
+
+@pytest.fixture
+def olist_dir(tmp_path):
+    write_csv(
+        tmp_path / "olist_customers_dataset.csv",
+        ["customer_id", "customer_unique_id", "customer_zip_code_prefix", "customer_city", "customer_state"],
+        # One person (customer_unique_id) has a customer_id per order
+        [["c1", "u1", "01037", "sao paulo", "SP"], ["c2", "u1", "22041", "rio de janeiro", "RJ"]],
+    )
+    write_csv(
+        tmp_path / "olist_sellers_dataset.csv",
+        ["seller_id", "seller_zip_code_prefix", "seller_city", "seller_state"],
+        [["s1", "13023", "campinas", "SP"]],
+    )
+    write_csv(
+        tmp_path / "olist_products_dataset.csv",
+        ["product_id", "product_category_name", "product_name_lenght", "product_description_lenght",
+         "product_photos_qty", "product_weight_g", "product_length_cm", "product_height_cm", "product_width_cm"],
+        [["p1", "perfumaria", "40", "287", "1", "225", "16", "10", "14"]],
+    )
+    write_csv(
+        tmp_path / "olist_geolocation_dataset.csv",
+        ["geolocation_zip_code_prefix", "geolocation_lat", "geolocation_lng", "geolocation_city", "geolocation_state"],
+        [
+            ["01037", "-23.0", "-46.0", "sao paulo", "SP"],
+            ["01037", "-24.0", "-47.0", "sao paulo", "SP"],
+            ["22041", "-22.9", "-43.1", "rio de janeiro", "RJ"],
+        ],
+    )
+    write_csv(
+        tmp_path / "olist_orders_dataset.csv",
+        ["order_id", "customer_id", "order_status", "order_purchase_timestamp", "order_approved_at",
+         "order_delivered_carrier_date", "order_delivered_customer_date", "order_estimated_delivery_date"],
+        [["o1", "c1", "delivered", "2017-10-02 10:56:33", "2017-10-02 11:07:15", "", "", "2017-10-18 00:00:00"]],
+    )
+    write_csv(
+        tmp_path / "olist_order_items_dataset.csv",
+        ["order_id", "order_item_id", "product_id", "seller_id", "shipping_limit_date", "price", "freight_value"],
+        [["o1", "1", "p1", "s1", "2017-10-06 11:07:15", "29.99", "8.72"]],
+    )
+    write_csv(
+        tmp_path / "olist_order_reviews_dataset.csv",
+        ["review_id", "order_id", "review_score", "review_comment_title", "review_comment_message",
+         "review_creation_date", "review_answer_timestamp"],
+        [
+            ["r1", "o1", "4", "", "", "2017-10-11 00:00:00", "2017-10-12 03:43:48"],
+            ["r1", "o1", "4", "", "", "2017-10-11 00:00:00", "2017-10-12 03:43:48"],
+        ],
+    )
+    write_csv(
+        tmp_path / "olist_closed_deals_dataset.csv",
+        ["mql_id", "seller_id", "sdr_id", "sr_id", "won_date", "business_segment", "lead_type",
+         "lead_behaviour_profile", "has_company", "has_gtin", "average_stock", "business_type",
+         "declared_product_catalog_size", "declared_monthly_revenue"],
+        [["m1", "s1", "sdr1", "sr1", "2018-02-26 19:58:54", "pet", "online_medium", "cat", "", "True", "", "reseller", "", "0.0"]],
+    )
+    return tmp_path
+
+
+class TestIngestOlist:
+    """Test suite for the Olist CSV loader (executemany fallback path)"""
+
+    def test_ingest_loads_all_files(self, olist_dir):
+        """Test that every present file is loaded in foreign key order"""
+        engine = create_engine("sqlite://")
+        results = {result.table: result.rows for result in ingest(engine, str(olist_dir))}
+        assert results == {
+            "customers": 2,
+            "sellers": 1,
+            "products": 1,
+            "geolocation": 2,
+            "leads_closed": 1,
+            "orders": 1,
+            "order_items": 1,
+            "order_reviews": 1,
+        }
+
+        with engine.connect() as connection:
+            product = connection.execute(select(models.Product.__table__)).one()
+            assert product.product_name_length == 40
+            lead = connection.execute(select(models.LeadsClosed.__table__)).one()
+            assert lead.has_gtin is True
+            order = connection.execute(select(models.Order.__table__)).one()
+            assert order.order_purchase_timestamp.year == 2017
+            assert order.total_amount == pytest.approx(38.71)
+            assert order.item_count == 1
+            assert order.order_delivered_customer_date is None
+
+    def test_geolocation_prefixes_are_deduplicated(self, olist_dir):
+        """Test that repeated zip prefixes collapse to one averaged row"""
+        engine = create_engine("sqlite://")
+        ingest(engine, str(olist_dir))
+
+        with engine.connect() as connection:
+            row = connection.execute(
+                select(models.Geolocation.__table__)
+                .where(models.Geolocation.geolocation_zip_code_prefix == "01037")
+            ).one()
+            assert row.geolocation_lat == pytest.approx(-23.5)
+            assert row.geolocation_lng == pytest.approx(-46.5)
+
+    def test_truncate_allows_reloading(self, olist_dir):
+        """Test that --truncate clears existing rows before loading again"""
+        engine = create_engine("sqlite://")
+        ingest(engine, str(olist_dir))
+        ingest(engine, str(olist_dir), truncate=True)
+
+        with engine.connect() as connection:
+            assert connection.execute(select(func.count()).select_from(models.Customer.__table__)).scalar() == 2
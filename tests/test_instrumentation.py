@@ -0,0 +1,67 @@
+import logging
+import re
+import pytest
+from fastapi import status
+from app.core.config import settings
+from app.db.instrumentation import QueryStats
+
+
+def server_timing(response):
+    """Parse a Server-Timing header into {metric: (duration, description)}"""
+    metrics = {}
+    for metric in response.headers["Server-Timing"].split(", "):
+        name, *params = metric.split(";")
+        values = dict(param.split("=", 1) for param in params)
+        metrics[name] = (float(values["dur"]), values.get("desc", "").strip('"'))
+    return metrics
+
+
+class TestQueryInstrumentation:
+    """Test suite for per-request SQL instrumentation"""
+
+    def test_server_timing_reports_queries(self, client, sample_customer):
+        """Test that each response reports its statement count and database time"""
+        customer_id = client.post("/api/v1/customers/", json=sample_customer).json()["customer_id"]
+        
+        response = client.get(f"/api/v1/customers/{customer_id}/orders")
+        metrics = server_timing(response)
+        # Customer lookup and the (empty) orders page
+        assert metrics["db"][1] == "queries=2"
+        assert 0 <= metrics["db-slowest"][0] <= metrics["db"][0] <= metrics["app"][0]
+        
+        metrics = server_timing(client.get("/health"))
+        assert metrics["db"] == (0.0, "queries=0")
+
+    def test_query_count_warning(self, client, sample_customer, monkeypatch, caplog):
+        """Test that requests over the configured statement count log a warning"""
+        customer_id = client.post("/api/v1/customers/", json=sample_customer).json()["customer_id"]
+        monkeypatch.setattr(settings, "QUERY_COUNT_WARNING_THRESHOLD", 1)
+        
+        with caplog.at_level(logging.INFO, logger="app.main"):
+            client.get(f"/api/v1/customers/{customer_id}")
+            client.get(f"/api/v1/customers/{customer_id}/orders")
+        
+        info = [record.getMessage() for record in caplog.records if record.levelno == logging.INFO]
+        assert any(re.search(r"GET /api/v1/customers/\{customer_id\} 200 .* queries=1", line) for line in info)
+        warnings = [record.getMessage() for record in caplog.records if record.levelno == logging.WARNING]
+        assert len(warnings) == 1
+        assert "/api/v1/customers/{customer_id}/orders ran 2 SQL statements (threshold 1)" in warnings[0]
+        assert "SELECT" in warnings[0]
+
+    def test_instrumentation_disabled(self, client, monkeypatch):
+        """Test that no Server-Timing header is sent when instrumentation is off"""
+        monkeypatch.setattr(settings, "QUERY_INSTRUMENTATION", False)
+        response = client.get("/health")
+        assert response.status_code == status.HTTP_200_OK
+        assert "Server-Timing" not in response.headers
+
+    def test_query_stats_tracks_slowest(self):
+        """Test QueryStats accumulation"""
+        stats = QueryStats()
+        stats.record("SELECT 1", 0.002)
+        stats.record("SELECT 2", 0.005)
+        stats.record("SELECT 3", 0.001)
+        assert stats.count == 3
+        assert stats.total_seconds == pytest.approx(0.008)
+        assert stats.slowest_statement == "SELECT 2"
+        assert stats.server_timing() == 'db;dur=8.00;desc="queries=3", db-slowest;dur=5.00'
@@ -0,0 +1,60 @@
+import pytest
+from fastapi import status
+from prometheus_client import REGISTRY
+from app.db import models
+
+
+def sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+class TestMetrics:
+    """Test suite for the Prometheus /metrics endpoint"""
+
+    def test_request_latency_labelled_by_route_template(self, client):
+        """Test that request metrics use route templates, not raw paths"""
+        labels = {"method": "GET", "route": "/api/v1/orders/{order_id}", "status": "404"}
+        before = sample("http_request_duration_seconds_count", **labels)
+        client.get("/api/v1/orders/missing-1")
+        client.get("/api/v1/orders/missing-2")
+        assert sample("http_request_duration_seconds_count", **labels) - before == 2
+        
+        body = client.get("/metrics").text
+        assert 'route="/api/v1/orders/{order_id}"' in body
+        assert "missing-1" not in body
+        assert sample("http_requests_in_progress", method="GET", route="/api/v1/orders/{order_id}") == 0
+
+    def test_unmatched_paths_share_one_label(self, client):
+        """Test that unknown paths do not create new label values"""
+        labels = {"method": "GET", "route": "<unmatched>", "status": "404"}
+        before = sample("http_request_duration_seconds_count", **labels)
+        client.get("/no-such-path/1")
+        client.get("/no-such-path/2")
+        assert sample("http_request_duration_seconds_count", **labels) - before == 2
+
+    def test_pool_and_cache_metrics(self, client):
+        """Test that pool utilization and cache counters are published"""
+        response = client.get("/metrics")
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"].startswith("text/plain")
+        assert 'db_pool_utilization{pool="sync"}' in response.text
+        assert "cache_hit_ratio" in response.text
+        assert "cache_hits_total" in response.text
+
+    def test_orders_created_counter(self, client, db_session, sample_customer):
+        """Test that single and batch order creation are counted"""
+        db_session.add(models.Seller(seller_id="test-seller-1"))
+        db_session.commit()
+        customer_id = client.post("/api/v1/customers/", json=sample_customer).json()["customer_id"]
+        client.post("/api/v1/products/", json={"product_id": "test-product-1"})
+        order = {
+            "customer_id": customer_id,
+            "items": [{"order_item_id": 1, "product_id": "test-product-1", "seller_id": "test-seller-1", "price": 1.0}]
+        }
+        single = sample("orders_created_total", source="single")
+        batch = sample("orders_created_total", source="batch")
+        
+        client.post("/api/v1/orders/", json=order)
+        client.post("/api/v1/orders/batch", json={"orders": [order, order, {**order, "customer_id": "missing"}]})
+        assert sample("orders_created_total", source="single") - single == 1
+        assert sample("orders_created_total", source="batch") - batch == 2
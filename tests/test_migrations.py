@@ -0,0 +1,94 @@
+import pytest
+from alembic import command
+from alembic.autogenerate import compare_metadata
+from alembic.config import Config
+from alembic.migration import MigrationContext
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.core.pagination import cursor_for
+from app.crud import order as crud_order
+from app.db import models
+
+
+def alembic_config(database_url):
+    config = Config("alembic.ini")
+    config.set_main_option("sqlalchemy.url", database_url)
+    return config
+
+
+class TestMigrations:
+    """Test suite for the Alembic revisions"""
+
+    def test_upgrade_matches_models(self, tmp_path):
+        """Test that upgrading to head produces exactly the schema the models declare"""
+        database_url = f"sqlite:///{tmp_path / 'migrations.db'}"
+        command.upgrade(alembic_config(database_url), "head")
+
+        engine = create_engine(database_url)
+        with engine.connect() as connection:
+            assert compare_metadata(MigrationContext.configure(connection), models.Base.metadata) == []
+            index_names = {index["name"] for index in inspect(connection).get_indexes("orders")}
+        assert "ix_orders_customer_id_purchase_timestamp" in index_names
+        assert "ix_orders_status_purchase_timestamp" in index_names
+
+    def test_downgrade_to_base(self, tmp_path):
+        """Test that every revision can be rolled back"""
+        database_url = f"sqlite:///{tmp_path / 'migrations.db'}"
+        config = alembic_config(database_url)
+        command.upgrade(config, "head")
+        command.downgrade(config, "base")
+
+        engine = create_engine(database_url)
+        assert inspect(engine).get_table_names() == ["alembic_version"]
+
+    def test_upgrade_from_initial_schema_backfills_order_totals(self, tmp_path):
+        """Test that a database at the initial schema upgrades with its existing orders' totals filled in"""
+        database_url = f"sqlite:///{tmp_path / 'migrations.db'}"
+        config = alembic_config(database_url)
+        command.upgrade(config, "0001")
+
+        engine = create_engine(database_url)
+        assert "total_amount" not in {column["name"] for column in inspect(engine).get_columns("orders")}
+        with engine.begin() as connection:
+            connection.execute(text("INSERT INTO orders (order_id) VALUES ('o1'), ('o2')"))
+            connection.execute(text(
+                "INSERT INTO order_items (order_id, order_item_id, price, freight_value) "
+                "VALUES ('o1', 1, 10.0, 2.0), ('o1', 2, 5.0, NULL)"
+            ))
+        command.upgrade(config, "head")
+
+        with engine.connect() as connection:
+            totals = connection.execute(
+                text("SELECT order_id, total_amount, item_count FROM orders ORDER BY order_id")
+            ).all()
+            assert compare_metadata(MigrationContext.configure(connection), models.Base.metadata) == []
+        assert [tuple(row) for row in totals] == [("o1", 17.0, 2), ("o2", 0.0, 0)]
+
+    def test_orders_without_purchase_timestamp_are_paged(self, tmp_path):
+        """Test that an order stored with a NULL purchase timestamp gets one and is not skipped by cursors"""
+        database_url = f"sqlite:///{tmp_path / 'migrations.db'}"
+        config = alembic_config(database_url)
+        command.upgrade(config, "0010")
+
+        engine = create_engine(database_url)
+        with engine.begin() as connection:
+            connection.execute(text(
+                "INSERT INTO orders (order_id, order_purchase_timestamp, order_approved_at) VALUES "
+                "('o1', '2018-01-01 00:00:00.000000', NULL), "
+                "('o2', NULL, '2018-01-02 00:00:00.000000'), "
+                "('o3', '2018-01-03 00:00:00.000000', NULL)"
+            ))
+        command.upgrade(config, "head")
+
+        seen, cursor = [], None
+        with Session(engine) as db:
+            while True:
+                page = crud_order.get_orders(db, limit=2, cursor=cursor)
+                seen.extend(order.order_id for order in page)
+                if len(page) < 2:
+                    break
+                cursor = cursor_for(page[-1], crud_order.ORDER_KEYSET)
+            assert seen == ["o1", "o2", "o3"]
+            with pytest.raises(IntegrityError):
+                db.execute(text("UPDATE orders SET order_purchase_timestamp = NULL WHERE order_id = 'o1'"))
@@ -1,10 +1,21 @@
 import pytest
 from fastapi import status
+from app.core.pagination import encode_cursor
+from app.db import models
 
 
 class TestOrders:
     """Test suite for order endpoints"""
 
+    @pytest.fixture(autouse=True)
+    def sellers(self, db_session):
+        """Order items must reference existing sellers"""
+        db_session.add_all([
+            models.Seller(seller_id="test-seller-1"),
+            models.Seller(seller_id="test-seller-2"),
+        ])
+        db_session.commit()
+
     def setup_test_data(self, client):
         """Helper method to set up test data"""
         # Create a customer
@@ -95,6 +106,44 @@ class TestOrders:
         assert response.status_code == status.HTTP_404_NOT_FOUND
         assert "Product nonexistent-product not found" in response.json()["detail"]
 
+    def test_create_order_missing_references_named(self, client):
+        """Test that every missing product and seller id is named in the 404"""
+        customer_id = self.setup_test_data(client)
+        
+        order_data = {
+            "customer_id": customer_id,
+            "order_status": "pending",
+            "items": [
+                {
+                    "order_item_id": 1,
+                    "product_id": "missing-product-b",
+                    "seller_id": "test-seller-1",
+                    "price": 10.0
+                },
+                {
+                    "order_item_id": 2,
+                    "product_id": "missing-product-a",
+                    "seller_id": "test-seller-1",
+                    "price": 10.0
+                }
+            ]
+        }
+        response = client.post("/api/v1/orders/", json=order_data)
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        assert response.json()["detail"] == "Products missing-product-a, missing-product-b not found"
+        
+        order_data["items"] = [
+            {
+                "order_item_id": 1,
+                "product_id": "test-product-1",
+                "seller_id": "nonexistent-seller",
+                "price": 10.0
+            }
+        ]
+        response = client.post("/api/v1/orders/", json=order_data)
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        assert response.json()["detail"] == "Seller nonexistent-seller not found"
+
     def test_get_all_orders(self, client):
         """Test getting all orders"""
         customer_id = self.setup_test_data(client)
@@ -367,3 +416,361 @@ class TestOrders:
         assert response.status_code == status.HTTP_200_OK
         data = response.json()
         assert len(data) == 2
+
+    def test_order_list_totals_without_n_plus_one(self, client, db_session):
+        """Test that order lists return per-order totals with a constant number of queries"""
+        from sqlalchemy import event
+
+        customer_id = self.setup_test_data(client)
+        for price in (10.0, 20.0, 30.0):
+            order_data = {
+                "customer_id": customer_id,
+                "order_status": "pending",
+                "items": [
+                    {
+                        "order_item_id": 1,
+                        "product_id": "test-product-1",
+                        "seller_id": "test-seller-1",
+                        "price": price,
+                        "freight_value": 1.0
+                    },
+                    {
+                        "order_item_id": 2,
+                        "product_id": "test-product-1",
+                        "seller_id": "test-seller-1",
+                        "price": price,
+                        "freight_value": 1.0
+                    }
+                ]
+            }
+            client.post("/api/v1/orders/", json=order_data)
+
+        statements = []
+
+        def count_statement(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        engine = db_session.get_bind().engine
+        event.listen(engine, "before_cursor_execute", count_statement)
+        try:
+            response = client.get(f"/api/v1/customers/{customer_id}/orders")
+        finally:
+            event.remove(engine, "before_cursor_execute", count_statement)
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert sorted(order["total_amount"] for order in data) == [22.0, 42.0, 62.0]
+        assert all(len(order["items"]) == 2 for order in data)
+        # Customer lookup, the orders page, and one eager load of items
+        assert len(statements) == 3
+
+    def test_orders_cursor_pagination(self, client):
+        """Test walking all orders with keyset pagination"""
+        customer_id = self.setup_test_data(client)
+        
+        created_ids = set()
+        for i in range(5):
+            order_data = {
+                "customer_id": customer_id,
+                "order_status": "pending",
+                "items": [
+                    {
+                        "order_item_id": 1,
+                        "product_id": "test-product-1",
+                        "seller_id": "test-seller-1",
+                        "price": 99.99,
+                        "freight_value": 10.0
+                    }
+                ]
+            }
+            created_ids.add(client.post("/api/v1/orders/", json=order_data).json()["order_id"])
+        
+        seen_ids = []
+        response = client.get("/api/v1/orders/?limit=2")
+        while True:
+            assert response.status_code == status.HTTP_200_OK
+            seen_ids.extend(order["order_id"] for order in response.json())
+            next_cursor = response.headers.get("X-Next-Cursor")
+            if next_cursor is None:
+                break
+            response = client.get(f"/api/v1/orders/?limit=2&cursor={next_cursor}")
+        
+        assert len(seen_ids) == len(set(seen_ids))
+        assert created_ids <= set(seen_ids)
+
+    def test_fast_json_responses_match(self, client, monkeypatch):
+        """Test that the fast JSON path returns byte-identical order lists"""
+        from app.core.config import settings
+
+        customer_id = self.setup_test_data(client)
+        for i in range(3):
+            order_data = {
+                "customer_id": customer_id,
+                "order_status": "pending",
+                "items": [
+                    {
+                        "order_item_id": item_id,
+                        "product_id": "test-product-1",
+                        "seller_id": "test-seller-1",
+                        "price": 19.9 * (i + 1),
+                        "freight_value": 2.5,
+                        "shipping_limit_date": "2026-01-02T03:04:05Z"
+                    }
+                    for item_id in range(1, i + 2)
+                ]
+            }
+            client.post("/api/v1/orders/", json=order_data)
+        
+        order_id = client.get("/api/v1/orders/").json()[0]["order_id"]
+        urls = [
+            f"/api/v1/orders/{order_id}",
+            "/api/v1/orders/?limit=2",
+            "/api/v1/orders/status/pending",
+            f"/api/v1/customers/{customer_id}/orders",
+        ]
+        monkeypatch.setattr(settings, "FAST_JSON_RESPONSES", False)
+        expected = [client.get(url) for url in urls]
+        monkeypatch.setattr(settings, "FAST_JSON_RESPONSES", True)
+        for url, standard in zip(urls, expected):
+            fast = client.get(url)
+            assert fast.status_code == status.HTTP_200_OK
+            assert fast.content == standard.content
+            assert fast.headers.get("X-Next-Cursor") == standard.headers.get("X-Next-Cursor")
+            assert fast.headers["ETag"] == standard.headers["ETag"]
+
+    def test_export_orders(self, client):
+        """Test streaming order exports as NDJSON and CSV with filters"""
+        import csv
+        import io
+        import json
+
+        customer_id = self.setup_test_data(client)
+        order_ids = []
+        for order_status in ("pending", "delivered", "delivered"):
+            order_data = {
+                "customer_id": customer_id,
+                "order_status": order_status,
+                "items": [
+                    {
+                        "order_item_id": 1,
+                        "product_id": "test-product-1",
+                        "seller_id": "test-seller-1",
+                        "price": 10.0,
+                        "freight_value": 1.0
+                    }
+                ]
+            }
+            order_ids.append(client.post("/api/v1/orders/", json=order_data).json()["order_id"])
+        
+        response = client.get("/api/v1/orders/export?status=delivered")
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        rows = [json.loads(line) for line in response.text.splitlines()]
+        assert [row["order_id"] for row in rows] == order_ids[1:]
+        assert all(row["total_amount"] == 11.0 for row in rows)
+        
+        response = client.get("/api/v1/orders/export?format=csv&purchased_to=2000-01-01T00:00:00Z")
+        assert response.headers["content-disposition"] == 'attachment; filename="orders.csv"'
+        rows = list(csv.DictReader(io.StringIO(response.text)))
+        assert rows == []
+        
+        response = client.get("/api/v1/orders/export?format=csv&purchased_from=2000-01-01T00:00:00Z")
+        rows = list(csv.DictReader(io.StringIO(response.text)))
+        assert [row["order_id"] for row in rows] == order_ids
+        assert rows[0]["order_status"] == "pending"
+        assert rows[0]["order_approved_at"] == ""
+
+    def test_export_stream_closes_its_own_session(self, db_session):
+        """Test that a stream abandoned mid-way closes the session it opened, not the caller's"""
+        from sqlalchemy import select
+        from sqlalchemy.orm import Session
+        from app.core.export import ExportFormat, stream_rows
+
+        opened = []
+
+        def session_factory():
+            session = Session(bind=db_session.connection())
+            opened.append(session)
+            return session
+
+        db_session.add_all([models.Order(order_id=f"export-{i}") for i in range(3)])
+        db_session.flush()
+        stream = stream_rows(session_factory, select(models.Order.order_id), ExportFormat.csv, batch_size=1)
+        assert next(stream) == b"order_id\r\n"
+        assert next(stream)
+        stream.close()
+        assert len(opened) == 1
+        assert not opened[0].in_transaction()
+        assert db_session.in_transaction()
+
+    def test_export_orders_invalid_format(self, client):
+        """Test that unknown export formats are rejected"""
+        response = client.get("/api/v1/orders/export?format=xml")
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+    def test_sparse_fieldsets(self, client, db_session):
+        """Test ?fields= and ?include= on order responses"""
+        from sqlalchemy import event
+
+        customer_id = self.setup_test_data(client)
+        order_data = {
+            "customer_id": customer_id,
+            "order_status": "pending",
+            "items": [
+                {
+                    "order_item_id": 1,
+                    "product_id": "test-product-1",
+                    "seller_id": "test-seller-1",
+                    "price": 50.0,
+                    "freight_value": 5.0
+                }
+            ]
+        }
+        order_id = client.post("/api/v1/orders/", json=order_data).json()["order_id"]
+        db_session.add(models.OrderPayment(
+            order_id=order_id, payment_sequential=1, payment_type="credit_card", payment_installments=1,
+            payment_value=55.0
+        ))
+        db_session.commit()
+        
+        statements = []
+
+        def count_statement(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        engine = db_session.get_bind().engine
+        event.listen(engine, "before_cursor_execute", count_statement)
+        try:
+            response = client.get("/api/v1/orders/?fields=order_id,order_status,total_amount")
+        finally:
+            event.remove(engine, "before_cursor_execute", count_statement)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == [{"order_id": order_id, "order_status": "pending", "total_amount": 55.0}]
+        # Only the order page is read; items are neither joined nor loaded
+        assert len(statements) == 1
+        assert "order_items" not in statements[0]
+        assert "customer_id" not in statements[0].split("FROM")[0]
+        
+        response = client.get(f"/api/v1/orders/{order_id}?fields=order_id&include=items,payments")
+        data = response.json()
+        assert set(data) == {"order_id", "items", "payments"}
+        assert data["items"][0]["price"] == 50.0
+        assert data["payments"][0]["payment_type"] == "credit_card"
+        
+        response = client.get(f"/api/v1/customers/{customer_id}/orders?include=reviews")
+        data = response.json()
+        assert data[0]["total_amount"] == 55.0
+        assert data[0]["reviews"] == []
+        assert "items" not in data[0]
+        
+        # Different representations of the same rows carry different ETags
+        full = client.get(f"/api/v1/orders/{order_id}")
+        sparse = client.get(f"/api/v1/orders/{order_id}?fields=order_id")
+        assert full.headers["ETag"] != sparse.headers["ETag"]
+        response = client.get(
+            f"/api/v1/orders/{order_id}?fields=order_id", headers={"If-None-Match": sparse.headers["ETag"]}
+        )
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    def test_sparse_fieldsets_unknown_names(self, client):
+        """Test that unknown fields and relationships are rejected by name"""
+        response = client.get("/api/v1/orders/?fields=order_id,password")
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.json()["detail"] == "Unknown order fields: password"
+        
+        response = client.get("/api/v1/orders/status/pending?include=customer")
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.json()["detail"] == "Unknown order relations: customer"
+
+    def test_orders_invalid_cursor(self, client):
+        """Test that a malformed cursor is rejected"""
+        response = client.get("/api/v1/orders/?cursor=not-a-cursor")
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert "cursor" in response.json()["detail"]
+        
+        # Well-formed cursors whose values do not fit the key columns
+        for values in (["2018-01-01T00:00:00", ["x"]], ["2018-01-01T00:00:00", {"a": 1}], [True, "o1"]):
+            response = client.get(f"/api/v1/orders/?cursor={encode_cursor(values)}")
+            assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_create_orders_batch(self, client):
+        """Test POST /orders/batch creates valid orders and reports invalid ones"""
+        customer_id = self.setup_test_data(client)
+        
+        def order_for(customer, product_id, price):
+            return {
+                "customer_id": customer,
+                "order_status": "pending",
+                "items": [
+                    {
+                        "order_item_id": 1,
+                        "product_id": product_id,
+                        "seller_id": "test-seller-1",
+                        "price": price,
+                        "freight_value": 10.0
+                    }
+                ]
+            }
+        
+        batch = {
+            "orders": [
+                order_for(customer_id, "test-product-1", 90.0),
+                order_for("nonexistent-customer", "test-product-1", 90.0),
+                order_for(customer_id, "nonexistent-product", 90.0),
+                order_for(customer_id, "test-product-1", 40.0),
+            ]
+        }
+        response = client.post("/api/v1/orders/batch", json=batch)
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert data["created"] == 2
+        assert data["failed"] == 2
+        
+        results = data["results"]
+        assert [result["index"] for result in results] == [0, 1, 2, 3]
+        assert results[0]["total_amount"] == 100.0
+        assert results[1]["error"] == "Customer not found"
+        assert results[2]["error"] == "Product nonexistent-product not found"
+        assert results[3]["total_amount"] == 50.0
+        
+        # Created orders are readable like any other order
+        response = client.get(f"/api/v1/orders/{results[3]['order_id']}")
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["total_amount"] == 50.0
+
+    def test_create_orders_batch_validation(self, client):
+        """Test that an empty batch is rejected"""
+        response = client.post("/api/v1/orders/batch", json={"orders": []})
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+    def test_reconcile_order_totals(self, client, db_session):
+        """Test that drifted stored totals are recomputed from order items"""
+        from app.crud.order import reconcile_order_totals
+
+        customer_id = self.setup_test_data(client)
+        order_data = {
+            "customer_id": customer_id,
+            "order_status": "pending",
+            "items": [
+                {
+                    "order_item_id": 1,
+                    "product_id": "test-product-1",
+                    "seller_id": "test-seller-1",
+                    "price": 99.99,
+                    "freight_value": 10.0
+                }
+            ]
+        }
+        order_id = client.post("/api/v1/orders/", json=order_data).json()["order_id"]
+        
+        db_order = db_session.get(models.Order, order_id)
+        db_order.total_amount = 1.0
+        db_order.item_count = 5
+        db_session.commit()
+        
+        assert reconcile_order_totals(db_session) == 1
+        assert reconcile_order_totals(db_session) == 0
+        
+        data = client.get(f"/api/v1/orders/{order_id}").json()
+        assert data["total_amount"] == 109.99
+        assert data["item_count"] == 1
@@ -118,8 +118,111 @@ class TestProducts:
         data = response.json()
         assert len(data) == 2
 
+    def test_get_products_cursor_pagination(self, client):
+        """Test products keyset pagination"""
+        for i in range(5):
+            product_data = {
+                "product_id": f"test-product-{i}",
+                "product_category_name": "electronics"
+            }
+            client.post("/api/v1/products/", json=product_data)
+        
+        first_page = client.get("/api/v1/products/category/electronics?limit=3")
+        assert first_page.status_code == status.HTTP_200_OK
+        next_cursor = first_page.headers["X-Next-Cursor"]
+        
+        second_page = client.get(f"/api/v1/products/category/electronics?limit=3&cursor={next_cursor}")
+        assert second_page.status_code == status.HTTP_200_OK
+        assert "X-Next-Cursor" not in second_page.headers
+        
+        product_ids = [p["product_id"] for p in first_page.json() + second_page.json()]
+        assert product_ids == [f"test-product-{i}" for i in range(5)]
+
     def test_create_product_validation(self, client):
         """Test product creation with invalid data"""
         invalid_product = {}  # Missing required fields
         response = client.post("/api/v1/products/", json=invalid_product)
         assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+    def test_product_reads_are_cached_and_invalidated(self, client, sample_product):
+        """Test that product and category reads are cached and writes invalidate them"""
+        client.post("/api/v1/products/", json=sample_product)
+        product_id = sample_product["product_id"]
+        
+        client.get(f"/api/v1/products/{product_id}")
+        client.get("/api/v1/products/category/electronics")
+        before = client.get("/api/v1/admin/cache").json()
+        client.get(f"/api/v1/products/{product_id}")
+        client.get("/api/v1/products/category/electronics")
+        after = client.get("/api/v1/admin/cache").json()
+        assert after["hits"] - before["hits"] == 2
+        
+        # Moving the product to another category updates both listings and the detail read
+        client.put(f"/api/v1/products/{product_id}", json={"product_category_name": "books"})
+        assert client.get(f"/api/v1/products/{product_id}").json()["product_category_name"] == "books"
+        assert client.get("/api/v1/products/category/electronics").json() == []
+        assert len(client.get("/api/v1/products/category/books").json()) == 1
+        
+        client.delete(f"/api/v1/products/{product_id}")
+        assert client.get(f"/api/v1/products/{product_id}").status_code == status.HTTP_404_NOT_FOUND
+        assert client.get("/api/v1/products/category/books").json() == []
+
+    def test_product_conditional_get(self, client, sample_product):
+        """Test ETag and Last-Modified validators on product reads"""
+        client.post("/api/v1/products/", json=sample_product)
+        url = f"/api/v1/products/{sample_product['product_id']}"
+        
+        response = client.get(url)
+        etag = response.headers["ETag"]
+        assert etag.startswith('W/"')
+        assert "Last-Modified" in response.headers
+        
+        not_modified = client.get(url, headers={"If-None-Match": etag})
+        assert not_modified.status_code == status.HTTP_304_NOT_MODIFIED
+        assert not_modified.content == b""
+        assert not_modified.headers["ETag"] == etag
+        
+        since = client.get(url, headers={"If-Modified-Since": response.headers["Last-Modified"]})
+        assert since.status_code == status.HTTP_304_NOT_MODIFIED
+        
+        # Updating the product changes its validators
+        client.put(url, json={"product_category_name": "books"})
+        response = client.get(url, headers={"If-None-Match": etag})
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["ETag"] != etag
+
+    def test_product_list_conditional_get(self, client, sample_product):
+        """Test that list ETags change when a row is added"""
+        client.post("/api/v1/products/", json=sample_product)
+        etag = client.get("/api/v1/products/").headers["ETag"]
+        assert client.get("/api/v1/products/", headers={"If-None-Match": etag}).status_code == status.HTTP_304_NOT_MODIFIED
+        
+        client.post("/api/v1/products/", json={**sample_product, "product_id": "test-product-2"})
+        assert client.get("/api/v1/products/", headers={"If-None-Match": etag}).status_code == status.HTTP_200_OK
+
+    def test_fast_json_products_match(self, client, sample_product, monkeypatch):
+        """Test that the fast JSON path returns a byte-identical product list"""
+        from app.core.config import settings
+
+        client.post("/api/v1/products/", json=sample_product)
+        client.post("/api/v1/products/", json={"product_id": "test-product-2"})
+        
+        monkeypatch.setattr(settings, "FAST_JSON_RESPONSES", False)
+        standard = client.get("/api/v1/products/")
+        monkeypatch.setattr(settings, "FAST_JSON_RESPONSES", True)
+        fast = client.get("/api/v1/products/")
+        assert fast.status_code == status.HTTP_200_OK
+        assert fast.content == standard.content
+
+    def test_export_products(self, client, sample_product):
+        """Test streaming an NDJSON export filtered by category"""
+        import json
+
+        client.post("/api/v1/products/", json=sample_product)
+        client.post("/api/v1/products/", json={"product_id": "test-product-2", "product_category_name": "books"})
+        
+        response = client.get("/api/v1/products/export?category=electronics")
+        assert response.status_code == status.HTTP_200_OK
+        rows = [json.loads(line) for line in response.text.splitlines()]
+        assert [row["product_id"] for row in rows] == [sample_product["product_id"]]
+        assert rows[0]["product_weight_g"] == 500.0
@@ -0,0 +1,170 @@
+from datetime import datetime
+import threading
+import time
+import numpy as np
+import pytest
+from fastapi import status
+from app.core.recommendations import (
+    Baskets,
+    CoPurchaseCounts,
+    RecommendationCache,
+    RelatedProductsIndex,
+    basket_pairs,
+)
+from app.crud import recommendation as crud_recommendation
+from app.db import models
+
+BASKETS = [
+    ("o1", ["a", "b", "c"]),
+    ("o2", ["a", "b"]),
+    ("o3", ["a", "c", "c"]),
+    ("o4", ["d"]),
+]
+
+
+def columns(baskets):
+    return [order_id for order_id, items in baskets for _ in items], [p for _, items in baskets for p in items]
+
+
+class TestCoPurchaseIndex:
+    """Test suite for the co-purchase counts and top-K index"""
+
+    def test_basket_pairs(self):
+        """Test that each unordered pair of distinct products in a basket is emitted once"""
+        left, right = basket_pairs(np.array([0, 0, 0, 1, 1, 2]), np.array([2, 0, 1, 3, 3, 1]))
+        assert sorted(zip(left.tolist(), right.tolist())) == [(0, 1), (0, 2), (1, 2)]
+
+    def test_related_products(self):
+        """Test ranking by co-purchase count with ties broken by product id"""
+        counts = CoPurchaseCounts()
+        counts.add(*columns(BASKETS))
+        index = RelatedProductsIndex(counts, top_k=5)
+        assert index.related("a") == [("b", 2), ("c", 2)]
+        assert index.related("c") == [("a", 2), ("b", 1)]
+        assert index.related("d") == []
+        assert index.related("missing") == []
+        assert index.related("a", limit=1) == [("b", 2)]
+        assert RelatedProductsIndex(counts, top_k=1).related("c") == [("a", 2)]
+
+    def test_incremental_counts_match_full_count(self):
+        """Test that adding baskets in batches equals counting them all at once"""
+        full = CoPurchaseCounts()
+        full.add(*columns(BASKETS))
+        incremental = CoPurchaseCounts()
+        incremental.add(*columns(BASKETS[:2]))
+        incremental.add(*columns(BASKETS[2:]))
+        for product_id in "abcd":
+            assert (RelatedProductsIndex(incremental, 5).related(product_id)
+                    == RelatedProductsIndex(full, 5).related(product_id))
+
+    def test_cache_refreshes_incrementally(self):
+        """Test that a refresh asks only for orders after the high-water mark"""
+        calls = []
+
+        def loader(since):
+            calls.append(since)
+            if since is None:
+                return Baskets(*columns(BASKETS[:2]), datetime(2018, 1, 1))
+            return Baskets(*columns([("o5", ["c", "b"])]), datetime(2018, 1, 2))
+
+        cache = RecommendationCache(top_k=5, refresh_seconds=0, full_rebuild_seconds=3600)
+        assert cache.get(loader).related("b") == [("a", 2), ("c", 1)]
+        assert cache.get(loader).related("b") == [("a", 2), ("c", 2)]
+        assert calls == [None, datetime(2018, 1, 1)]
+
+        cache.full_rebuild_seconds = 0
+        assert cache.get(loader).related("b") == [("a", 2), ("c", 1)]
+        assert calls[-1] is None
+
+    def test_stale_index_served_while_refreshing_in_background(self):
+        """Test that a stale index keeps serving until the background refresh is swapped in"""
+        release, refreshed = threading.Event(), threading.Event()
+        calls = []
+
+        def background_loader(since):
+            calls.append(since)
+            release.wait(5)
+            refreshed.set()
+            return Baskets(*columns([("o5", ["c", "b"])]), datetime(2018, 1, 2))
+
+        def request_loader(since):
+            pytest.fail("refreshed on the request path")
+
+        cache = RecommendationCache(top_k=5, refresh_seconds=0, full_rebuild_seconds=3600)
+        old = cache.get(lambda since: Baskets(*columns(BASKETS[:2]), datetime(2018, 1, 1)))
+        assert cache.get(request_loader, background_loader) is old
+        assert cache.get(request_loader, background_loader) is old
+        release.set()
+        assert refreshed.wait(5)
+        for _ in range(100):
+            if cache._index is not old:
+                break
+            time.sleep(0.01)
+        assert cache._index.related("b") == [("a", 2), ("c", 2)]
+        # The old index was not changed by the refresh
+        assert old.related("b") == [("a", 2), ("c", 1)]
+        assert calls == [datetime(2018, 1, 1)]
+
+    def test_failed_background_refresh_keeps_old_index(self):
+        """Test that a failing refresh leaves the current index in place and backs off"""
+        attempts = []
+
+        def failing_loader(since):
+            attempts.append(since)
+            raise RuntimeError("database unavailable")
+
+        cache = RecommendationCache(top_k=5, refresh_seconds=0, full_rebuild_seconds=3600, retry_seconds=3600)
+        old = cache.get(lambda since: Baskets(*columns(BASKETS), datetime(2018, 1, 1)))
+        assert cache.get(failing_loader, failing_loader) is old
+        for _ in range(100):
+            if not cache._refreshing:
+                break
+            time.sleep(0.01)
+        assert cache.get(failing_loader, failing_loader) is old
+        assert len(attempts) == 1
+
+
+class TestRelatedProductsEndpoint:
+    """Test suite for GET /products/{product_id}/related"""
+
+    @pytest.fixture(autouse=True)
+    def orders(self, db_session):
+        db_session.add_all([models.Product(product_id=product_id) for product_id in ("p1", "p2", "p3")])
+        for number, (order_id, products, order_status) in enumerate([
+            ("o1", ["p1", "p2"], "delivered"),
+            ("o2", ["p1", "p2", "p3"], "delivered"),
+            ("o3", ["p1", "p3"], "canceled"),
+        ]):
+            db_session.add(models.Order(
+                order_id=order_id, order_status=order_status, order_purchase_timestamp=datetime(2018, 1, number + 1)
+            ))
+            db_session.add_all(
+                models.OrderItem(order_id=order_id, order_item_id=item, product_id=product_id, price=1.0)
+                for item, product_id in enumerate(products, start=1)
+            )
+        db_session.commit()
+
+    def test_load_baskets(self, db_session):
+        """Test that canceled orders are skipped and the high-water mark is returned"""
+        baskets = crud_recommendation.load_baskets(db_session)
+        assert sorted(zip(baskets.order_ids, baskets.product_ids)) == [
+            ("o1", "p1"), ("o1", "p2"), ("o2", "p1"), ("o2", "p2"), ("o2", "p3")
+        ]
+        assert baskets.high_water_mark == datetime(2018, 1, 3)
+        assert crud_recommendation.load_baskets(db_session, since=datetime(2018, 1, 1)).order_ids == ["o2"] * 3
+
+    def test_get_related_products(self, client):
+        """Test the related products of a product"""
+        response = client.get("/api/v1/products/p1/related")
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == [
+            {"product_id": "p2", "co_purchase_count": 2},
+            {"product_id": "p3", "co_purchase_count": 1},
+        ]
+        response = client.get("/api/v1/products/p3/related?limit=1")
+        assert response.json() == [{"product_id": "p1", "co_purchase_count": 1}]
+
+    def test_get_related_products_not_found(self, client):
+        """Test related products of a missing product"""
+        response = client.get("/api/v1/products/missing/related")
+        assert response.status_code == status.HTTP_404_NOT_FOUND
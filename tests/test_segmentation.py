@@ -0,0 +1,106 @@
+from datetime import datetime
+import numpy as np
+import pytest
+from fastapi import status
+from app.core.segmentation import SEGMENT_GRID, quintile_scores, score_rfm
+from app.crud import segmentation as crud_segmentation
+from app.db import models
+from app.schemas.segmentation import Segment
+
+
+class TestRFMScoring:
+    """Test suite for the vectorized RFM scoring"""
+
+    def test_quintile_scores(self):
+        """Test quintile buckets in both directions"""
+        values = np.arange(10.0)
+        assert quintile_scores(values).tolist() == [1, 1, 2, 2, 3, 3, 4, 4, 5, 5]
+        assert quintile_scores(values, higher_is_better=False).tolist() == [5, 5, 4, 4, 3, 3, 2, 2, 1, 1]
+        assert quintile_scores(np.empty(0)).tolist() == []
+
+    def test_tied_values_share_a_score(self):
+        """Test that one-order customers all get the lowest frequency score"""
+        assert quintile_scores(np.array([1, 1, 1, 1, 1, 1, 2, 3])).tolist() == [1, 1, 1, 1, 1, 1, 5, 5]
+
+    def test_segments(self):
+        """Test that recency and frequency scores map onto the segment grid"""
+        scores = score_rfm(np.array([1.0, 300.0]), np.array([5, 1]), np.array([100.0, 5.0]))
+        assert scores.segment.tolist() == ["champions", "hibernating"]
+        assert {str(name) for name in SEGMENT_GRID.flat} <= {segment.value for segment in Segment}
+
+
+class TestCustomerSegments:
+    """Test suite for the segmentation job and endpoints"""
+
+    @pytest.fixture(autouse=True)
+    def orders(self, db_session):
+        # c1 and c2 are the same person, who ordered twice
+        customers = [("c1", "u1"), ("c2", "u1"), ("c3", "u2"), ("c4", "u3"), ("c5", "u4")]
+        db_session.add_all(
+            models.Customer(customer_id=customer_id, customer_unique_id=unique_id)
+            for customer_id, unique_id in customers
+        )
+        db_session.add_all([
+            models.Order(order_id="o1", customer_id="c1", order_status="delivered", total_amount=50.0,
+                         order_purchase_timestamp=datetime(2018, 8, 1)),
+            models.Order(order_id="o2", customer_id="c2", order_status="delivered", total_amount=70.0,
+                         order_purchase_timestamp=datetime(2018, 9, 2)),
+            models.Order(order_id="o3", customer_id="c3", order_status="delivered", total_amount=20.0,
+                         order_purchase_timestamp=datetime(2017, 1, 1)),
+            models.Order(order_id="o4", customer_id="c4", order_status="delivered", total_amount=10.0,
+                         order_purchase_timestamp=datetime(2018, 9, 1)),
+            models.Order(order_id="o5", customer_id="c5", order_status="canceled", total_amount=999.0,
+                         order_purchase_timestamp=datetime(2018, 9, 1)),
+        ])
+        db_session.commit()
+
+    def test_compute_customer_segments(self, db_session):
+        """Test grouping by customer_unique_id, recency from the latest purchase and skipped cancellations"""
+        result = crud_segmentation.compute_customer_segments(db_session)
+        assert (result.customers, result.orders) == (3, 4)
+        assert result.as_of.replace(tzinfo=None) == datetime(2018, 9, 2)
+
+        person = crud_segmentation.get_customer_segment(db_session, "u1")
+        assert (person.frequency, person.monetary) == (2, 120.0)
+        assert person.recency_days == pytest.approx(0.0)
+        assert crud_segmentation.get_customer_segment(db_session, "u3").recency_days == pytest.approx(1.0)
+        assert person.segment == "champions"
+        assert crud_segmentation.get_customer_segment(db_session, "u2").segment == "hibernating"
+        assert crud_segmentation.get_customer_segment(db_session, "u4") is None
+
+    def test_rerun_replaces_segments(self, db_session):
+        """Test that a second run with a later reference date rewrites every row"""
+        crud_segmentation.compute_customer_segments(db_session)
+        result = crud_segmentation.compute_customer_segments(db_session, as_of=datetime(2018, 9, 11))
+        assert result.customers == 3
+        assert crud_segmentation.get_customer_segment(db_session, "u3").recency_days == pytest.approx(10.0)
+        state = db_session.get(models.RollupState, crud_segmentation.CUSTOMER_SEGMENTS)
+        assert state.high_water_mark.replace(tzinfo=None) == datetime(2018, 9, 11)
+
+    def test_get_customer_segment(self, client, db_session):
+        """Test that every customer_id of a person returns the same segment"""
+        response = client.get("/api/v1/customers/c2/segment")
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+        crud_segmentation.compute_customer_segments(db_session)
+        first = client.get("/api/v1/customers/c1/segment")
+        assert first.status_code == status.HTTP_200_OK
+        assert first.json() == client.get("/api/v1/customers/c2/segment").json()
+        assert first.json()["frequency"] == 2
+
+        response = client.get("/api/v1/customers/missing/segment")
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_list_segments(self, client, db_session):
+        """Test the segment summary and paging through one segment"""
+        crud_segmentation.compute_customer_segments(db_session)
+        summary = client.get("/api/v1/segments").json()
+        assert sum(row["customer_count"] for row in summary) == 3
+
+        segment = summary[0]["segment"]
+        response = client.get(f"/api/v1/segments/{segment}?limit=1")
+        assert response.status_code == status.HTTP_200_OK
+        assert [row["segment"] for row in response.json()] == [segment]
+
+        response = client.get("/api/v1/segments/unknown")
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
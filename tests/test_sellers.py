@@ -0,0 +1,150 @@
+import pytest
+from fastapi import status
+from sqlalchemy import select
+from app.crud import seller as crud_seller
+from app.db import models
+
+
+def stats_rows(db):
+    return {
+        row.seller_id: tuple(round(getattr(row, name), 6) for name in crud_seller.SELLER_STAT_FIELDS)
+        for row in db.execute(select(models.SellerStats)).scalars()
+    }
+
+
+class TestSellers:
+    """Test suite for seller endpoints and scorecards"""
+
+    @pytest.fixture(autouse=True)
+    def catalog(self, db_session):
+        """Orders must reference an existing customer and product"""
+        db_session.add_all([
+            models.Customer(customer_id="test-customer-1", customer_unique_id="test-customer-unique-1"),
+            models.Product(product_id="test-product-1"),
+        ])
+        db_session.commit()
+
+    @pytest.fixture
+    def sample_seller(self):
+        return {
+            "seller_id": "test-seller-1",
+            "seller_zip_code_prefix": "01001",
+            "seller_city": "sao paulo",
+            "seller_state": "SP"
+        }
+
+    def test_create_and_get_seller(self, client, sample_seller):
+        """Test creating a seller and reading it back"""
+        response = client.post("/api/v1/sellers/", json=sample_seller)
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.json()["seller_city"] == "sao paulo"
+
+        response = client.post("/api/v1/sellers/", json=sample_seller)
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+        response = client.get(f"/api/v1/sellers/{sample_seller['seller_id']}")
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["seller_state"] == "SP"
+
+    def test_update_and_list_sellers(self, client, sample_seller):
+        """Test updating a seller and paging through the list"""
+        client.post("/api/v1/sellers/", json=sample_seller)
+        client.post("/api/v1/sellers/", json={**sample_seller, "seller_id": "test-seller-2"})
+
+        response = client.put(f"/api/v1/sellers/{sample_seller['seller_id']}", json={"seller_city": "campinas"})
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["seller_city"] == "campinas"
+
+        response = client.get("/api/v1/sellers/?limit=1")
+        assert [seller["seller_id"] for seller in response.json()] == ["test-seller-1"]
+        response = client.get(f"/api/v1/sellers/?limit=1&cursor={response.headers['X-Next-Cursor']}")
+        assert [seller["seller_id"] for seller in response.json()] == ["test-seller-2"]
+
+    def test_delete_seller(self, client, sample_seller, sample_order):
+        """Test that sellers with order items cannot be deleted"""
+        client.post("/api/v1/sellers/", json=sample_seller)
+        client.post("/api/v1/orders/", json=sample_order)
+        response = client.delete(f"/api/v1/sellers/{sample_seller['seller_id']}")
+        assert response.status_code == status.HTTP_409_CONFLICT
+
+        client.post("/api/v1/sellers/", json={**sample_seller, "seller_id": "test-seller-2"})
+        response = client.delete("/api/v1/sellers/test-seller-2")
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+        response = client.delete("/api/v1/sellers/test-seller-2")
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_scorecard(self, client, sample_seller, sample_order):
+        """Test scorecard metrics as an order is placed, delivered and reviewed"""
+        client.post("/api/v1/sellers/", json=sample_seller)
+        response = client.get(f"/api/v1/sellers/{sample_seller['seller_id']}/scorecard")
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["order_count"] == 0
+        assert response.json()["average_review_score"] is None
+
+        order_id = client.post("/api/v1/orders/", json=sample_order).json()["order_id"]
+        client.put(f"/api/v1/orders/{order_id}", json={
+            "order_status": "delivered",
+            "order_approved_at": "2018-01-01T10:00:00",
+            "order_delivered_carrier_date": "2018-01-02T16:00:00",
+            "order_delivered_customer_date": "2018-01-05T10:00:00",
+            "order_estimated_delivery_date": "2018-01-10T00:00:00",
+        })
+        response = client.post(f"/api/v1/orders/{order_id}/reviews", json={"review_score": 4})
+        assert response.status_code == status.HTTP_201_CREATED
+        client.post(f"/api/v1/orders/{order_id}/reviews", json={"review_score": 5})
+
+        scorecard = client.get(f"/api/v1/sellers/{sample_seller['seller_id']}/scorecard").json()
+        assert scorecard["order_count"] == 1
+        assert scorecard["gmv"] == 99.99
+        assert scorecard["review_count"] == 2
+        assert scorecard["average_review_score"] == 4.5
+        assert scorecard["on_time_delivery_rate"] == 1.0
+        assert scorecard["average_dispatch_hours"] == pytest.approx(30.0)
+
+    def test_scorecard_not_found(self, client):
+        """Test scorecard for a missing seller"""
+        response = client.get("/api/v1/sellers/missing/scorecard")
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_review_for_missing_order(self, client):
+        """Test reviewing an order that does not exist"""
+        response = client.post("/api/v1/orders/missing/reviews", json={"review_score": 3})
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_incremental_stats_match_rebuild(self, client, db_session, sample_seller, sample_order):
+        """Test that counters maintained on writes equal a full recomputation"""
+        client.post("/api/v1/sellers/", json=sample_seller)
+        client.post("/api/v1/sellers/", json={**sample_seller, "seller_id": "test-seller-2"})
+        second = {**sample_order, "items": [
+            {**sample_order["items"][0], "order_item_id": 1, "seller_id": "test-seller-2", "price": 10.0},
+            {**sample_order["items"][0], "order_item_id": 2, "price": 5.0},
+        ]}
+        first_id = client.post("/api/v1/orders/", json=sample_order).json()["order_id"]
+        second_id = client.post("/api/v1/orders/", json=second).json()["order_id"]
+        client.post("/api/v1/orders/batch", json={"orders": [sample_order, sample_order]})
+        client.post(f"/api/v1/orders/{second_id}/reviews", json={"review_score": 2})
+        client.put(f"/api/v1/orders/{first_id}", json={
+            "order_delivered_customer_date": "2018-01-12T00:00:00",
+            "order_estimated_delivery_date": "2018-01-10T00:00:00",
+        })
+        client.put(f"/api/v1/orders/{first_id}", json={"order_status": "canceled"})
+        client.put(f"/api/v1/orders/{first_id}", json={"order_status": "delivered"})
+        client.delete(f"/api/v1/orders/{second_id}")
+
+        incremental = stats_rows(db_session)
+        assert incremental["test-seller-1"][:3] == (3, 3, round(3 * 99.99, 6))
+        assert incremental["test-seller-2"][:3] == (0, 0, 0)
+
+        crud_seller.rebuild_seller_stats(db_session)
+        rebuilt = stats_rows(db_session)
+        assert rebuilt["test-seller-1"] == incremental["test-seller-1"]
+        assert "test-seller-2" not in rebuilt
+
+    def test_apply_contributions_upserts(self, db_session):
+        """Test that the first contribution creates the row and later ones add to it"""
+        crud_seller.apply_seller_contributions(db_session, {"test-seller-1": {"order_count": 1, "gmv": 10.0}})
+        stats = crud_seller.get_seller_stats(db_session, "test-seller-1")
+        assert (stats.order_count, stats.item_count, stats.gmv) == (1, 0, 10.0)
+
+        crud_seller.apply_seller_contributions(db_session, {"test-seller-1": {"order_count": 2, "gmv": 5.0}})
+        assert (stats.order_count, stats.gmv) == (3, 15.0)
@@ -0,0 +1,102 @@
+import os
+import random
+import signal
+import socket
+import subprocess
+import sys
+import time
+import httpx
+import pytest
+from app import server
+from app.core.config import Settings, settings
+from app.server import build_config, default_workers, main, worker_request_limit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class TestServer:
+    """Test suite for the production multi-worker launcher"""
+
+    def test_worker_request_limit(self):
+        """Test that recycling limits stay within the jitter and can be disabled"""
+        rng = random.Random(1)
+        limits = {worker_request_limit(100, 10, rng) for _ in range(50)}
+        assert min(limits) >= 100 and max(limits) <= 110
+        assert len(limits) > 1
+        assert worker_request_limit(100, 0, rng) == 100
+        assert worker_request_limit(None, 10, rng) is None
+
+    def test_build_config(self, monkeypatch):
+        """Test that the uvicorn config comes from settings"""
+        monkeypatch.setattr(settings, "SERVER_WORKERS", 3)
+        config = build_config("127.0.0.1", 9000)
+        assert default_workers() == 3
+        assert config.loop == settings.SERVER_LOOP
+        assert config.http == settings.SERVER_HTTP
+        assert config.timeout_graceful_shutdown == settings.SERVER_GRACEFUL_TIMEOUT_SECONDS
+
+    def test_main_with_default_settings(self, monkeypatch):
+        """Test that the default memory cache falls back to none when the CPU count gives several workers"""
+        monkeypatch.setattr(settings, "CACHE_BACKEND", Settings.model_fields["CACHE_BACKEND"].default)
+        monkeypatch.setattr(settings, "SERVER_WORKERS", Settings.model_fields["SERVER_WORKERS"].default)
+        monkeypatch.setattr(os, "cpu_count", lambda: 4)
+        monkeypatch.setenv("CACHE_BACKEND", settings.CACHE_BACKEND)
+        started = []
+
+        class FakeSupervisor:
+            def __init__(self, config, workers, **kwargs):
+                started.append(workers)
+
+            def run(self):
+                return 0
+
+        monkeypatch.setattr(server, "Supervisor", FakeSupervisor)
+        with pytest.raises(SystemExit) as exit_info:
+            main([])
+        assert exit_info.value.code == 0
+        assert started == [4]
+        # Spawned workers read the environment
+        assert os.environ["CACHE_BACKEND"] == settings.CACHE_BACKEND == "none"
+
+    def test_workers_are_recycled_and_stop_gracefully(self, tmp_path):
+        """Test that workers are replaced after their request limit without dropping requests, and SIGTERM exits cleanly"""
+        port = free_port()
+        env = dict(os.environ, DATABASE_URL=f"sqlite:///{tmp_path / 'server.db'}", CACHE_BACKEND="none")
+        process = subprocess.Popen(
+            [sys.executable, "run.py", "--production", "--workers", "2", "--port", str(port),
+             "--host", "127.0.0.1", "--max-requests", "2", "--max-requests-jitter", "0"],
+            cwd=ROOT, env=env, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True,
+        )
+        try:
+            url = f"http://127.0.0.1:{port}/health"
+            for _ in range(100):
+                try:
+                    httpx.get(url, headers={"Connection": "close"})
+                    break
+                except httpx.TransportError:
+                    time.sleep(0.1)
+            codes = []
+            # Leave time between rounds for the replacements to start
+            for _ in range(3):
+                codes += [httpx.get(url, headers={"Connection": "close"}).status_code for _ in range(10)]
+                time.sleep(3)
+            assert codes == [200] * 30
+            
+            # Every worker's requests, including those of recycled workers, are in one scrape
+            body = httpx.get(f"http://127.0.0.1:{port}/metrics").text
+            served = sum(
+                float(line.rsplit(" ", 1)[1]) for line in body.splitlines()
+                if line.startswith("http_request_duration_seconds_count{") and 'route="/health"' in line
+            )
+            assert served >= 30
+        finally:
+            process.send_signal(signal.SIGTERM)
+            output, _ = process.communicate(timeout=60)
+        assert process.returncode == 0
+        assert "reached its request limit; replaced by" in output